@@ -1,8 +1,18 @@
-from flask import Flask, render_template, request, jsonify
-from src.model import Ligue1Predictor
+from flask import Flask, render_template, request, jsonify, g, Response
+from src.model import Ligue1Predictor, SNAPSHOT_VERSION, ENGINE_RATIO
 from src.tennis_model import AdvancedTennisPredictor # Updated Import
-from src.tournament_sim import SQUAD_BOOSTS
+from src.tennis_ingest import load_tennis_predictor
+from src.tennis_scoring import SERVE_BASELINE, get_score_table
+from src.tournament_sim import afcon_modifiers
+from src.live import live_probabilities
+from src.cross_league import CrossLeagueModel, LEAGUE_CODES
+from src import metrics
+from src import manifest as data_manifest
+from src.data_watcher import DataWatcher
+from src.match_store import MatchStore, competition_of
+from src.audit_log import PredictionLog, prediction_record, data_version
 import os
+import atexit
 import threading
 import time
 
@@ -10,6 +20,13 @@ app = Flask(__name__)
 
 # --- CONFIGURATION & GLOBAL MODELS ---
 MODELS = {}
+# Last known state of the data files (size, hash, rows, last match date)
+DATA_MANIFEST = data_manifest.load_manifest()
+REFRESH_LOCK = threading.Lock()
+# Local SQLite copy of the football results (synced with the manifest)
+MATCH_STORE = MatchStore()
+# Set by the first sync (startup thread): until then models read the CSV files, not a partial store
+STORE_SYNCED = threading.Event()
 tennis_model = AdvancedTennisPredictor() # Global Tennis Model
 
 COMPETITIONS = {
@@ -32,33 +49,154 @@ COMPETITIONS = {
     'GRE': {'name': 'Super League (GRE)', 'code': 'G1', 'is_file': False},
     'CAN': {'name': 'CAN (AFCON)', 'code': 'AFCON.csv', 'is_file': True}
 }
+# Match modifiers per competition (AFCON: squad quality + host advantage), baked into the pair tables
+MATCH_MODIFIERS = {'CAN': afcon_modifiers()}
+# Strength engine per competition (default ENGINE_RATIO), e.g. MODEL_ENGINES="PL:dixon_coles,L1:dixon_coles"
+MODEL_ENGINES = dict(item.split(':', 1) for item in os.environ.get('MODEL_ENGINES', '').split(',') if ':' in item)
+# Neutral-venue competitions (tournaments)
+NEUTRAL_COMPETITIONS = {'CAN'}
+# Joint model over every league (inter-league fixtures), trained on first use
+CROSS_LEAGUE = {'model': None}
+CROSS_LEAGUE_LOCK = threading.Lock()
+# Trained models (team tables + all-pairs predictions), reused while their data files are unchanged
+MODEL_SNAPSHOT_DIR = os.path.join("data", "cache", "models")
+# Append-only journal of the /predict answers (written in the background), PREDICTION_LOG=0 disables it
+PREDICTION_LOG = PredictionLog() if os.environ.get('PREDICTION_LOG', '1') != '0' else None
+if PREDICTION_LOG is not None:
+    atexit.register(PREDICTION_LOG.close)
 
 # --- HELPER FUNCTIONS ---
+def synced_store():
+    """MATCH_STORE once it mirrors the data files, else None (models then read the CSVs)."""
+    return MATCH_STORE if STORE_SYNCED.is_set() else None
+
+def build_predictor(comp_key, manifest=None):
+    """
+    Modèle d'une compétition (sans passer par le cache mémoire) : restauré depuis son
+    snapshot si ses fichiers de données n'ont pas changé, sinon entraîné puis sauvegardé.
+    """
+    comp = COMPETITIONS[comp_key]
+    source = {'data_file': f"data/{comp['code']}"} if comp['is_file'] else {'league_code': comp['code']}
+    modifiers = MATCH_MODIFIERS.get(comp_key)
+    engine = MODEL_ENGINES.get(comp_key, ENGINE_RATIO)
+    signature = data_manifest.competition_signature(
+        manifest or DATA_MANIFEST, comp, extra={'version': SNAPSHOT_VERSION, 'modifiers': modifiers, 'engine': engine})
+    path = os.path.join(MODEL_SNAPSHOT_DIR, f"{comp_key}.npz")
+
+    if signature is not None:
+        predictor = Ligue1Predictor.load_snapshot(path, signature, store=synced_store(), **source)
+        if predictor is not None:
+            predictor.data_version = data_version(signature)
+            return predictor
+
+    # Fitted engine: the model being replaced gives the starting point of the new fit
+    previous = MODELS.get(comp_key)
+    warm_start = getattr(previous, 'dc_fit', None) if getattr(previous, 'engine', None) == engine else None
+    predictor = Ligue1Predictor(store=synced_store(), table_modifiers=modifiers, engine=engine,
+                                warm_start=warm_start, **source)
+    predictor.data_version = data_version(signature)
+    if signature is not None:
+        try:
+            predictor.save_snapshot(path, signature)
+        except OSError as e:
+            print(f"[WARNING] Snapshot {comp_key} non écrit : {e}")
+    return predictor
+
 def get_predictor(comp_key):
     """Charge ou récupère le modèle depuis le cache."""
-    if comp_key not in MODELS:
-        comp = COMPETITIONS[comp_key]
-        if comp['is_file']:
-            MODELS[comp_key] = Ligue1Predictor(data_file=f"data/{comp['code']}")
-        else:
-            MODELS[comp_key] = Ligue1Predictor(league_code=comp['code'])
+    if comp_key in MODELS:
+        metrics.MODEL_CACHE_REQUESTS.labels(comp_key, 'hit').inc()
+    else:
+        metrics.MODEL_CACHE_REQUESTS.labels(comp_key, 'miss').inc()
+        MODELS[comp_key] = build_predictor(comp_key)
     return MODELS[comp_key]
 
+def get_cross_league_model():
+    """Modèle inter-ligues (toutes les ligues de data/, un seul entraînement)."""
+    with CROSS_LEAGUE_LOCK:
+        if CROSS_LEAGUE['model'] is None:
+            CROSS_LEAGUE['model'] = CrossLeagueModel(store=synced_store())
+        return CROSS_LEAGUE['model']
+
+def resolve_fixture(predictor, home_input, away_input):
+    """Noms du jeu de données des deux équipes, ou (None, None, message d'erreur)."""
+    # Resolve approximate names ("Nottingham Forest" -> "Nott'm Forest", "PSG" -> "Paris SG")
+    for team_input in [home_input, away_input]:
+        if predictor.resolve_team(team_input) is None:
+            suggestions = predictor.suggest_teams(team_input)
+            hint = f"Vouliez-vous dire : {', '.join(suggestions)} ?" if suggestions else "Vérifiez l'orthographe."
+            return None, None, f'{team_input} introuvable. {hint}'
+    return predictor.resolve_team(home_input), predictor.resolve_team(away_input), None
+
+def refresh_models(reason, updated=False):
+    """
+    Compare les fichiers de data/ au manifeste précédent et ne reconstruit que les
+    modèles dont les données ont changé. Les autres modèles (et le snapshot tennis)
+    restent en place.
+    Args:
+        reason: Label des métriques d'éviction
+        updated: True après un téléchargement réussi (date de mise à jour du manifeste)
+    Returns:
+        (fichiers modifiés, compétitions reconstruites)
+    """
+    global DATA_MANIFEST
+    with REFRESH_LOCK:
+        new_manifest = data_manifest.scan(previous=DATA_MANIFEST)
+        if updated:
+            data_manifest.mark_updated(new_manifest)
+        changed = data_manifest.diff(DATA_MANIFEST, new_manifest)
+        # Re-import changed football files before retraining from the store
+        MATCH_STORE.sync(new_manifest)
+        STORE_SYNCED.set()
+        affected = sorted(k for k in data_manifest.affected_competitions(changed, COMPETITIONS) if k in MODELS)
+
+        # Cached models are retrained first, then swapped: requests keep the old one meanwhile
+        for comp_key in affected:
+            MODELS[comp_key] = build_predictor(comp_key, new_manifest)
+            metrics.MODEL_EVICTIONS.labels(reason).inc()
+        if data_manifest.tennis_changed(changed):
+            load_tennis_model()
+        # Inter-league model: retrained on next use if any league file changed
+        if any(competition_of(os.path.basename(name)) in LEAGUE_CODES for name in changed):
+            with CROSS_LEAGUE_LOCK:
+                CROSS_LEAGUE['model'] = None
+
+        data_manifest.save_manifest(new_manifest)
+        DATA_MANIFEST = new_manifest
+
+    if changed:
+        print(f"[INFO] {len(changed)} fichier(s) modifié(s), modèles reconstruits : {', '.join(affected) or 'aucun'}")
+    return changed, affected
+
 def load_tennis_model():
+    """(Re)charge le modèle tennis : toutes les saisons de data/tennis, via snapshot si possible."""
+    global tennis_model
     print("Loading Advanced Tennis Model...")
-    files = [
-        os.path.join("data/tennis", 'atp_2024.csv'),
-        os.path.join("data/tennis", 'wta_2024.csv')
-    ]
-    # Filter only existing files
-    valid_files = [f for f in files if os.path.exists(f)]
-    tennis_model.train_from_csv(valid_files)
+    tennis_model, files = load_tennis_predictor("data/tennis")
+    # Build the score-engine lookup tables now rather than on the first request
+    for surface in SERVE_BASELINE:
+        get_score_table(surface)
     count = len(tennis_model.get_all_players())
-    print(f"Tennis Model loaded with {len(valid_files)} files. {count} players indexed.")
+    print(f"Tennis Model loaded with {len(files)} files. {count} players indexed.")
 
 # Load tennis on startup
 load_tennis_model()
 
+# --- INSTRUMENTATION ---
+
+@app.before_request
+def start_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request(response):
+    start = g.pop('request_start', None)
+    if start is not None:
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        metrics.HTTP_REQUEST_SECONDS.labels(route, request.method, str(response.status_code)).observe(
+            time.perf_counter() - start)
+    return response
+
 # --- ROUTES ---
 
 @app.route('/')
@@ -75,47 +213,101 @@ def predict():
         
         predictor = get_predictor(comp_key)
         
-        # Check if teams exist
-        teams = predictor.get_teams()
-        if home_team not in teams:
-            return jsonify({'error': f'{home_team} introuvable. Vérifiez l\'orthographe.'}), 400
-        if away_team not in teams:
-            return jsonify({'error': f'{away_team} introuvable. Vérifiez l\'orthographe.'}), 400
+        home_team, away_team, error = resolve_fixture(predictor, home_team, away_team)
+        if error:
+            return jsonify({'error': error}), 400
         
-        # Prepare modifiers for AFCON
-        modifiers = None
-        neutral = False
-        if comp_key == 'CAN':
-            neutral = True
-            modifiers = {}
-            
-            HOST_COUNTRY = 'Morocco'  # Tournament host
-            
-            for team in [home_team, away_team]:
-                mods = {'attack': 1.0, 'defense': 1.0}
-                
-                # Squad quality boost
-                boost = SQUAD_BOOSTS.get(team, 1.0)
-                mods['attack'] *= boost
-                mods['defense'] *= (1.0 - (boost - 1.0))
-                
-                # Host country advantage (Morocco only)
-                if team == HOST_COUNTRY:
-                    mods['attack'] *= 1.20  # +20% attack boost for host (Home Crowd)
-                    mods['defense'] *= 0.90 # -10% goals conceded (Defensive Boost)
-                
-                modifiers[team] = mods
+        # AFCON: neutral venue, squad / host modifiers (already in the model's pair table)
+        modifiers = MATCH_MODIFIERS.get(comp_key)
+        neutral = comp_key in NEUTRAL_COMPETITIONS
         
         result = predictor.predict_match(home_team, away_team, neutral_venue=neutral, modifiers=modifiers)
         
         if 'error' in result:
             return jsonify({'error': result['error']}), 400
+
+        if PREDICTION_LOG is not None:
+            PREDICTION_LOG.record(prediction_record(
+                comp_key, competition_of(COMPETITIONS[comp_key]['code']), result,
+                data_version=getattr(predictor, 'data_version', None), engine=predictor.engine, neutral=neutral))
         
         return jsonify(result)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/predict_live', methods=['POST'])
+def predict_live():
+    """
+    Probabilités en cours de match : les xG d'avant-match du modèle ramenés aux minutes
+    restantes, ajoutés au score actuel (1X2, totaux, prochain but).
+    JSON : competition, home_team, away_team, minute, home_goals, away_goals.
+    """
+    try:
+        data = request.json
+        comp_key = data['competition']
+        minute = float(data.get('minute', 0))
+        home_goals = int(data.get('home_goals', 0))
+        away_goals = int(data.get('away_goals', 0))
+        if minute < 0 or home_goals < 0 or away_goals < 0:
+            return jsonify({'error': 'Minute et score doivent être positifs.'}), 400
+
+        predictor = get_predictor(comp_key)
+        home_team, away_team, error = resolve_fixture(predictor, data['home_team'], data['away_team'])
+        if error:
+            return jsonify({'error': error}), 400
+
+        home_xg, away_xg = predictor.expected_goals(home_team, away_team,
+                                                    neutral_venue=comp_key in NEUTRAL_COMPETITIONS,
+                                                    modifiers=MATCH_MODIFIERS.get(comp_key))
+        result = live_probabilities(home_xg, away_xg, minute, home_goals, away_goals, rho=predictor.rho)
+        result.update(home_team=home_team, away_team=away_team,
+                      expected_goals_home=round(home_xg, 2), expected_goals_away=round(away_xg, 2))
+        return jsonify(result)
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/predict_half_time', methods=['POST'])
+def predict_half_time():
+    """
+    Marchés mi-temps : mi-temps / fin de match (9 issues), 1X2 à la mi-temps et en
+    seconde période, mi-temps la plus prolifique.
+    JSON : competition, home_team, away_team.
+    """
+    try:
+        data = request.json
+        comp_key = data['competition']
+        predictor = get_predictor(comp_key)
+        home_team, away_team, error = resolve_fixture(predictor, data['home_team'], data['away_team'])
+        if error:
+            return jsonify({'error': error}), 400
+
+        result = predictor.predict_half_time([home_team], [away_team],
+                                             neutral_venue=comp_key in NEUTRAL_COMPETITIONS,
+                                             modifiers=MATCH_MODIFIERS.get(comp_key))[0]
+        return jsonify(result)
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/predict_cross', methods=['POST'])
+def predict_cross():
+    """
+    Match entre équipes de ligues différentes (Arsenal - Inter, promu contre sa nouvelle ligue).
+    JSON : home_team, away_team, neutral (optionnel, terrain neutre).
+    """
+    try:
+        data = request.json
+        model = get_cross_league_model()
+        home_team, away_team, error = resolve_fixture(model, data['home_team'], data['away_team'])
+        if error:
+            return jsonify({'error': error}), 400
+        return jsonify(model.predict_match(home_team, away_team, neutral_venue=bool(data.get('neutral', False))))
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/teams/<comp_key>')
 def get_teams(comp_key):
     try:
@@ -133,6 +325,14 @@ def get_tennis_players():
     players = tennis_model.get_all_players()
     return jsonify({'players': players})
 
+@app.route('/tennis_autocomplete')
+def tennis_autocomplete():
+    """Server-side autocomplete: top-k players for a name prefix (?q=sinn&k=8&rank=rating|recent)."""
+    query = request.args.get('q', '')
+    k = min(max(request.args.get('k', 8, type=int), 1), 50)
+    rank = request.args.get('rank', 'rating')
+    return jsonify({'query': query, 'players': tennis_model.autocomplete(query, k=k, rank=rank)})
+
 @app.route('/predict_tennis', methods=['POST'])
 def predict_tennis():
     try:
@@ -158,8 +358,8 @@ def trigger_update():
         print("[INFO] Manual update triggered via web...")
         exit_code = auto_update.main()
         
-        # Clear model cache to force reload
-        MODELS.clear()
+        # Rebuild only the models whose data files changed
+        refresh_models('manual_update', updated=(exit_code == 0))
         
         if exit_code == 0:
             return jsonify({'status': 'success', 'message': 'Data updated successfully.'})
@@ -168,6 +368,11 @@ def trigger_update():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/metrics')
+def get_metrics():
+    """Prometheus-compatible metrics (latency histograms, cache counters)."""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
 # === AUTO UPDATE ON STARTUP (Background Thread) ===
 def start_background_update():
     """Runs data update in background to not block Gunicorn startup."""
@@ -175,31 +380,34 @@ def start_background_update():
         import auto_update
         
         print("[INFO] Checking data freshness (Background)...")
-        # Simple check: if main file is older than 24h or missing
-        should_update = False
-        data_dir = "data"
-        proxy_file = os.path.join(data_dir, "E0_2526.csv") 
+        # Sync the manifest with the files on disk (changes made while the app was down)
+        refresh_models('startup')
         
-        if not os.path.exists(data_dir) or not os.path.exists(proxy_file):
-            should_update = True
-        elif time.time() - os.path.getmtime(proxy_file) > 86400: # 24h
-            should_update = True
-            
-        if should_update:
+        if data_manifest.is_stale(DATA_MANIFEST):
             print("[INFO] Data is old or missing. Updating in background...")
-            auto_update.main()
-            # Clear cache after update
-            MODELS.clear()
-            print("[INFO] Background update complete & Cache cleared.")
+            exit_code = auto_update.main()
+            # Rebuild only what changed
+            refresh_models('background_update', updated=(exit_code == 0))
+            print("[INFO] Background update complete.")
         else:
             print("[INFO] Data is up to date.")
             
     except Exception as e:
         print(f"[WARNING] Background update failed: {e}")
 
-update_thread = threading.Thread(target=start_background_update)
-update_thread.daemon = True 
-update_thread.start()
+# STARTUP_UPDATE_ENABLED=0 skips it (benchmarks: no refresh / download / retraining during the run)
+if os.environ.get('STARTUP_UPDATE_ENABLED', '1') != '0':
+    update_thread = threading.Thread(target=start_background_update)
+    update_thread.daemon = True 
+    update_thread.start()
+
+# === DATA WATCHER ===
+# Files changed outside /update (scheduled auto_update.bat, manual download, copy into data/):
+# rebuild the affected models in the background and swap them in
+if os.environ.get('DATA_WATCH_ENABLED', '1') != '0':
+    data_watcher = DataWatcher(["data", "data/tennis"], lambda: refresh_models('watcher'),
+                               interval=float(os.environ.get('DATA_WATCH_INTERVAL', '2')))
+    data_watcher.start()
 
 if __name__ == '__main__':
     print("=== Football Predictor Web App ===")
@@ -1,30 +1,51 @@
 import os
 import sys
-from datetime import datetime
-from src import download_data, download_afcon_data
+import logging
+from src import download_data, download_afcon_data, audit_log
+from src.downloader import Downloader
+
+LOG_FILE = "update_log.txt"
+_logger = logging.getLogger("auto_update")
 
 def log(message):
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    log_message = f"[{timestamp}] {message}"
-    print(log_message)
-    
-    # Append to log file
-    with open("update_log.txt", "a", encoding="utf-8") as f:
-        f.write(log_message + "\n")
+    # Console + update_log.txt, through handlers opened once (not one open/close per message)
+    if not _logger.handlers:
+        formatter = logging.Formatter("[%(asctime)s] %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+        for handler in (logging.StreamHandler(sys.stdout), logging.FileHandler(LOG_FILE, encoding="utf-8")):
+            handler.setFormatter(formatter)
+            _logger.addHandler(handler)
+        _logger.setLevel(logging.INFO)
+        _logger.propagate = False
+    _logger.info(message)
+
+def log_live_accuracy():
+    """Scores the journaled predictions against the results just downloaded."""
+    try:
+        _, summary = audit_log.reconcile()
+    except Exception as e:
+        log(f"Precision en conditions reelles indisponible: {e}")
+        return
+    for row in summary.itertuples(index=False):
+        log(f"Precision {row.league}: {row.predictions} pronostics, log-loss {row.log_loss:.4f}, "
+            f"Brier {row.brier:.4f}, reussite {row.accuracy:.1%}")
 
 def main():
     log("=== DEBUT MISE A JOUR AUTOMATIQUE ===")
+    # One pooled session for every download of this run
+    downloader = Downloader()
     
     try:
         # Update league data
         log("Telechargement des donnees des championnats...")
-        download_data.download_data()
+        download_data.download_data(downloader)
         log("Championnats: OK")
         
         # Update AFCON data
         log("Telechargement des donnees AFCON...")
-        download_afcon_data.download_afcon_data()
+        download_afcon_data.download_afcon_data(downloader)
         log("AFCON: OK")
+
+        log_live_accuracy()
         
         log("=== MISE A JOUR TERMINEE AVEC SUCCES ===")
         return 0
@@ -33,6 +54,8 @@ def main():
         log(f"ERREUR: {str(e)}")
         log("=== MISE A JOUR ECHOUEE ===")
         return 1
+    finally:
+        downloader.close()
 
 if __name__ == "__main__":
     exit_code = main()
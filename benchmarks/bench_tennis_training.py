@@ -0,0 +1,53 @@
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from src.tennis_model import AdvancedTennisPredictor, read_matches_csv
+
+FILES = ["data/tennis/atp_2024.csv", "data/tennis/wta_2024.csv"]
+
+
+def legacy_train(model, file_paths):
+    """Reference implementation: the original iterrows() loop."""
+    for path in file_paths:
+        df = pd.read_csv(path, encoding='latin1')
+        df.columns = [c.lower() for c in df.columns]
+        df = df.sort_values('tourney_date', kind='stable')
+        for _, row in df.iterrows():
+            model.update_ratings(row['winner_name'], row['loser_name'], row['surface'])
+
+
+def engine_train(model, file_paths):
+    """New path: typed column-pruned read + array Elo recurrence."""
+    for path in file_paths:
+        model.train_from_frame(read_matches_csv(path))
+
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(repeat=3):
+    files = [f for f in FILES if os.path.exists(f)]
+    n_matches = sum(len(pd.read_csv(f, encoding='latin1', usecols=['winner_name'])) for f in files)
+    print(f"=== BENCHMARK: tennis training ({n_matches} matches, best of {repeat}) ===")
+
+    t_legacy = best_of(lambda: legacy_train(AdvancedTennisPredictor(), files), repeat)
+    t_engine = best_of(lambda: engine_train(AdvancedTennisPredictor(), files), repeat)
+    t_read = best_of(lambda: [read_matches_csv(f) for f in files], repeat)
+
+    print(f"\nLegacy iterrows loop : {t_legacy * 1000:8.1f} ms ({t_legacy / n_matches * 1e6:.1f} us/match)")
+    print(f"Array engine         : {t_engine * 1000:8.1f} ms ({t_engine / n_matches * 1e6:.1f} us/match)")
+    print(f"  of which CSV read  : {t_read * 1000:8.1f} ms")
+    print(f"Speedup              : x{t_legacy / t_engine:.1f}")
+
+
+if __name__ == "__main__":
+    main()
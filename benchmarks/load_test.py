@@ -0,0 +1,258 @@
+import sys
+import os
+import json
+import time
+import random
+import argparse
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+# Load generator for the Flask API (/predict, /teams/<comp_key>, /predict_tennis).
+#   python benchmarks/load_test.py                                  # Flask test client, in-process
+#   python benchmarks/load_test.py --target serve                   # threaded local server started here
+#   python benchmarks/load_test.py --target http://localhost:5000   # already running server
+# Latencies are reported per route and per competition; requests that waited for a model
+# to be trained (sent before the first answer of their competition) are counted as cold.
+
+DATA_DIR = "data"
+# Same keys as app.COMPETITIONS, limited to the competitions bundled in data/
+COMPETITION_CODES = {'PL': 'E0', 'L1': 'F1', 'L2': 'F2', 'BUN': 'D1', 'SER': 'I1', 'LAL': 'SP1', 'CAN': 'AFCON.csv'}
+TENNIS_FILES = ["data/tennis/atp_2024.csv", "data/tennis/wta_2024.csv"]
+# Request mix (relative weights)
+ROUTE_MIX = {'/predict': 0.65, '/predict_tennis': 0.2, '/teams/<comp_key>': 0.15}
+SURFACES = ['Hard', 'Clay', 'Grass']
+PERCENTILES = (50, 95, 99)
+SEED = 42
+
+
+# === WORKLOAD ===
+
+def competition_teams(code):
+    """Team names of the latest season file of a competition (read from the CSV, not from the API)."""
+    if code.endswith('.csv'):
+        files = [code]
+    else:
+        files = sorted(f for f in os.listdir(DATA_DIR) if f.startswith(code + '_') and f.endswith('.csv'))[-1:]
+    teams = set()
+    for name in files:
+        df = pd.read_csv(os.path.join(DATA_DIR, name), usecols=['HomeTeam', 'AwayTeam'], encoding='latin1')
+        teams.update(df['HomeTeam'].dropna())
+        teams.update(df['AwayTeam'].dropna())
+    return sorted(teams)
+
+
+def tennis_players(n=100):
+    """The n players with the most matches in the bundled tennis files."""
+    counts = Counter()
+    for path in TENNIS_FILES:
+        if os.path.exists(path):
+            df = pd.read_csv(path, usecols=['winner_name', 'loser_name'], encoding='latin1')
+            counts.update(df['winner_name'].dropna())
+            counts.update(df['loser_name'].dropna())
+    return [name for name, _ in counts.most_common(n)]
+
+
+def build_workload(n_requests, competitions, seed=SEED):
+    """List of (route, competition, method, path, json body) in send order."""
+    rng = random.Random(seed)
+    teams = {key: competition_teams(COMPETITION_CODES[key]) for key in competitions}
+    teams = {key: names for key, names in teams.items() if len(names) >= 2}
+    players = tennis_players()
+    routes = [r for r in ROUTE_MIX if r != '/predict_tennis' or len(players) >= 2]
+    weights = [ROUTE_MIX[r] for r in routes]
+
+    workload = []
+    for _ in range(n_requests):
+        route = rng.choices(routes, weights)[0]
+        if route == '/predict_tennis':
+            p1, p2 = rng.sample(players, 2)
+            body = {'player1': p1, 'player2': p2, 'surface': rng.choice(SURFACES), 'best_of': rng.choice([3, 3, 5])}
+            workload.append((route, 'tennis', 'POST', '/predict_tennis', body))
+            continue
+        comp_key = rng.choice(sorted(teams))
+        if route == '/predict':
+            home, away = rng.sample(teams[comp_key], 2)
+            body = {'competition': comp_key, 'home_team': home, 'away_team': away}
+            workload.append((route, comp_key, 'POST', '/predict', body))
+        else:
+            workload.append((route, comp_key, 'GET', f'/teams/{comp_key}', None))
+    return workload
+
+
+# === TARGETS ===
+
+def _import_app():
+    """Imports the web app with the background side effects that would skew or pollute a run turned off."""
+    # No file watcher nor startup update during the run: refreshes (and a possible download and
+    # retraining) would show up as latency spikes
+    os.environ.setdefault('DATA_WATCH_ENABLED', '0')
+    os.environ.setdefault('STARTUP_UPDATE_ENABLED', '0')
+    # Synthetic requests are not predictions: keep them out of the audit journal (live log-loss)
+    os.environ.setdefault('PREDICTION_LOG', '0')
+    os.environ.setdefault('PREDICTION_LOG_SOURCE', 'benchmark')
+    import app as webapp
+    return webapp
+
+
+class TestClientTarget:
+    """Calls the app in-process through Flask test clients (one per worker thread)."""
+
+    def __init__(self):
+        webapp = _import_app()
+        self.app = webapp.app
+        self._local = threading.local()
+
+    def send(self, method, path, body):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        response = client.open(path, method=method, json=body)
+        return response.status_code
+
+    def close(self):
+        pass
+
+
+class HttpTarget:
+    """Real HTTP requests (one pooled session per worker thread)."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+        self._local = threading.local()
+
+    def send(self, method, path, body):
+        import requests
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        response = session.request(method, self.base_url + path, json=body, timeout=300)
+        return response.status_code
+
+    def close(self):
+        pass
+
+
+class ServeTarget(HttpTarget):
+    """Starts the app on a threaded local server (free port) and sends real HTTP requests to it."""
+
+    def __init__(self):
+        webapp = _import_app()
+        from werkzeug.serving import make_server
+        self.server = make_server('127.0.0.1', 0, webapp.app, threaded=True)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        super().__init__(f"http://127.0.0.1:{self.server.server_port}")
+
+    def close(self):
+        self.server.shutdown()
+
+
+def make_target(target):
+    if target == 'test-client':
+        return TestClientTarget()
+    if target == 'serve':
+        return ServeTarget()
+    return HttpTarget(target)
+
+
+# === RUN / REPORT ===
+
+def run(target, workload, concurrency):
+    """Sends the workload with `concurrency` workers. Returns (samples, wall time)."""
+    def send(item):
+        route, comp_key, method, path, body = item
+        start = time.perf_counter()
+        try:
+            status = target.send(method, path, body)
+        except Exception:
+            status = None
+        return {'route': route, 'competition': comp_key, 'start': start,
+                'end': time.perf_counter(), 'status': status}
+
+    t_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(send, workload))
+    return samples, time.perf_counter() - t_start
+
+
+def mark_cold(samples):
+    """A request is cold if it was sent before the first successful answer of its competition."""
+    warm_at = {}
+    for s in samples:
+        if s['status'] == 200 and s['competition'] != 'tennis':
+            warm_at[s['competition']] = min(warm_at.get(s['competition'], float('inf')), s['end'])
+    for s in samples:
+        s['cold'] = s['competition'] != 'tennis' and s['start'] < warm_at.get(s['competition'], float('inf'))
+
+
+def summarize(samples):
+    latencies = np.array([s['end'] - s['start'] for s in samples]) * 1000
+    summary = {'requests': len(samples), 'errors': sum(s['status'] != 200 for s in samples),
+               'mean_ms': float(latencies.mean()) if len(latencies) else None}
+    for p in PERCENTILES:
+        summary[f'p{p}_ms'] = float(np.percentile(latencies, p)) if len(latencies) else None
+    return summary
+
+
+def report(samples, wall_time):
+    groups = {}
+    for s in samples:
+        groups.setdefault((s['route'], '*', 'all'), []).append(s)
+        groups.setdefault((s['route'], s['competition'], 'cold' if s['cold'] else 'warm'), []).append(s)
+    results = {
+        'requests': len(samples),
+        'errors': sum(s['status'] != 200 for s in samples),
+        'wall_s': wall_time,
+        'throughput_rps': len(samples) / wall_time if wall_time else None,
+        'groups': [dict(route=route, competition=comp, phase=phase, **summarize(group))
+                   for (route, comp, phase), group in sorted(groups.items())],
+    }
+
+    print(f"\n{results['requests']} requêtes en {wall_time:.1f} s -> {results['throughput_rps']:.1f} req/s "
+          f"({results['errors']} erreurs)\n")
+    print(f"{'route':20s} {'compét.':8s} {'phase':5s} {'n':>5s} {'err':>4s} {'p50':>9s} {'p95':>9s} {'p99':>9s}")
+    for g in results['groups']:
+        print(f"{g['route']:20s} {g['competition']:8s} {g['phase']:5s} {g['requests']:5d} {g['errors']:4d} "
+              f"{g['p50_ms']:8.1f}ms {g['p95_ms']:8.1f}ms {g['p99_ms']:8.1f}ms")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test de charge de l'API Flask.")
+    parser.add_argument('--target', default='test-client',
+                        help="'test-client' (en mémoire), 'serve' (serveur local lancé ici) ou une URL")
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--competitions', default=','.join(COMPETITION_CODES),
+                        help="Clés de compétition séparées par des virgules (PL,L1,CAN...)")
+    parser.add_argument('--seed', type=int, default=SEED)
+    parser.add_argument('--output', help="Fichier JSON des résultats")
+    args = parser.parse_args()
+
+    competitions = [c for c in args.competitions.split(',') if c in COMPETITION_CODES]
+    workload = build_workload(args.requests, competitions, args.seed)
+    print(f"=== LOAD TEST: {len(workload)} requêtes, {args.concurrency} en parallèle, cible {args.target} ===")
+    print("Mix : " + ', '.join(f"{route} {n}" for route, n in Counter(w[0] for w in workload).most_common()))
+
+    target = make_target(args.target)
+    try:
+        samples, wall_time = run(target, workload, args.concurrency)
+    finally:
+        target.close()
+    mark_cold(samples)
+    results = report(samples, wall_time)
+
+    if args.output:
+        results['config'] = {'target': args.target, 'concurrency': args.concurrency,
+                             'competitions': competitions, 'seed': args.seed}
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=1)
+        print(f"\n[INFO] Résultats enregistrés dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
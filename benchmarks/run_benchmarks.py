@@ -0,0 +1,274 @@
+import sys
+import os
+import io
+import json
+import time
+import random
+import argparse
+import platform
+import subprocess
+import tracemalloc
+from contextlib import redirect_stdout
+from itertools import permutations
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from src.model import Ligue1Predictor
+from src.elo import EloRatingSystem
+from src.dixon_coles import fit_dixon_coles
+from src.cross_league import CrossLeagueModel
+from src.match_store import MatchStore
+from src.metrics import MODEL_PHASE_SECONDS
+from src.tennis_model import AdvancedTennisPredictor
+from src import tournament_sim
+from src import manifest as data_manifest
+
+# Reproducible benchmark suite on the bundled data/ files.
+#   python benchmarks/run_benchmarks.py                      # everything, results in benchmarks/results/
+#   python benchmarks/run_benchmarks.py --only predict       # benchmarks whose name contains 'predict'
+#   python benchmarks/run_benchmarks.py --compare old.json   # ratio against a previous run
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+LEAGUES = ['E0', 'F1', 'D1', 'I1', 'SP1', 'F2']
+AFCON_FILE = "data/AFCON.csv"
+TENNIS_FILES = ["data/tennis/atp_2024.csv", "data/tennis/wta_2024.csv"]
+PHASES = ('load_data', 'elo_replay', 'form_index', 'dixon_coles_fit', 'compile_params', 'train_model', 'pair_table')
+PREDICT_TEAMS = 20           # Fixtures = every ordered pairing of the first 20 teams (380)
+TOURNAMENT_SIMULATIONS = 20
+TENNIS_H2H_PLAYERS = 60      # H2H queries = every ordered pairing of the top 60 players
+SEED = 42
+
+
+def _phase_sums(label):
+    return {phase: MODEL_PHASE_SECONDS.labels(label, phase).sum for phase in PHASES}
+
+
+def _quiet(func):
+    """Runs func with its prints swallowed (the models log their training)."""
+    with redirect_stdout(io.StringIO()):
+        return func()
+
+
+def measure(func, repeat, counters=None):
+    """
+    Best-of-`repeat` wall time of func(), then one extra run under tracemalloc for the
+    peak Python allocation (kept apart: tracing slows the timed runs down).
+    counters: optional callable returning {name: cumulative seconds}, averaged over the timed runs.
+    """
+    timings = []
+    before = counters() if counters else None
+    for _ in range(repeat):
+        random.seed(SEED)
+        np.random.seed(SEED)
+        start = time.perf_counter()
+        _quiet(func)
+        timings.append(time.perf_counter() - start)
+    after = counters() if counters else None
+    tracemalloc.start()
+    try:
+        _quiet(func)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    result = {'best_s': min(timings), 'median_s': float(np.median(timings)), 'runs': repeat,
+              'peak_mb': peak / 2 ** 20}
+    if counters:
+        result['phases_s'] = {name: (after[name] - before[name]) / repeat for name in after}
+    return result
+
+
+# === BENCHMARKS ===
+# Each one returns (name, func, extra fields) tuples; func is the timed callable. selected(name)
+# tells whether a case is wanted (--only): the setup of unwanted cases (training, fits) is skipped.
+
+def bench_model_build(selected):
+    specs = [(code, {'league_code': code}) for code in LEAGUES]
+    if os.path.exists(AFCON_FILE):
+        specs.append(('AFCON', {'data_file': AFCON_FILE}))
+    for label, kwargs in specs:
+        if not selected(f"model_build[{label}]"):
+            continue
+        metrics_label = os.path.basename(kwargs['data_file']) if 'data_file' in kwargs else label
+        probe = _quiet(lambda: Ligue1Predictor(**kwargs))
+        if probe.df.empty:
+            continue
+        yield (f"model_build[{label}]", lambda kwargs=kwargs: Ligue1Predictor(**kwargs),
+               {'matches': len(probe.df), 'teams': len(probe.teams), 'phase_label': metrics_label})
+
+
+def _fixtures(predictor):
+    teams = list(predictor.team_stats.index)[:PREDICT_TEAMS]
+    pairs = list(permutations(teams, 2))
+    return [h for h, _ in pairs], [a for _, a in pairs]
+
+
+def bench_predict(selected):
+    for label, kwargs in [('F1', {'league_code': 'F1'}), ('AFCON', {'data_file': AFCON_FILE})]:
+        if 'data_file' in kwargs and not os.path.exists(kwargs['data_file']):
+            continue
+        if not any(selected(f"{case}[{label}]") for case in ('predict_match_single', 'predict_batch', 'predict_half_time')):
+            continue
+        predictor = _quiet(lambda: Ligue1Predictor(**kwargs))
+        homes, aways = _fixtures(predictor)
+        extra = {'fixtures': len(homes)}
+        yield (f"predict_match_single[{label}]",
+               lambda p=predictor, h=homes, a=aways: [p.predict_match(x, y) for x, y in zip(h, a)], extra)
+        yield (f"predict_batch[{label}]", lambda p=predictor, h=homes, a=aways: p.predict_batch(h, a), extra)
+        yield (f"predict_half_time[{label}]", lambda p=predictor, h=homes, a=aways: p.predict_half_time(h, a), extra)
+
+
+def bench_dixon_coles(selected):
+    """Dixon-Coles fit of every bundled competition, from scratch and warm-started from the previous fit."""
+    if not (selected("dixon_coles_fit[all]") or selected("dixon_coles_fit_warm[all]")):
+        return
+    inputs = []
+    for kwargs in [{'league_code': code} for code in LEAGUES] + [{'data_file': AFCON_FILE}]:
+        if 'data_file' in kwargs and not os.path.exists(kwargs['data_file']):
+            continue
+        predictor = _quiet(lambda: Ligue1Predictor(**kwargs))
+        if predictor.df.empty:
+            continue
+        df, index = predictor.df, predictor.team_index
+        inputs.append((list(index), df['HomeTeam'].map(index).to_numpy(), df['AwayTeam'].map(index).to_numpy(),
+                       df['FTHG'].to_numpy(float), df['FTAG'].to_numpy(float), df['Weight'].to_numpy(float)))
+    if not inputs:
+        return
+    previous = [fit_dixon_coles(*args) for args in inputs]
+    extra = {'competitions': len(inputs), 'matches': sum(len(args[1]) for args in inputs)}
+    yield ("dixon_coles_fit[all]", lambda: [fit_dixon_coles(*args) for args in inputs], dict(extra))
+    yield ("dixon_coles_fit_warm[all]",
+           lambda: [fit_dixon_coles(*args, warm_start=fit) for args, fit in zip(inputs, previous)], dict(extra))
+
+
+def bench_cross_league(selected):
+    """Joint fit over every bundled league, from the CSVs and from the match store."""
+    if not (selected("cross_league_fit[csv]") or selected("cross_league_fit[store]")):
+        return
+    model = _quiet(lambda: CrossLeagueModel())
+    extra = {'matches': model.n_matches, 'teams': len(model.teams), 'leagues': len(model.leagues)}
+    yield ("cross_league_fit[csv]", lambda: CrossLeagueModel(), dict(extra))
+    if selected("cross_league_fit[store]"):
+        store = MatchStore()
+        _quiet(store.sync)
+        yield ("cross_league_fit[store]", lambda: CrossLeagueModel(store=store), dict(extra))
+
+
+def bench_elo(selected):
+    for code in ('E0', 'F1'):
+        if not selected(f"elo_process_historical_data[{code}]"):
+            continue
+        df = _quiet(lambda: Ligue1Predictor(league_code=code)).df
+        yield (f"elo_process_historical_data[{code}]",
+               lambda df=df: EloRatingSystem().process_historical_data(df), {'matches': len(df)})
+
+
+def bench_tournament(selected):
+    if not os.path.exists(AFCON_FILE) or not selected("simulate_tournament[AFCON]"):
+        return
+    predictor = _quiet(lambda: Ligue1Predictor(data_file=AFCON_FILE))
+    yield ("simulate_tournament[AFCON]",
+           lambda: tournament_sim.simulate_tournament(predictor, n_simulations=TOURNAMENT_SIMULATIONS),
+           {'simulations': TOURNAMENT_SIMULATIONS})
+
+
+def bench_tennis(selected):
+    files = [f for f in TENNIS_FILES if os.path.exists(f)]
+    if not files or not (selected("tennis_train_from_csv") or selected("tennis_get_head_to_head")):
+        return
+
+    def train():
+        model = AdvancedTennisPredictor()
+        model.train_from_csv(files)
+        return model
+
+    model = _quiet(train)
+    yield ("tennis_train_from_csv", train, {'matches': len(model.history), 'files': len(files)})
+
+    players = [name for name, _ in model.get_top_players('Overall', TENNIS_H2H_PLAYERS)]
+    pairs = list(permutations(players, 2))
+    yield ("tennis_get_head_to_head", lambda: [model.get_head_to_head(p1, p2) for p1, p2 in pairs],
+           {'queries': len(pairs)})
+
+
+BENCHMARKS = [bench_model_build, bench_predict, bench_dixon_coles, bench_cross_league, bench_elo, bench_tournament, bench_tennis]
+
+
+# === RUN / REPORT ===
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                                    capture_output=True, text=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        commit, dirty = None, None
+    files = data_manifest.data_files()
+    return {
+        'commit': commit, 'dirty': dirty,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(), 'platform': platform.platform(),
+        'numpy': np.__version__, 'pandas': pd.__version__,
+        'data_files': len(files),
+        'data_bytes': sum(os.path.getsize(os.path.join(data_manifest.DATA_DIR, f)) for f in files),
+    }
+
+
+def run(only=None, repeat=3):
+    results = {}
+    selected = lambda name: not only or only in name
+    for factory in BENCHMARKS:
+        for name, func, extra in factory(selected):
+            if not selected(name):
+                continue
+            label = extra.pop('phase_label', None)
+            # Model construction: mean duration of each phase, from the model's own phase metrics
+            result = measure(func, repeat, counters=(lambda: _phase_sums(label)) if label else None)
+            for key in ('fixtures', 'queries'):
+                if key in extra:
+                    result['per_item_us'] = result['best_s'] / extra[key] * 1e6
+            result.update(extra)
+            results[name] = result
+            print(f"{name:40s} {result['best_s'] * 1000:10.1f} ms   peak {result['peak_mb']:7.1f} MB")
+    return results
+
+
+def compare(results, baseline_path):
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    print(f"\n=== Comparaison avec {baseline_path} ({baseline['environment'].get('commit')}) ===")
+    for name, result in results.items():
+        old = baseline['results'].get(name)
+        if not old:
+            continue
+        ratio = result['best_s'] / old['best_s'] if old['best_s'] else float('nan')
+        flag = '  <-- plus lent' if ratio > 1.10 else ''
+        print(f"{name:40s} x{ratio:5.2f} temps   x{result['peak_mb'] / max(old['peak_mb'], 1e-9):5.2f} mémoire{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks sur les données de data/.")
+    parser.add_argument('--only', help="Ne lance que les benchmarks dont le nom contient ce texte")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help="Fichier JSON (défaut : benchmarks/results/<date>_<commit>.json)")
+    parser.add_argument('--compare', help="Résultats JSON d'un run précédent")
+    args = parser.parse_args()
+
+    env = environment()
+    print(f"=== BENCHMARKS ({env['commit']}{'+' if env['dirty'] else ''}, best of {args.repeat}) ===")
+    results = run(args.only, args.repeat)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{time.strftime('%Y%m%d_%H%M%S')}_{env['commit'] or 'nogit'}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({'environment': env, 'results': results}, f, indent=1, sort_keys=True)
+    print(f"\n[INFO] Résultats enregistrés dans {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
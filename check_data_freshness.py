@@ -1,24 +1,21 @@
-import pandas as pd
 import os
+from datetime import datetime, timedelta
+from src.match_store import MatchStore
 
 print("=== VÉRIFICATION DES DONNÉES ===\n")
 
-# Check Premier League current season (2025-2026)
-file = 'data/E0_2526.csv'
-if os.path.exists(file):
-    df = pd.read_csv(file, encoding='latin1')
-    df['Date'] = pd.to_datetime(df['Date'], format='%d/%m/%Y', errors='coerce')
-    df = df.dropna(subset=['Date'])
-    
-    print(f"Fichier: {file}")
-    print(f"Premier match: {df['Date'].min()}")
-    print(f"Dernier match disponible: {df['Date'].max()}")
-    print(f"Nombre de matchs: {len(df)}")
-    
-    # Check matches in last 30 days
-    from datetime import datetime, timedelta
-    thirty_days_ago = datetime.now() - timedelta(days=30)
-    recent = df[df['Date'] >= thirty_days_ago]
-    print(f"\nMatchs des 30 derniers jours: {len(recent)}")
+# Indexed queries on the local match store (synced with data/ first: only changed files are re-read)
+store = MatchStore()
+imported = store.sync()
+if imported:
+    print(f"Base locale mise à jour : {len(imported)} fichier(s) importé(s)\n")
+
+summary = store.competition_summary()
+if summary.empty:
+    print("Aucune donnée trouvée dans data/")
 else:
-    print(f"Fichier {file} non trouvé")
+    thirty_days_ago = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
+    print(f"{'Compétition':12s} {'Matchs':>7s}  {'Premier match':13s}  {'Dernier match':13s}  {'30 derniers jours':>17s}")
+    for row in summary.itertuples(index=False):
+        recent = store.count_since(row.competition, thirty_days_ago)
+        print(f"{row.competition:12s} {row.matches:7d}  {row.first_date:13s}  {row.last_date:13s}  {recent:17d}")
@@ -1,9 +1,175 @@
-from src.model import Ligue1Predictor
-import difflib
+import sys
+import csv
+import json
+import argparse
+from itertools import islice
+from src.predict_client import load_predictor
 
-def get_closest_match(team_name, all_teams):
-    matches = difflib.get_close_matches(team_name, all_teams, n=1, cutoff=0.6)
-    return matches[0] if matches else None
+# === BATCH MODE ===
+# python main.py --fixtures fixtures.csv [--output predictions.csv] [--format csv|ndjson]
+# Fixtures: CSV, NDJSON or JSON array ('-' = stdin) with home_team/away_team (or HomeTeam/AwayTeam)
+# and optional competition (E0, F1, AFCON...) and neutral columns. CSV and NDJSON are streamed
+# (memory bounded by CHUNK_SIZE); a JSON array is parsed whole, use NDJSON for large inputs.
+
+FILE_COMPETITIONS = ('AFCON',)   # Competitions trained from data/<code>.csv
+CHUNK_SIZE = 1000                # Fixtures scored per batch
+OUTPUT_FIELDS = ['competition', 'home_team', 'away_team', 'expected_goals_home', 'expected_goals_away',
+                 'win_prob', 'draw_prob', 'loss_prob', 'most_likely_score', 'score_prob',
+                 'second_likely_score', 'second_score_prob', 'error']
+
+
+def read_fixtures(stream):
+    """Yields one dict per fixture from a CSV, NDJSON or JSON array stream (a JSON array is read whole)."""
+    first = stream.read(1)
+    while first and first.isspace():
+        first = stream.read(1)
+    if not first:
+        return
+    if first == '[':
+        yield from json.loads(first + stream.read())
+    elif first == '{':
+        yield json.loads(first + stream.readline())
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+    else:
+        header = first + stream.readline()
+        yield from csv.DictReader(_prepend(header, stream))
+
+
+def _prepend(line, stream):
+    yield line
+    yield from stream
+
+
+def _field(fixture, *names, default=None):
+    for name in names:
+        value = fixture.get(name)
+        if value not in (None, ''):
+            return value
+    return default
+
+
+def _is_neutral(value):
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ('1', 'true', 'yes', 'oui', 'y')
+
+
+def model_spec(competition):
+    """'E0' -> league_code, 'AFCON' -> data/AFCON.csv, 'path/to/file.csv' -> data_file."""
+    if competition.endswith('.csv'):
+        return {'data_file': competition, 'league_code': 'F1'}
+    if competition in FILE_COMPETITIONS:
+        return {'data_file': f"data/{competition}.csv", 'league_code': 'F1'}
+    return {'data_file': None, 'league_code': competition}
+
+
+class BatchScorer:
+    """
+    One model per competition (loaded on first use), team names resolved once per competition.
+    A model that fails to load is not retried: its later fixtures get the same error.
+    """
+
+    def __init__(self):
+        self.predictors = {}
+        self.names = {}
+        self.failures = {}
+
+    def predictor(self, competition):
+        if competition in self.failures:
+            raise self.failures[competition]
+        if competition not in self.predictors:
+            print(f"[INFO] Chargement du modèle : {competition}", file=sys.stderr)
+            try:
+                self.predictors[competition] = load_predictor(**model_spec(competition))
+            except Exception as e:
+                print(f"[WARNING] Modèle {competition} indisponible : {e}", file=sys.stderr)
+                self.failures[competition] = e
+                raise
+            self.names[competition] = {}
+        return self.predictors[competition]
+
+    def resolve(self, competition, name):
+        cache = self.names[competition]
+        if name not in cache:
+            cache[name] = self.predictor(competition).resolve_team(name)
+        return cache[name]
+
+    def score(self, fixtures, default_competition):
+        """Prediction rows for a chunk of fixtures, in input order (one predict_batch per competition)."""
+        rows = [None] * len(fixtures)
+        groups = {}
+        for i, fixture in enumerate(fixtures):
+            competition = str(_field(fixture, 'competition', 'Competition', default=default_competition))
+            home_input = str(_field(fixture, 'home_team', 'HomeTeam', 'home', default=''))
+            away_input = str(_field(fixture, 'away_team', 'AwayTeam', 'away', default=''))
+            neutral = _is_neutral(_field(fixture, 'neutral', 'neutral_venue', default=False))
+            try:
+                predictor = self.predictor(competition)
+            except Exception as e:
+                rows[i] = {'competition': competition, 'home_team': home_input, 'away_team': away_input,
+                           'error': f"Modèle indisponible : {e}"}
+                continue
+            home_team, away_team = self.resolve(competition, home_input), self.resolve(competition, away_input)
+            error = None
+            if not home_team or not away_team:
+                error = f"Équipe introuvable : {home_input if not home_team else away_input}"
+            elif home_team == away_team:
+                error = "Une équipe ne peut pas jouer contre elle-même"
+            if error:
+                rows[i] = {'competition': competition, 'home_team': home_input, 'away_team': away_input, 'error': error}
+                continue
+            groups.setdefault(competition, []).append((i, home_team, away_team, neutral))
+
+        for competition, items in groups.items():
+            results = self.predictors[competition].predict_batch(
+                [h for _, h, _, _ in items], [a for _, _, a, _ in items], neutral_venue=[n for _, _, _, n in items])
+            for (i, _, _, _), result in zip(items, results):
+                rows[i] = {'competition': competition, **result}
+        return rows
+
+
+def run_batch(args):
+    source = sys.stdin if args.fixtures == '-' else open(args.fixtures, newline='', encoding='utf-8')
+    target = sys.stdout if args.output == '-' else open(args.output, 'w', newline='', encoding='utf-8')
+    scorer = BatchScorer()
+    writer = None
+    if args.format == 'csv':
+        writer = csv.DictWriter(target, fieldnames=OUTPUT_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+    total = errors = 0
+    try:
+        fixtures = read_fixtures(source)
+        while True:
+            chunk = list(islice(fixtures, args.chunk_size))
+            if not chunk:
+                break
+            for row in scorer.score(chunk, args.competition):
+                errors += 'error' in row
+                if writer:
+                    writer.writerow(row)
+                else:
+                    target.write(json.dumps(row, ensure_ascii=False) + '\n')
+            target.flush()
+            total += len(chunk)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+    print(f"[INFO] {total} matchs traités ({errors} erreurs)", file=sys.stderr)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Prédiction de matchs en lot (sans argument : mode interactif).")
+    parser.add_argument('--fixtures', required=True, help="Fichier CSV / NDJSON / JSON des matchs ('-' = stdin)")
+    parser.add_argument('--output', default='-', help="Fichier de sortie ('-' = stdout, par défaut)")
+    parser.add_argument('--format', choices=('csv', 'ndjson'), default='csv')
+    parser.add_argument('--competition', default='E0',
+                        help="Compétition des lignes sans colonne competition (E0, F1, D1, I1, SP1, F2, AFCON)")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    return parser.parse_args(argv)
 
 def main():
     print("--- PRÉDICTION DE MATCHS DE FOOTBALL ---")
@@ -44,7 +210,7 @@ def main():
 
     print(f"\nInitialisation du modèle pour : {competition_name}...")
     try:
-        predictor = Ligue1Predictor(data_file=data_file, league_code=league_code)
+        predictor = load_predictor(data_file=data_file, league_code=league_code)
     except Exception as e:
         print(f"Erreur lors de l'initialisation : {e}")
         return
@@ -71,14 +237,14 @@ def main():
         if home_input.lower() == 'q':
             break
         
-        home_team = get_closest_match(home_input, all_teams)
+        home_team = predictor.resolve_team(home_input)
         if not home_team:
             print(f"Équipe '{home_input}' introuvable. Essayez encore.")
             continue
         print(f" -> Équipe sélectionnée : {home_team}")
 
         away_input = input("Entrez l'équipe à l'Extérieur : ").strip()
-        away_team = get_closest_match(away_input, all_teams)
+        away_team = predictor.resolve_team(away_input)
         if not away_team:
             print(f"Équipe '{away_input}' introuvable. Essayez encore.")
             continue
@@ -102,4 +268,7 @@ def main():
             print(f"Buts attendus (xG) : {results['expected_goals_home']} - {results['expected_goals_away']}")
 
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) > 1:
+        run_batch(parse_args(sys.argv[1:]))
+    else:
+        main()
@@ -1,14 +1,18 @@
-from src.model import Ligue1Predictor
+from src.predict_client import load_predictor
 from src.tournament_sim import SQUAD_BOOSTS
 
 def analyze_afcon_match(predictor, home, away):
     print(f"\n--- {home.upper()} vs {away.upper()} ---")
     
+    # Resolve approximate names/aliases ("Nottingham Forest" -> "Nott'm Forest")
+    home = predictor.resolve_team(home) or home
+    away = predictor.resolve_team(away) or away
+
     # Check teams
-    if home not in predictor.team_stats.index:
+    if not predictor.has_team(home):
         print(f"Erreur : {home} introuvable.")
         return
-    if away not in predictor.team_stats.index:
+    if not predictor.has_team(away):
         print(f"Erreur : {away} introuvable.")
         return
 
@@ -54,7 +58,7 @@ def analyze_afcon_match(predictor, home, away):
 print("=== PRÉDICTIONS CAN 2025 ===")
 
 try:
-    predictor = Ligue1Predictor(data_file="data/AFCON.csv")
+    predictor = load_predictor(data_file="data/AFCON.csv")
     
     analyze_afcon_match(predictor, "Nigeria", "Tanzania")
     analyze_afcon_match(predictor, "Tunisia", "Uganda")
@@ -0,0 +1,203 @@
+import os
+import sys
+import json
+import queue
+import hashlib
+import threading
+from datetime import datetime, timezone
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from src import metrics
+from src.match_store import load_results
+
+# Append-only log of the served predictions (one JSON object per line): competition, teams,
+# data version of the model, 1X2 probabilities and timestamp. Requests only enqueue a record;
+# a background thread writes them in batches through a single open file handle.
+# reconcile() joins the log to the results played since and scores it (live log-loss per league).
+# Each record carries its source (PREDICTION_LOG_SOURCE, 'web' by default); only 'web' records are
+# reconciled, so a journal turned on during a benchmark or a test does not skew the live metrics.
+
+LOG_FILE = os.environ.get('PREDICTION_LOG_FILE', os.path.join("data", "audit", "predictions.ndjson"))
+LOG_SOURCE = os.environ.get('PREDICTION_LOG_SOURCE', 'web')
+LIVE_SOURCE = 'web'
+BATCH_SIZE = 200        # Records per write
+FLUSH_INTERVAL = 1.0    # Seconds: a partial batch is written after this delay
+MAX_QUEUE = 10000       # Records waiting for the writer; beyond, new records are dropped (never block a request)
+MIN_PROBABILITY = 1e-4  # Floor of the logged probabilities (rounded 0.0 %) in the log-loss
+OUTCOMES = ('home', 'draw', 'away')
+
+PREDICTION_LOG_RECORDS = metrics.Counter(
+    'prediction_log_records_total',
+    'Prediction audit log records by result (written/dropped).',
+    ('result',))
+
+_STOP = object()
+
+
+def data_version(signature):
+    """Short identifier of a model's input files (manifest competition signature), or None."""
+    return hashlib.sha256(signature.encode('utf-8')).hexdigest()[:12] if signature else None
+
+
+def prediction_record(competition, league, result, data_version=None, engine=None, neutral=False, source=None):
+    """Log entry of one predict_match() result (probabilities as fractions)."""
+    return {
+        'ts': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'source': source or LOG_SOURCE,
+        'competition': competition,
+        'league': league,
+        'home_team': result['home_team'],
+        'away_team': result['away_team'],
+        'data_version': data_version,
+        'engine': engine,
+        'neutral': bool(neutral),
+        'home': round(result['win_prob'] / 100, 4),
+        'draw': round(result['draw_prob'] / 100, 4),
+        'away': round(result['loss_prob'] / 100, 4),
+        'xg_home': result.get('expected_goals_home'),
+        'xg_away': result.get('expected_goals_away'),
+    }
+
+
+class PredictionLog:
+    """
+    Asynchronous NDJSON writer: record() puts the entry on an in-memory queue and returns;
+    the writer thread (started on the first record) drains up to batch_size entries,
+    appends them with one write and flushes. close() writes what is left.
+    """
+
+    def __init__(self, path=LOG_FILE, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL, max_queue=MAX_QUEUE):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(max_queue)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def record(self, entry):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name='prediction-log', daemon=True)
+                    self._thread.start()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            PREDICTION_LOG_RECORDS.labels('dropped').inc()
+
+    def _next_batch(self):
+        """Blocks for the first entry, then takes what is already queued (up to batch_size)."""
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        while len(batch) < self.batch_size and batch[-1] is not _STOP:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            while True:
+                batch = self._next_batch()
+                stop = bool(batch) and batch[-1] is _STOP
+                entries = batch[:-1] if stop else batch
+                if entries:
+                    try:
+                        f.write(''.join(json.dumps(entry, ensure_ascii=False) + '\n' for entry in entries))
+                        f.flush()
+                        PREDICTION_LOG_RECORDS.labels('written').inc(len(entries))
+                    except (OSError, TypeError, ValueError) as e:
+                        PREDICTION_LOG_RECORDS.labels('dropped').inc(len(entries))
+                        print(f"[WARNING] Journal des prédictions : {len(entries)} entrées perdues ({e})")
+                if stop:
+                    return
+
+    def close(self, timeout=5.0):
+        """Writes the queued entries and stops the writer thread."""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+
+
+# === RECONCILIATION ===
+
+def load_predictions(path=LOG_FILE):
+    """Logged predictions as a DataFrame (empty if there is no log yet)."""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return pd.DataFrame(columns=['ts', 'competition', 'league', 'home_team', 'away_team'] + list(OUTCOMES))
+    return pd.read_json(path, lines=True, dtype={'data_version': str}, convert_dates=False)
+
+
+def _swapped(predictions):
+    """The same predictions written from the other side (away team at home, 1X2 reversed)."""
+    return predictions.rename(columns={'home_team': 'away_team', 'away_team': 'home_team',
+                                       'home': 'away', 'away': 'home'})
+
+
+def reconcile(path=LOG_FILE, store=None, data_dir="data"):
+    """
+    Joins each logged prediction to the first match between the same teams in the same league
+    played strictly after the day of the prediction (the log has no kick-off time: a same-day
+    match may already be over, so it is never used), then scores them. Neutral-venue predictions
+    also match the fixture listed the other way round. A fixture predicted several times counts
+    once (its last prediction). Only records from live traffic (source 'web') are scored.
+
+    Returns:
+        (scored predictions, per-league DataFrame: predictions, log_loss, brier, accuracy)
+    """
+    predictions = load_predictions(path)
+    source = predictions.reindex(columns=['source'])['source'].fillna(LIVE_SOURCE)  # Older entries: no field
+    predictions = predictions[source.eq(LIVE_SOURCE)].copy()
+    columns = ['league', 'predictions', 'log_loss', 'brier', 'accuracy']
+    if predictions.empty:
+        return predictions, pd.DataFrame(columns=columns)
+
+    predictions['ts'] = pd.to_datetime(predictions['ts'], utc=True)
+    predictions['Date'] = predictions['ts'].dt.tz_localize(None).dt.normalize()
+    neutral = predictions.reindex(columns=['neutral'])['neutral'].eq(True)  # Older entries: no field
+    results = load_results(sorted(predictions['league'].unique()), store, data_dir)
+    results = results.rename(columns={'competition': 'league', 'HomeTeam': 'home_team', 'AwayTeam': 'away_team'})
+    results['MatchDate'] = results['Date']
+
+    # Candidates in both orders for neutral venues, first later result per (league, home, away)
+    candidates = pd.concat([predictions, _swapped(predictions[neutral])], keys=[0, 1], names=['swapped', 'row'])
+    candidates = candidates.reset_index().sort_values('Date')
+    scored = pd.merge_asof(candidates, results.sort_values('Date'), on='Date', by=['league', 'home_team', 'away_team'],
+                           direction='forward', allow_exact_matches=False)
+    scored = scored.dropna(subset=['FTHG', 'FTAG'])
+    scored = scored.sort_values(['MatchDate', 'swapped']).drop_duplicates('row')
+    scored = scored.sort_values('ts').drop_duplicates(['league', 'home_team', 'away_team', 'MatchDate'], keep='last')
+    if scored.empty:
+        return scored, pd.DataFrame(columns=columns)
+
+    probs = scored[list(OUTCOMES)].to_numpy(float)
+    outcome = np.where(scored['FTHG'] > scored['FTAG'], 0, np.where(scored['FTHG'] == scored['FTAG'], 1, 2))
+    actual = np.eye(3)[outcome]
+    scored = scored.assign(
+        outcome=np.array(OUTCOMES)[outcome],
+        log_loss=-np.log(np.maximum(probs[np.arange(len(probs)), outcome], MIN_PROBABILITY)),
+        brier=((probs - actual) ** 2).sum(axis=1),
+        correct=probs.argmax(axis=1) == outcome)
+
+    summary = scored.groupby('league').agg(predictions=('log_loss', 'size'), log_loss=('log_loss', 'mean'),
+                                           brier=('brier', 'mean'), accuracy=('correct', 'mean')).reset_index()
+    return scored.reset_index(drop=True), summary[columns]
+
+
+if __name__ == "__main__":
+    _, summary = reconcile()
+    if summary.empty:
+        print("Aucune prédiction journalisée n'a encore de résultat.")
+    else:
+        print("=== PRÉCISION EN CONDITIONS RÉELLES (prédictions journalisées) ===")
+        print(summary.round(4).to_string(index=False))
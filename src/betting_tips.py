@@ -1,20 +1,24 @@
-from src.model import Ligue1Predictor
+from src.predict_client import load_predictor
 from src.tournament_sim import SQUAD_BOOSTS
 
 def get_betting_tips(home_team, away_team):
     print(f"--- ANALYSE PARIS SPORTIFS : {home_team.upper()} vs {away_team.upper()} ---")
     
     try:
-        predictor = Ligue1Predictor(data_file="data/AFCON.csv")
+        predictor = load_predictor(data_file="data/AFCON.csv")
     except Exception as e:
         print(f"Erreur: {e}")
         return
 
+    # Resolve approximate names/aliases ("Cote d'Ivoire" -> "Ivory Coast")
+    home_team = predictor.resolve_team(home_team) or home_team
+    away_team = predictor.resolve_team(away_team) or away_team
+
     # Check teams
-    if home_team not in predictor.team_stats.index:
+    if not predictor.has_team(home_team):
         print(f"Erreur : {home_team} introuvable dans les données.")
         return
-    if away_team not in predictor.team_stats.index:
+    if not predictor.has_team(away_team):
         print(f"Erreur : {away_team} introuvable dans les données.")
         return
 
@@ -0,0 +1,217 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+from scipy.optimize import minimize
+from src.match_store import load_results
+from src.metrics import MODEL_PHASE_SECONDS
+from src.model import Ligue1Predictor, outcome_arrays, RHO
+from src.team_resolver import TeamResolver
+
+# Joint strength model over every league file (one fit, all divisions and countries), to price
+# fixtures between teams of different competitions (Arsenal - Inter, a promoted side vs its new league).
+#   log(home goals) = intercept + home + attack[home team] + defense[away team]
+#   log(away goals) = intercept + attack[away team] + defense[home team]
+# Poisson likelihood with the time decay of Ligue1Predictor, written as one sparse design matrix
+# (two rows per match). Each team is pulled towards the attack / defense offsets of its current
+# league (ridge), and each league towards the mean of its division tier (top divisions = 0).
+# League offsets are tied together by the teams that played in several leagues (promotions /
+# relegations); the tier means learned from those links place the leagues that have none.
+# Limitation: nothing links two countries (no European cup fixtures in the data), so every top
+# division sits at the same 0 reference: D1, E0, I1, SP1... come out equal, and a fixture between
+# two countries is priced on the within-league strengths only. Such pairs are flagged
+# (linked_leagues = False in predict_batch).
+
+LEAGUE_CODES = ('E0', 'E1', 'E2', 'E3', 'F1', 'F2', 'D1', 'D2', 'I1', 'I2', 'SP1', 'SP2',
+                'N1', 'P1', 'B1', 'T1', 'G1')
+# Division tier of each league (1 = top division): prior level of leagues without a moving team
+LEAGUE_TIERS = {'E0': 1, 'E1': 2, 'E2': 3, 'E3': 4, 'F1': 1, 'F2': 2, 'D1': 1, 'D2': 2, 'I1': 1, 'I2': 2,
+                'SP1': 1, 'SP2': 2, 'N1': 1, 'P1': 1, 'B1': 1, 'T1': 1, 'G1': 1}
+DECAY_RATE = 0.006    # Same time decay as Ligue1Predictor
+TEAM_RIDGE = 2.0      # Team strengths around their league offsets
+LEAGUE_RIDGE = 0.5    # League offsets around their tier mean
+TIER_RIDGE = 0.01     # Tier means around 0 (only matters for a tier without any link)
+MAX_ITERATIONS = 1000
+METRICS_LABEL = 'cross_league'
+
+
+def _objective(theta, X, goals, weights, membership, tiers, n_teams, team_ridge, league_ridge):
+    """
+    Penalized weighted Poisson negative log-likelihood and its gradient (sparse products only).
+    theta = [intercept, home, attack (teams), defense (teams), attack, defense (leagues), attack, defense (tiers)]
+    """
+    k = 2 + 2 * n_teams
+    n_leagues, n_tiers = tiers.shape
+    end = k + 2 * n_leagues
+    eta = X @ theta[:k]
+    rate = np.exp(eta)
+    value = (weights * (rate - goals * eta)).sum()
+    grad = np.empty_like(theta)
+    grad[:k] = X.T @ (weights * (rate - goals))
+
+    attack, defense = theta[2:2 + n_teams], theta[2 + n_teams:k]
+    league_attack, league_defense = theta[k:k + n_leagues], theta[k + n_leagues:end]
+    tier_attack, tier_defense = theta[end:end + n_tiers], theta[end + n_tiers:]
+    attack_dev = attack - membership @ league_attack
+    defense_dev = defense - membership @ league_defense
+    league_attack_dev = league_attack - tiers @ tier_attack
+    league_defense_dev = league_defense - tiers @ tier_defense
+    value += 0.5 * team_ridge * (attack_dev @ attack_dev + defense_dev @ defense_dev)
+    value += 0.5 * league_ridge * (league_attack_dev @ league_attack_dev + league_defense_dev @ league_defense_dev)
+    value += 0.5 * TIER_RIDGE * (tier_attack @ tier_attack + tier_defense @ tier_defense)
+    grad[2:2 + n_teams] += team_ridge * attack_dev
+    grad[2 + n_teams:k] += team_ridge * defense_dev
+    grad[k:k + n_leagues] = -team_ridge * (membership.T @ attack_dev) + league_ridge * league_attack_dev
+    grad[k + n_leagues:end] = -team_ridge * (membership.T @ defense_dev) + league_ridge * league_defense_dev
+    grad[end:end + n_tiers] = -league_ridge * (tiers.T @ league_attack_dev) + TIER_RIDGE * tier_attack
+    grad[end + n_tiers:] = -league_ridge * (tiers.T @ league_defense_dev) + TIER_RIDGE * tier_defense
+    return value, grad
+
+
+class CrossLeagueModel:
+    """
+    Strengths of every team of the loaded leagues on one scale. Only the fitted parameters are
+    kept (the match rows are dropped after training).
+    """
+
+    def __init__(self, store=None, data_dir="data", leagues=LEAGUE_CODES,
+                 team_ridge=TEAM_RIDGE, league_ridge=LEAGUE_RIDGE):
+        self.team_ridge = team_ridge
+        self.league_ridge = league_ridge
+        self.rho = RHO
+        self._resolver = None
+        with MODEL_PHASE_SECONDS.time(METRICS_LABEL, 'load_data'):
+            df = load_results(leagues, store, data_dir)
+        if df.empty:
+            raise ValueError("Aucun match de ligue disponible pour le modèle inter-ligues.")
+        with MODEL_PHASE_SECONDS.time(METRICS_LABEL, 'train_model'):
+            self._train(df)
+
+    def _train(self, df):
+        n_matches = len(df)
+        weights = np.exp(-DECAY_RATE * (df['Date'].max() - df['Date']).dt.days.to_numpy(float))
+        team_codes, teams = pd.factorize(pd.concat([df['HomeTeam'], df['AwayTeam']], ignore_index=True))
+        home, away = team_codes[:n_matches], team_codes[n_matches:]
+        league_codes, leagues = pd.factorize(df['competition'])
+        n_teams, n_leagues = len(teams), len(leagues)
+
+        # Current league of a team: competition of its latest match (rows are in date order)
+        last_row = pd.Series(np.r_[np.arange(n_matches), np.arange(n_matches)]).groupby(team_codes).max()
+        team_league = league_codes[last_row.sort_index().to_numpy()]
+        membership = sparse.csr_matrix((np.ones(n_teams), (np.arange(n_teams), team_league)),
+                                       shape=(n_teams, n_leagues))
+        tier_codes, tier_values = pd.factorize(np.array([LEAGUE_TIERS.get(code, 1) for code in leagues]))
+        n_tiers = len(tier_values)
+        tiers = sparse.csr_matrix((np.ones(n_leagues), (np.arange(n_leagues), tier_codes)), shape=(n_leagues, n_tiers))
+
+        # Design matrix: columns intercept, home, attack[team], defense[team]; home goals rows then away goals rows
+        rows = np.arange(2 * n_matches)
+        ones = np.ones(n_matches)
+        X = sparse.csr_matrix((
+            np.r_[np.ones(2 * n_matches), ones, np.ones(2 * n_matches), np.ones(2 * n_matches)],
+            (np.r_[rows, rows[:n_matches], rows, rows],
+             np.r_[np.zeros(2 * n_matches, dtype=int), np.ones(n_matches, dtype=int),
+                   2 + np.r_[home, away], 2 + n_teams + np.r_[away, home]])),
+            shape=(2 * n_matches, 2 + 2 * n_teams))
+        goals = np.r_[df['FTHG'].to_numpy(float), df['FTAG'].to_numpy(float)]
+
+        mean_home = (weights * goals[:n_matches]).sum() / weights.sum()
+        mean_away = (weights * goals[n_matches:]).sum() / weights.sum()
+        theta0 = np.zeros(2 + 2 * n_teams + 2 * n_leagues + 2 * n_tiers)
+        theta0[0], theta0[1] = np.log(max(mean_away, 0.1)), np.log(max(mean_home, 0.1) / max(mean_away, 0.1))
+        # Top-division tier means are the reference (fixed at 0)
+        top = [(0, 0) if tier == 1 else (None, None) for tier in tier_values]
+        bounds = [(None, None)] * (2 + 2 * n_teams + 2 * n_leagues) + top + top
+        result = minimize(_objective, theta0, jac=True, method='L-BFGS-B', bounds=bounds,
+                          args=(X, goals, np.r_[weights, weights], membership, tiers, n_teams,
+                                self.team_ridge, self.league_ridge),
+                          options={'maxiter': MAX_ITERATIONS})
+        if not result.success:
+            print(f"[WARNING] Modèle inter-ligues : optimisation incomplète ({result.message})")
+
+        theta = result.x
+        k = 2 + 2 * n_teams
+        self.intercept, self.home = float(theta[0]), float(theta[1])
+        self.attack, self.defense = theta[2:2 + n_teams], theta[2 + n_teams:k]
+        self.leagues = list(leagues)
+        self.league_attack, self.league_defense = theta[k:k + n_leagues], theta[k + n_leagues:k + 2 * n_leagues]
+        self.teams = list(teams)
+        self.team_index = {team: i for i, team in enumerate(self.teams)}
+        self.team_league = [self.leagues[code] for code in team_league]
+        self.team_league_codes = team_league
+        # Leagues on a common scale: connected through teams that played in both
+        played = sparse.csr_matrix((np.ones(2 * n_matches), (team_codes, np.r_[league_codes, league_codes])),
+                                   shape=(n_teams, n_leagues))
+        _, self.league_group = connected_components((played.T @ played) > 0, directed=False)
+        self.n_matches = n_matches
+        self.iterations = int(result.nit)
+        print(f"[INFO] Modèle inter-ligues : {n_matches} matchs, {n_teams} équipes, "
+              f"{n_leagues} ligues, {self.iterations} itérations")
+
+    def league_strengths(self):
+        """
+        Offsets per league, strongest first (strength = attack - defense, log scale). Only leagues of
+        the same group (linked by teams that moved between them) are comparable.
+        """
+        table = pd.DataFrame({'attack': self.league_attack, 'defense': self.league_defense}, index=self.leagues)
+        table['strength'] = table['attack'] - table['defense']
+        table['group'] = self.league_group
+        table['teams'] = pd.Series(self.team_league).value_counts().reindex(self.leagues).fillna(0).astype(int)
+        return table.sort_values('strength', ascending=False)
+
+    def predict_batch(self, home_teams, away_teams, neutral_venue=False):
+        """
+        Fixtures between any two known teams (any leagues).
+
+        Returns:
+            List of predict_match dicts (Ligue1Predictor format, plus each team's current league and
+            linked_leagues: False when nothing in the data relates the two leagues), in fixture order ({"error": ...} for unknown teams)
+        """
+        home_teams, away_teams = list(home_teams), list(away_teams)
+        n = len(home_teams)
+        neutral = np.broadcast_to(np.asarray(neutral_venue, dtype=bool), (n,))
+        h_idx = np.array([self.team_index.get(t, -1) for t in home_teams], dtype=int)
+        a_idx = np.array([self.team_index.get(t, -1) for t in away_teams], dtype=int)
+        valid = (h_idx >= 0) & (a_idx >= 0)
+        h_idx, a_idx = np.where(valid, h_idx, 0), np.where(valid, a_idx, 0)
+
+        # Neutral ground: half of the home advantage for each side
+        home_adv = np.where(neutral, self.home / 2, self.home)
+        away_adv = np.where(neutral, self.home / 2, 0.0)
+        home_xg = np.exp(self.intercept + home_adv + self.attack[h_idx] + self.defense[a_idx])
+        away_xg = np.exp(self.intercept + away_adv + self.attack[a_idx] + self.defense[h_idx])
+        arrays = outcome_arrays(home_xg, away_xg, self.rho)
+        team_league = self.team_league_codes
+
+        results = []
+        for i in range(n):
+            if not valid[i]:
+                results.append({"home_team": home_teams[i], "away_team": away_teams[i], "error": "Team not found."})
+                continue
+            result = Ligue1Predictor._format_prediction(home_teams[i], away_teams[i],
+                                                        {key: values[i] for key, values in arrays.items()})
+            home_league, away_league = team_league[h_idx[i]], team_league[a_idx[i]]
+            result.update(home_league=self.leagues[home_league], away_league=self.leagues[away_league],
+                          linked_leagues=bool(self.league_group[home_league] == self.league_group[away_league]))
+            results.append(result)
+        return results
+
+    def predict_match(self, home_team, away_team, neutral_venue=False):
+        return self.predict_batch([home_team], [away_team], neutral_venue)[0]
+
+    def get_teams(self):
+        return sorted(self.teams)
+
+    def has_team(self, name):
+        return name in self.team_index
+
+    def resolve_team(self, name):
+        """Maps an approximate/alias team name to the dataset spelling (None if unknown)."""
+        if self._resolver is None:
+            self._resolver = TeamResolver(self.teams)
+        return self._resolver.resolve(name)
+
+    def suggest_teams(self, name, n=3):
+        if self._resolver is None:
+            self._resolver = TeamResolver(self.teams)
+        return self._resolver.suggestions(name, n)
@@ -0,0 +1,63 @@
+import os
+import time
+import threading
+
+POLL_INTERVAL = 2.0   # Seconds between two directory scans
+DEBOUNCE = 5.0        # Seconds without any change before a batch of writes is considered complete
+
+
+class DataWatcher(threading.Thread):
+    """
+    Polling watcher on the data directories (no extra dependency, works on Windows).
+
+    Each poll is a single os.scandir() per directory (name, size, mtime of the CSV
+    files, temporary/hidden files ignored). When the listing changes, the watcher
+    waits until it has been stable for `debounce` seconds (a download batch or a
+    slow copy is then finished) and calls on_change() once, from its own thread.
+    """
+
+    def __init__(self, directories, on_change, interval=POLL_INTERVAL, debounce=DEBOUNCE):
+        super().__init__(name='data-watcher', daemon=True)
+        self.directories = list(directories)
+        self.on_change = on_change
+        self.interval = interval
+        self.debounce = debounce
+        self._stop_event = threading.Event()
+
+    def _listing(self):
+        """{path: (size, mtime_ns)} of the watched CSV files."""
+        listing = {}
+        for directory in self.directories:
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.name.startswith('.') or not entry.name.endswith('.csv'):
+                            continue
+                        try:
+                            stat = entry.stat()
+                        except OSError:
+                            continue
+                        listing[entry.path] = (stat.st_size, stat.st_mtime_ns)
+            except OSError:
+                continue
+        return listing
+
+    def run(self):
+        last = self._listing()
+        pending_since = None
+        while not self._stop_event.wait(self.interval):
+            current = self._listing()
+            now = time.monotonic()
+            if current != last:
+                # Still being written: restart the debounce window
+                last = current
+                pending_since = now
+            elif pending_since is not None and now - pending_since >= self.debounce:
+                pending_since = None
+                try:
+                    self.on_change()
+                except Exception as e:
+                    print(f"[WARNING] Data watcher refresh failed: {e}")
+
+    def stop(self):
+        self._stop_event.set()
@@ -0,0 +1,137 @@
+import numpy as np
+from scipy.optimize import minimize
+
+# Dixon-Coles model fitted by maximum likelihood (alternative to the ratio strengths of
+# Ligue1Predictor). For a match home h vs away a with score (x, y):
+#   lambda = exp(intercept + home + attack[h] + defense[a])   expected home goals
+#   mu     = exp(intercept + attack[a] + defense[h])          expected away goals
+#   P(x, y) = tau(x, y) * Poisson(x; lambda) * Poisson(y; mu)
+# with the low-score correction tau (rho) on 0-0, 0-1, 1-0 and 1-1. Each match counts with its
+# time-decay weight; a small ridge penalty on attack / defense makes the fit identifiable and
+# keeps teams with few matches close to the league average.
+
+RIDGE = 1.0
+RHO_BOUNDS = (-0.3, 0.3)
+MAX_ITERATIONS = 500
+
+
+class DixonColesFit:
+    """Fitted parameters (log scale): attack / defense per team, intercept, home advantage, rho."""
+
+    def __init__(self, teams, attack, defense, intercept, home, rho, log_likelihood=None, iterations=None):
+        self.teams = list(teams)
+        self.attack = np.asarray(attack, dtype=float)
+        self.defense = np.asarray(defense, dtype=float)
+        self.intercept = float(intercept)
+        self.home = float(home)
+        self.rho = float(rho)
+        self.log_likelihood = log_likelihood
+        self.iterations = iterations
+
+    def expected_goals(self, h_idx, a_idx):
+        """(lambda, mu) arrays for fixtures given as team numbers."""
+        lam = np.exp(self.intercept + self.home + self.attack[h_idx] + self.defense[a_idx])
+        mu = np.exp(self.intercept + self.attack[a_idx] + self.defense[h_idx])
+        return lam, mu
+
+    def to_array(self):
+        """Flat parameter vector [intercept, home, rho, attack..., defense...] (snapshots)."""
+        return np.concatenate([[self.intercept, self.home, self.rho], self.attack, self.defense])
+
+    @classmethod
+    def from_array(cls, teams, values):
+        n = len(teams)
+        return cls(teams, values[3:3 + n], values[3 + n:3 + 2 * n], values[0], values[1], values[2])
+
+    def initial_vector(self, teams):
+        """Starting point for a new fit on `teams`: this fit's values, 0 for teams it did not know."""
+        position = {team: i for i, team in enumerate(self.teams)}
+        known = np.array([position.get(team, -1) for team in teams], dtype=int)
+        attack = np.where(known >= 0, self.attack[known], 0.0)
+        defense = np.where(known >= 0, self.defense[known], 0.0)
+        rho = min(max(self.rho, RHO_BOUNDS[0]), RHO_BOUNDS[1])
+        return np.concatenate([[self.intercept, self.home, rho], attack, defense])
+
+
+def _negative_log_likelihood(theta, h_idx, a_idx, x, y, w, n_teams, ridge):
+    """Weighted negative log-likelihood (constant log x! y! terms dropped) and its gradient."""
+    intercept, home, rho = theta[:3]
+    attack, defense = theta[3:3 + n_teams], theta[3 + n_teams:]
+    lam = np.exp(intercept + home + attack[h_idx] + defense[a_idx])
+    mu = np.exp(intercept + attack[a_idx] + defense[h_idx])
+
+    # Low-score correction tau and the derivatives of log(tau)
+    s00 = (x == 0) & (y == 0)
+    s01 = (x == 0) & (y == 1)
+    s10 = (x == 1) & (y == 0)
+    s11 = (x == 1) & (y == 1)
+    tau = np.ones_like(lam)
+    tau[s00] = 1 - lam[s00] * mu[s00] * rho
+    tau[s01] = 1 + lam[s01] * rho
+    tau[s10] = 1 + mu[s10] * rho
+    tau[s11] = 1 - rho
+    tau = np.maximum(tau, 1e-10)
+
+    dtau_lam = np.zeros_like(lam)   # d log(tau) / d log(lambda)
+    dtau_mu = np.zeros_like(lam)    # d log(tau) / d log(mu)
+    dtau_rho = np.zeros_like(lam)   # d log(tau) / d rho
+    dtau_lam[s00] = -lam[s00] * mu[s00] * rho / tau[s00]
+    dtau_mu[s00] = dtau_lam[s00]
+    dtau_rho[s00] = -lam[s00] * mu[s00] / tau[s00]
+    dtau_lam[s01] = lam[s01] * rho / tau[s01]
+    dtau_rho[s01] = lam[s01] / tau[s01]
+    dtau_mu[s10] = mu[s10] * rho / tau[s10]
+    dtau_rho[s10] = mu[s10] / tau[s10]
+    dtau_rho[s11] = -1 / tau[s11]
+
+    log_likelihood = (w * (np.log(tau) + x * np.log(lam) - lam + y * np.log(mu) - mu)).sum()
+    penalty = 0.5 * ridge * (attack @ attack + defense @ defense)
+
+    # Gradient of the log-likelihood with respect to log(lambda) and log(mu), then chain rule
+    g_lam = w * (x - lam + dtau_lam)
+    g_mu = w * (y - mu + dtau_mu)
+    grad = np.empty_like(theta)
+    grad[0] = g_lam.sum() + g_mu.sum()
+    grad[1] = g_lam.sum()
+    grad[2] = (w * dtau_rho).sum()
+    grad[3:3 + n_teams] = (np.bincount(h_idx, g_lam, n_teams) + np.bincount(a_idx, g_mu, n_teams)
+                           - ridge * attack)
+    grad[3 + n_teams:] = (np.bincount(a_idx, g_lam, n_teams) + np.bincount(h_idx, g_mu, n_teams)
+                          - ridge * defense)
+    return -(log_likelihood - penalty), -grad
+
+
+def fit_dixon_coles(teams, h_idx, a_idx, home_goals, away_goals, weights, warm_start=None, ridge=RIDGE):
+    """
+    Maximum-likelihood fit (L-BFGS-B with the analytic gradient).
+
+    Args:
+        teams: Team names, in team-number order
+        h_idx / a_idx: Team numbers of each match
+        home_goals / away_goals / weights: Score and weight of each match
+        warm_start: Previous DixonColesFit (same competition): starting point of the optimizer
+
+    Returns:
+        DixonColesFit
+    """
+    n_teams = len(teams)
+    h_idx, a_idx = np.asarray(h_idx, dtype=int), np.asarray(a_idx, dtype=int)
+    x, y = np.asarray(home_goals, dtype=float), np.asarray(away_goals, dtype=float)
+    w = np.asarray(weights, dtype=float)
+
+    if warm_start is not None:
+        theta0 = warm_start.initial_vector(teams)
+    else:
+        # Cold start: league average scoring, neutral teams, usual rho
+        mean_home = max((w * x).sum() / w.sum(), 0.1)
+        mean_away = max((w * y).sum() / w.sum(), 0.1)
+        theta0 = np.concatenate([[np.log(mean_away), np.log(mean_home / mean_away), -0.1], np.zeros(2 * n_teams)])
+
+    bounds = [(None, None), (None, None), RHO_BOUNDS] + [(None, None)] * (2 * n_teams)
+    result = minimize(_negative_log_likelihood, theta0, args=(h_idx, a_idx, x, y, w, n_teams, ridge),
+                      jac=True, method='L-BFGS-B', bounds=bounds, options={'maxiter': MAX_ITERATIONS})
+    if not result.success:
+        print(f"[WARNING] Dixon-Coles : optimisation incomplète ({result.message})")
+    theta = result.x
+    return DixonColesFit(teams, theta[3:3 + n_teams], theta[3 + n_teams:], theta[0], theta[1], theta[2],
+                         log_likelihood=-float(result.fun), iterations=int(result.nit))
@@ -1,57 +1,55 @@
-import pandas as pd
-import requests
-import io
+import sys
 import os
-from datetime import datetime
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-def download_afcon_data():
-    url = "https://raw.githubusercontent.com/martj42/international_results/master/results.csv"
+from src.downloader import Downloader, DOWNLOADED, FAILED, MISSING
+from src.international_results import ingest_results, derive_afcon, MATCHES_FILE, AFCON_START_DATE
+
+# Overridable (e.g. a local stand-in server)
+RESULTS_URL = os.environ.get(
+    "AFCON_RESULTS_URL",
+    "https://raw.githubusercontent.com/martj42/international_results/master/results.csv")
+# Raw copy of results.csv (kept so that unchanged data costs a 304)
+RAW_FILE = os.path.join("data", "raw", "international_results.csv")
+
+def download_afcon_data(downloader=None, full=False):
+    """
+    Updates the international results (all matches, see src/international_results.py) and AFCON.csv.
+    full: re-ingest results.csv from scratch instead of re-parsing only its recent tail.
+    """
+    url = RESULTS_URL
     data_dir = "data"
     output_file = os.path.join(data_dir, "AFCON.csv")
 
     print(f"Downloading international data from {url}...")
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        content = response.content.decode('utf-8')
-        
-        df = pd.read_csv(io.StringIO(content))
-        
-        # Convert date to datetime
-        df['date'] = pd.to_datetime(df['date'])
-        
-        # Filter for AFCON tournaments and recent years
-        # We include qualifiers and the main tournament
-        # Let's take data from 2018 onwards to be relevant but have enough sample size
-        relevant_tournaments = ["African Cup of Nations", "African Cup of Nations qualification"]
-        start_date = "2018-01-01"
-        
-        mask = (df['tournament'].isin(relevant_tournaments)) & (df['date'] >= start_date)
-        afcon_df = df[mask].copy()
-        
-        # Renaissance relevant columns for our model
-        # Our model expects: Date, HomeTeam, AwayTeam, FTHG, FTAG
-        afcon_df = afcon_df.rename(columns={
-            'date': 'Date',
-            'home_team': 'HomeTeam',
-            'away_team': 'AwayTeam',
-            'home_score': 'FTHG',
-            'away_score': 'FTAG'
-        })
-        
-        # Clean up
-        afcon_df = afcon_df[['Date', 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG']]
-        
-        print(f"Filtered {len(afcon_df)} AFCON matches since {start_date}.")
-        
-        if not os.path.exists(data_dir):
-            os.makedirs(data_dir)
-            
-        afcon_df.to_csv(output_file, index=False)
-        print(f"Saved to {output_file}")
-        
+        own_downloader = downloader is None
+        if own_downloader:
+            downloader = Downloader()
+        try:
+            status = downloader.fetch(url, RAW_FILE)
+            downloader.save_state()
+        finally:
+            if own_downloader:
+                downloader.close()
+
+        if status in (FAILED, MISSING) and not os.path.exists(RAW_FILE):
+            raise RuntimeError(f"results.csv unavailable ({status})")
+        if status != DOWNLOADED and not full and os.path.exists(output_file) and os.path.exists(MATCHES_FILE):
+            print(f"results.csv unchanged ({status}): {output_file} kept.")
+            return
+
+        # Only the last weeks of the local copy are re-parsed (new, late and corrected scores)
+        full = full or not os.path.exists(MATCHES_FILE)
+        added = ingest_results(RAW_FILE, MATCHES_FILE, full=full)
+        print(f"{added} new or updated international matches ({'full rebuild' if full else 'recent tail'}) in {MATCHES_FILE}.")
+
+        if added or not os.path.exists(output_file):
+            count = derive_afcon(MATCHES_FILE, output_file)
+            print(f"Saved {count} matches between CAF nations since {AFCON_START_DATE} to {output_file}")
+
     except Exception as e:
         print(f"Error processing AFCON data: {e}")
 
 if __name__ == "__main__":
-    download_afcon_data()
+    download_afcon_data(full='--full' in sys.argv)
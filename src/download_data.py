@@ -1,11 +1,16 @@
+import sys
 import os
-import requests
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-def download_data():
-    base_url = "https://www.football-data.co.uk/mmz4281/{}/{}.csv"
-    # Saisons: 2526 = 2025/2026 (actuelle), puis historique
-    seasons = ["2526", "2425", "2324", "2223"]
-    
+from src.downloader import Downloader, DOWNLOADED, NOT_MODIFIED, SKIPPED, summarize
+
+# Overridable (e.g. a local stand-in server: FOOTBALL_DATA_URL=http://127.0.0.1:8000)
+BASE_URL = os.environ.get("FOOTBALL_DATA_URL", "https://www.football-data.co.uk/mmz4281")
+# Saisons: 2526 = 2025/2026 (actuelle), puis historique (closes, plus jamais retéléchargées)
+CURRENT_SEASON = "2526"
+SEASONS = [CURRENT_SEASON, "2425", "2324", "2223"]
+
+def download_data(downloader=None):
     leagues = {
         "E0": "Premier League",
         "E1": "Championship",
@@ -27,24 +32,30 @@ def download_data():
     }
 
     data_dir = "data"
-    if not os.path.exists(data_dir):
-        os.makedirs(data_dir)
+    jobs = []
+    for code in leagues:
+        for season in SEASONS:
+            url = f"{BASE_URL}/{season}/{code}.csv"
+            filename = os.path.join(data_dir, f"{code}_{season}.csv")
+            jobs.append((url, filename, season != CURRENT_SEASON))
 
+    print(f"\nDownloading {len(jobs)} files ({len(leagues)} leagues x {len(SEASONS)} seasons)...")
+    own_downloader = downloader is None
+    if own_downloader:
+        downloader = Downloader()
+    try:
+        results = downloader.fetch_all(jobs)
+    finally:
+        if own_downloader:
+            downloader.close()
+
+    ok = (DOWNLOADED, NOT_MODIFIED, SKIPPED)
     for code, name in leagues.items():
-        print(f"\nDownloading data for {name} ({code})...")
-        for season in seasons:
-            url = base_url.format(season, code)
-            filename = os.path.join(data_dir, f"{code}_{season}.csv")
-            
-            try:
-                response = requests.get(url)
-                response.raise_for_status()
-                
-                with open(filename, 'wb') as f:
-                    f.write(response.content)
-                print(f" -> {season}: Done.")
-            except requests.exceptions.RequestException as e:
-                print(f" -> {season}: Failed ({e})")
+        statuses = [results[os.path.join(data_dir, f"{code}_{season}.csv")] for season in SEASONS]
+        if any(status not in ok for status in statuses):
+            print(f" -> {name} ({code}): " + ', '.join(f"{season}: {status}" for season, status in zip(SEASONS, statuses)))
+    print(f" -> {summarize(results)}")
+    return results
 
 if __name__ == "__main__":
     download_data()
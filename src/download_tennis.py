@@ -1,47 +1,49 @@
+import sys
 import os
-import requests
-import pandas as pd
-from io import StringIO
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 from datetime import datetime
+from src.downloader import Downloader, summarize
 
 DATA_DIR = "data/tennis"
-# Switch to Jeff Sackmann's GitHub (Reliable)
-BASE_URL_ATP = "https://raw.githubusercontent.com/JeffSackmann/tennis_atp/master"
-BASE_URL_WTA = "https://raw.githubusercontent.com/JeffSackmann/tennis_wta/master"
+# Switch to Jeff Sackmann's GitHub (Reliable) - overridable (e.g. a local stand-in server)
+BASE_URL_ATP = os.environ.get("TENNIS_ATP_URL", "https://raw.githubusercontent.com/JeffSackmann/tennis_atp/master")
+BASE_URL_WTA = os.environ.get("TENNIS_WTA_URL", "https://raw.githubusercontent.com/JeffSackmann/tennis_wta/master")
 
-YEARS = [2024, 2025] 
+# Every season from FIRST_YEAR: the ingestion streams them all (see tennis_ingest.py)
+FIRST_YEAR = 2015
+YEARS = list(range(FIRST_YEAR, datetime.now().year + 1))
+# A season is closed (never requested again) only once a whole further year has passed:
+# late December results and corrections are published in the following weeks
+CLOSED_AFTER_YEARS = 2
 
-def download_data():
-    if not os.path.exists(DATA_DIR):
-        os.makedirs(DATA_DIR)
-        
+def download_data(downloader=None):
     print("=== Downloading Tennis Data (Source: Jeff Sackmann GitHub) ===")
-    
+
+    # URL Logic for Jeff Sackmann Repo
+    # ATP: atp_matches_YYYY.csv
+    # WTA: wta_matches_YYYY.csv
+    # Seasons older than last year are closed: once downloaded, they are never requested again
+    current_year = datetime.now().year
+    jobs = []
     for year in YEARS:
-        # URL Logic for Jeff Sackmann Repo
-        # ATP: atp_matches_YYYY.csv
-        # WTA: wta_matches_YYYY.csv
-        
-        atp_url = f"{BASE_URL_ATP}/atp_matches_{year}.csv"
-        wta_url = f"{BASE_URL_WTA}/wta_matches_{year}.csv"
-        
-        # Download ATP
-        _download_file(atp_url, f"atp_{year}.csv")
-        # Download WTA
-        _download_file(wta_url, f"wta_{year}.csv")
-
-def _download_file(url, filename):
+        closed = year <= current_year - CLOSED_AFTER_YEARS
+        jobs.append((f"{BASE_URL_ATP}/atp_matches_{year}.csv", os.path.join(DATA_DIR, f"atp_{year}.csv"), closed))
+        jobs.append((f"{BASE_URL_WTA}/wta_matches_{year}.csv", os.path.join(DATA_DIR, f"wta_{year}.csv"), closed))
+
+    own_downloader = downloader is None
+    if own_downloader:
+        downloader = Downloader()
     try:
-        print(f"Fetching {url}...")
-        r = requests.get(url, timeout=15)
-        if r.status_code == 200:
-            with open(os.path.join(DATA_DIR, filename), 'wb') as f:
-                f.write(r.content)
-            print(f" -> Success: {filename}")
-        else:
-            print(f" -> Not Found (HTTP {r.status_code}): {filename}")
-    except Exception as e:
-        print(f" -> Error downloading {filename}: {e}")
+        results = downloader.fetch_all(jobs)
+    finally:
+        if own_downloader:
+            downloader.close()
+
+    for path, status in results.items():
+        print(f" -> {os.path.basename(path)}: {status}")
+    print(f" -> {summarize(results)}")
+    return results
 
 if __name__ == "__main__":
     download_data()
@@ -0,0 +1,188 @@
+import os
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Sidecar file: validators (ETag / Last-Modified) of every downloaded URL
+STATE_FILE = os.path.join("data", "download_state.json")
+MAX_WORKERS = 8
+TIMEOUT = 20          # Seconds (connect + read)
+RETRIES = 3           # Extra attempts on network errors / 429 / 5xx
+BACKOFF = 1.0         # Seconds, doubled at each retry
+RETRY_STATUS = {429, 500, 502, 503, 504}
+CHUNK_SIZE = 1 << 20  # Bytes per write: bodies are streamed to disk, never held in memory whole
+
+# Result of a fetch
+DOWNLOADED = 'downloaded'
+NOT_MODIFIED = 'not_modified'
+SKIPPED = 'skipped'       # Closed season already on disk: no request at all
+MISSING = 'missing'       # 404 / 410
+FAILED = 'failed'
+
+
+class Downloader:
+    """
+    Shared HTTP download subsystem.
+
+    - One pooled requests.Session, used by a bounded thread pool
+    - Conditional requests (If-None-Match / If-Modified-Since): unchanged files cost a 304
+    - Closed seasons (closed=True) already on disk are not requested again
+    - Retries with exponential backoff on network errors, 429 and 5xx
+    - Streamed, atomic writes (temporary file + os.replace): readers never see a partial CSV
+    """
+
+    def __init__(self, state_file=STATE_FILE, max_workers=MAX_WORKERS, timeout=TIMEOUT,
+                 retries=RETRIES, backoff=BACKOFF):
+        self.state_file = state_file
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._lock = threading.Lock()
+        self.state = self._load_state()
+
+    def _load_state(self):
+        if not self.state_file or not os.path.exists(self.state_file):
+            return {}
+        try:
+            with open(self.state_file, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_state(self):
+        if not self.state_file:
+            return
+        with self._lock:
+            payload = json.dumps(self.state, indent=1, sort_keys=True)
+        write_atomic(self.state_file, payload.encode('utf-8'))
+
+    def _conditional_headers(self, url, dest):
+        """Validators from the previous download, or the local file mtime."""
+        if not os.path.exists(dest):
+            return {}
+        with self._lock:
+            entry = self.state.get(url, {})
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        elif not entry:
+            headers['If-Modified-Since'] = formatdate(os.path.getmtime(dest), usegmt=True)
+        return headers
+
+    def _remember(self, url, dest, response, closed):
+        with self._lock:
+            entry = self.state.setdefault(url, {})
+            entry['file'] = dest
+            entry['checked_at'] = int(time.time())
+            if response.headers.get('ETag'):
+                entry['etag'] = response.headers['ETag']
+            if response.headers.get('Last-Modified'):
+                entry['last_modified'] = response.headers['Last-Modified']
+            # Fetched after the season closed: this copy is final
+            entry['final'] = bool(closed)
+
+    def fetch(self, url, dest, closed=False):
+        """
+        Downloads url into dest if it changed.
+
+        Args:
+            url: Source URL
+            dest: Local path
+            closed: True for data that no longer changes (finished season)
+
+        Returns:
+            One of DOWNLOADED, NOT_MODIFIED, SKIPPED, MISSING, FAILED
+        """
+        with self._lock:
+            final = self.state.get(url, {}).get('final')
+        if closed and final and os.path.exists(dest):
+            return SKIPPED
+
+        headers = self._conditional_headers(url, dest)
+        for attempt in range(self.retries + 1):
+            if attempt:
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+            try:
+                response = self.session.get(url, headers=headers, timeout=self.timeout, stream=True)
+            except requests.exceptions.RequestException as e:
+                error = str(e)
+                continue
+
+            with response:
+                if response.status_code == 304:
+                    self._remember(url, dest, response, closed)
+                    return NOT_MODIFIED
+                if response.status_code in RETRY_STATUS:
+                    error = f"HTTP {response.status_code}"
+                    continue
+                if response.status_code in (404, 410):
+                    return MISSING
+                if response.status_code != 200:
+                    print(f" -> {os.path.basename(dest)}: HTTP {response.status_code}")
+                    return FAILED
+
+                try:
+                    write_atomic_chunks(dest, response.iter_content(CHUNK_SIZE))
+                except requests.exceptions.RequestException as e:
+                    error = str(e)  # Connection lost mid-body: dest is left untouched
+                    continue
+            self._remember(url, dest, response, closed)
+            return DOWNLOADED
+
+        print(f" -> {os.path.basename(dest)}: Failed after {self.retries + 1} attempts ({error})")
+        return FAILED
+
+    def fetch_all(self, jobs):
+        """
+        Runs fetch() for (url, dest, closed) jobs on the worker pool, then saves the state.
+        Returns {dest: status} in job order.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            statuses = list(pool.map(lambda job: self.fetch(*job), jobs))
+        self.save_state()
+        return {job[1]: status for job, status in zip(jobs, statuses)}
+
+    def close(self):
+        self.session.close()
+
+
+def write_atomic(path, content):
+    """Writes bytes to path through a temporary file in the same directory."""
+    write_atomic_chunks(path, [content])
+
+
+def write_atomic_chunks(path, chunks):
+    """write_atomic for an iterable of byte chunks (e.g. a streamed HTTP body)."""
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = os.path.join(directory, f".{os.path.basename(path)}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def summarize(results):
+    """Counts per status, e.g. 'downloaded: 3, not_modified: 12'."""
+    counts = {}
+    for status in results.values():
+        counts[status] = counts.get(status, 0) + 1
+    return ', '.join(f"{status}: {n}" for status, n in sorted(counts.items()))
@@ -1,3 +1,4 @@
+import os
 import pandas as pd
 import numpy as np
 from pathlib import Path
@@ -119,6 +120,7 @@ class EloRatingSystem:
         # Detect match type if not provided
         if 'MatchType' not in df.columns:
             df['MatchType'] = 'tournament'  # Default assumption
+        df['MatchType'] = df['MatchType'].fillna('tournament')
         
         for _, row in df.iterrows():
             home_team = row['HomeTeam']
@@ -151,17 +153,20 @@ class EloRatingSystem:
         return sorted_ratings[:n]
 
 
-def build_elo_ratings(data_file):
+def build_elo_ratings(data_file, store=None):
     """
     Build Elo ratings from a historical data file.
     
     Args:
         data_file: Path to CSV file with match data
+        store: Optional MatchStore; the file's matches are then read from SQLite
         
     Returns:
         EloRatingSystem instance with computed ratings
     """
-    df = pd.read_csv(data_file)
+    df = store.source_matches(os.path.basename(data_file)) if store is not None else None
+    if df is None or df.empty:
+        df = pd.read_csv(data_file)
     elo = EloRatingSystem()
     elo.process_historical_data(df)
     return elo
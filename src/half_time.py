@@ -0,0 +1,102 @@
+import numpy as np
+
+# Two-period score engine: each team's expected goals split into a first and a second half,
+# independent Poisson goals per half. For a batch of fixtures, one vectorized pass gives the
+# joint half-time x full-time result tensor and the markets derived from it:
+# HT/FT (9 outcomes), half-time 1X2, second-half 1X2 and highest scoring half.
+# No Dixon-Coles term here: that correction is defined on full-time scores only.
+
+MAX_HALF_GOALS = 10   # Per team and per half
+HALF_TIME_SHARE = 0.45  # Share of the goals scored before the break, when the data has no HT score
+RESULTS = ('1', 'X', '2')
+
+# Goal difference of one half: cells (home goals, away goals) -> difference index (diff + MAX - 1)
+_GOALS = np.arange(MAX_HALF_GOALS)
+_N_DIFF = 2 * MAX_HALF_GOALS - 1
+_DIFF_ONEHOT = np.eye(_N_DIFF)[(_GOALS[:, None] - _GOALS[None, :] + MAX_HALF_GOALS - 1).ravel()]
+# Result (0 = home, 1 = draw, 2 = away) of a goal difference index
+_DIFFS = np.arange(_N_DIFF) - (MAX_HALF_GOALS - 1)
+_HT_RESULT = np.where(_DIFFS > 0, 0, np.where(_DIFFS == 0, 1, 2))
+_FT_DIFFS = _DIFFS[:, None] + _DIFFS[None, :]
+_FT_RESULT = np.where(_FT_DIFFS > 0, 0, np.where(_FT_DIFFS == 0, 1, 2))
+# (first-half diff, second-half diff) -> HT/FT cell (ht_result * 3 + ft_result)
+_HT_FT_ONEHOT = np.eye(9)[(_HT_RESULT[:, None] * 3 + _FT_RESULT).ravel()]
+_RESULT_ONEHOT = np.eye(3)[_HT_RESULT]
+
+
+def _poisson_pmfs(lam, size):
+    """P(X = 0..size-1) for each X ~ Poisson(lam[i]): array (n, size), recurrence on the factors."""
+    lam = np.asarray(lam, dtype=float)
+    factors = np.empty((len(lam), size))
+    factors[:, 0] = np.exp(-lam)
+    factors[:, 1:] = lam[:, None] / np.arange(1, size)
+    return np.cumprod(factors, axis=1)
+
+
+def _diff_pmfs(lam_home, lam_away):
+    """Distribution of home - away goals over one half: array (n, 2 * MAX_HALF_GOALS - 1)."""
+    home, away = _poisson_pmfs(lam_home, MAX_HALF_GOALS), _poisson_pmfs(lam_away, MAX_HALF_GOALS)
+    return (home[:, :, None] * away[:, None, :]).reshape(len(home), -1) @ _DIFF_ONEHOT
+
+
+def split_expected_goals(xg, first_half_share):
+    """Full-match expected goals -> (first half, second half)."""
+    xg, share = np.asarray(xg, dtype=float), np.asarray(first_half_share, dtype=float)
+    return xg * share, xg * (1.0 - share)
+
+
+def half_time_markets(home_1h, away_1h, home_2h, away_2h):
+    """
+    Two-period markets for arrays of fixtures (expected goals of each team in each half).
+
+    Returns:
+        Dict of probability arrays (rows sum to 1):
+        'ht_ft' (n, 3, 3) [half-time result, full-time result], 'half_time', 'second_half',
+        'full_time' (n, 3) [home, draw, away] and 'highest_half' (n, 3) [first, equal, second]
+    """
+    first, second = _diff_pmfs(home_1h, away_1h), _diff_pmfs(home_2h, away_2h)
+    n = len(first)
+
+    # Joint (first-half difference, second-half difference), folded into the 9 HT/FT cells
+    ht_ft = (first[:, :, None] * second[:, None, :]).reshape(n, -1) @ _HT_FT_ONEHOT
+    ht_ft = ht_ft.reshape(n, 3, 3)
+    ht_ft /= ht_ft.sum(axis=(1, 2))[:, None, None]
+    second_half = second @ _RESULT_ONEHOT
+
+    # Highest scoring half: total goals of each half are Poisson(home + away)
+    size = 2 * MAX_HALF_GOALS - 1
+    total_1h = _poisson_pmfs(np.asarray(home_1h, dtype=float) + away_1h, size)
+    total_2h = _poisson_pmfs(np.asarray(home_2h, dtype=float) + away_2h, size)
+    cdf_2h = np.cumsum(total_2h, axis=1)
+    more_first = (total_1h[:, 1:] * cdf_2h[:, :-1]).sum(axis=1)
+    equal = (total_1h * total_2h).sum(axis=1)
+    more_second = (total_2h[:, 1:] * np.cumsum(total_1h, axis=1)[:, :-1]).sum(axis=1)
+    highest = np.stack([more_first, equal, more_second], axis=1)
+    highest /= highest.sum(axis=1)[:, None]
+
+    return {
+        'ht_ft': ht_ft,
+        'half_time': ht_ft.sum(axis=2),
+        'second_half': second_half / second_half.sum(axis=1)[:, None],
+        'full_time': ht_ft.sum(axis=1),
+        'highest_half': highest,
+    }
+
+
+def format_markets(markets, i):
+    """Percentages of fixture i of half_time_markets(), as a JSON-ready dict."""
+    def pct(values):
+        return round(float(values) * 100, 1)
+
+    def one_x_two(row):
+        return {'win_prob': pct(row[0]), 'draw_prob': pct(row[1]), 'loss_prob': pct(row[2])}
+
+    ht_ft = markets['ht_ft'][i]
+    return {
+        'ht_ft': {f"{RESULTS[h]}/{RESULTS[f]}": pct(ht_ft[h, f]) for h in range(3) for f in range(3)},
+        'half_time': one_x_two(markets['half_time'][i]),
+        'second_half': one_x_two(markets['second_half'][i]),
+        'highest_scoring_half': {'first': pct(markets['highest_half'][i][0]),
+                                 'equal': pct(markets['highest_half'][i][1]),
+                                 'second': pct(markets['highest_half'][i][2])},
+    }
@@ -0,0 +1,149 @@
+import os
+from itertools import chain
+import numpy as np
+import pandas as pd
+from src.downloader import write_atomic_chunks
+
+# Ingestion of the martj42 international results (results.csv): every played match, with a
+# MatchType derived from the tournament ('friendly', 'qualifier', 'tournament', the categories
+# of the EloRatingSystem K-factor). The raw file is parsed in chunks, and only the last weeks of
+# the normalized copy are re-parsed on later runs. AFCON.csv is derived from it.
+
+MATCHES_FILE = os.path.join("data", "raw", "international_matches.csv")
+CHUNK_ROWS = 20000
+RAW_COLUMNS = ['date', 'home_team', 'away_team', 'home_score', 'away_score', 'tournament', 'neutral']
+MATCH_COLUMNS = ['Date', 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG', 'Tournament', 'Neutral', 'MatchType']
+KEY_COLUMNS = ['Date', 'HomeTeam', 'AwayTeam']
+# Days before the last stored date that are re-parsed on each run: results entered late
+# (fixture stored without a score) and corrections of recent scores are picked up
+REINGEST_DAYS = 30
+# AFCON.csv: matches between two CAF nations (teams that ever played the AFCON or its qualifiers)
+AFCON_TOURNAMENT = "African Cup of Nations"
+AFCON_START_DATE = "2018-01-01"
+AFCON_COLUMNS = ['Date', 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG', 'MatchType']
+
+
+def match_types(tournaments):
+    """'Friendly' -> 'friendly', '... qualification' -> 'qualifier', anything else -> 'tournament'."""
+    tournaments = tournaments.fillna('')
+    return np.select([tournaments.eq('Friendly'), tournaments.str.contains('qualification', case=False)],
+                     ['friendly', 'qualifier'], default='tournament')
+
+
+def last_stored_date(path):
+    """Date of the last row of a CSV written in date order (read from the end of the file), or None."""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(f.tell() - 4096, 0))
+        lines = [line for line in f.read().decode('utf-8', errors='replace').splitlines() if line.strip()]
+    date = lines[-1].split(',', 1)[0] if lines else ''
+    return None if date in ('', 'Date') else date  # Empty file / header only
+
+
+def _tail_offset(path, cutoff):
+    """Byte offset of the first row dated cutoff or later (rows in date order, ISO dates first)."""
+    with open(path, 'rb') as f:
+        f.readline()  # Header
+        while True:
+            offset = f.tell()
+            line = f.readline()
+            if not line or line[:10].decode('ascii', errors='replace') >= cutoff:
+                return offset
+
+
+def _normalize(chunk):
+    """Raw results.csv rows -> MATCH_COLUMNS (played matches only)."""
+    chunk = chunk.dropna(subset=['date', 'home_team', 'away_team', 'home_score', 'away_score'])
+    return pd.DataFrame({
+        'Date': chunk['date'],
+        'HomeTeam': chunk['home_team'],
+        'AwayTeam': chunk['away_team'],
+        'FTHG': chunk['home_score'].astype(int),
+        'FTAG': chunk['away_score'].astype(int),
+        'Tournament': chunk['tournament'],
+        'Neutral': chunk['neutral'].astype(str).str.upper().eq('TRUE'),
+        'MatchType': match_types(chunk['tournament']),
+    })
+
+
+def _csv_chunks(frames, header):
+    for frame in frames:
+        yield frame.to_csv(index=False, header=header).encode('utf-8')
+        header = False
+
+
+def _copy_head(path, size, block=1 << 20):
+    """First `size` bytes of path, in blocks."""
+    with open(path, 'rb') as f:
+        while size > 0:
+            data = f.read(min(block, size))
+            if not data:
+                return
+            size -= len(data)
+            yield data
+
+
+def ingest_results(raw_file, matches_file=MATCHES_FILE, full=False, window_days=REINGEST_DAYS):
+    """
+    Brings matches_file in line with results.csv. Only the last `window_days` before the last stored
+    date are re-parsed (matches scored late, corrected scores): that tail is replaced by the raw rows
+    from the same date on, deduplicated on (Date, HomeTeam, AwayTeam); the rows before it are copied
+    as bytes. The whole file is rebuilt when it does not exist yet or full=True. Every write goes
+    through a temporary file (no partial last line after a crash).
+    Returns the number of new or changed rows (0: matches_file left untouched).
+    """
+    last = None if full else last_stored_date(matches_file)
+    cutoff = None
+    if last is not None:
+        cutoff = (pd.Timestamp(last) - pd.Timedelta(days=window_days)).strftime('%Y-%m-%d')
+
+    frames = []
+    for chunk in pd.read_csv(raw_file, usecols=RAW_COLUMNS, chunksize=CHUNK_ROWS,
+                             dtype={'date': str, 'home_team': str, 'away_team': str, 'tournament': str}):
+        if cutoff is not None:
+            chunk = chunk[chunk['date'] >= cutoff]  # ISO dates: string order is date order
+        rows = _normalize(chunk)
+        if len(rows):
+            frames.append(rows)
+    new = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=MATCH_COLUMNS)
+    new = new.drop_duplicates(KEY_COLUMNS, keep='last').sort_values('Date', kind='stable')
+
+    if cutoff is None:
+        # First run / rebuild: written through a temporary file, replaced at the end
+        write_atomic_chunks(matches_file, _csv_chunks([new], header=True))
+        return len(new)
+
+    offset = _tail_offset(matches_file, cutoff)
+    with open(matches_file, 'rb') as f:
+        f.seek(offset)
+        old = pd.read_csv(f, names=MATCH_COLUMNS, dtype={'Date': str, 'Tournament': str})
+    # Rows of the new tail that the stored tail does not have exactly (new match or corrected values)
+    old['Neutral'] = old['Neutral'].astype(str).str.upper().eq('TRUE')
+    changed = len(new.merge(old, how='left', indicator=True).query("_merge == 'left_only'"))
+    if changed == 0 and len(new) == len(old):
+        return 0
+
+    # Stored rows before the cutoff, then the re-parsed tail, atomically
+    write_atomic_chunks(matches_file, chain(_copy_head(matches_file, offset), _csv_chunks([new], header=False)))
+    return changed
+
+
+def derive_afcon(matches_file=MATCHES_FILE, output_file=os.path.join("data", "AFCON.csv"),
+                 start_date=AFCON_START_DATE):
+    """
+    Writes AFCON.csv: every match since start_date between two CAF nations (friendlies, World Cup
+    qualifiers, regional cups, AFCON), with its MatchType. Returns the number of matches.
+    """
+    caf_teams = set()
+    recent = []
+    for chunk in pd.read_csv(matches_file, chunksize=CHUNK_ROWS, usecols=AFCON_COLUMNS + ['Tournament']):
+        afcon = chunk['Tournament'].fillna('').str.startswith(AFCON_TOURNAMENT)
+        caf_teams.update(chunk.loc[afcon, 'HomeTeam'])
+        caf_teams.update(chunk.loc[afcon, 'AwayTeam'])
+        recent.append(chunk.loc[chunk['Date'] >= start_date, AFCON_COLUMNS])
+    df = pd.concat(recent, ignore_index=True)
+    df = df[df['HomeTeam'].isin(caf_teams) & df['AwayTeam'].isin(caf_teams)]
+    write_atomic_chunks(output_file, [df.to_csv(index=False).encode('utf-8')])
+    return len(df)
@@ -0,0 +1,82 @@
+import math
+import numpy as np
+from src.model import score_matrices, RHO
+
+# In-play probabilities: the pre-match expected goals of the model (full match), scaled to the
+# minutes left, plus the current score, on the model's Dixon-Coles score matrix (same rho as the
+# predictor, so that minute 0 reproduces /predict).
+
+MATCH_MINUTES = 90
+MAX_REMAINING_GOALS = 10  # Per team, for the rest of the match
+TOTAL_LINES = (0.5, 1.5, 2.5, 3.5, 4.5)
+
+# Goal difference (home - away) of each cell of a remaining-goals matrix
+_GOALS = np.arange(MAX_REMAINING_GOALS)
+_DIFF = _GOALS[:, None] - _GOALS[None, :]
+_SUM = (_GOALS[:, None] + _GOALS[None, :]).ravel()
+
+
+def remaining_expected_goals(home_xg, away_xg, minute, match_minutes=MATCH_MINUTES):
+    """Pre-match (full-match) expected goals scaled to the minutes left."""
+    left = min(max(match_minutes - minute, 0), match_minutes) / match_minutes
+    return home_xg * left, away_xg * left
+
+
+def live_probabilities(home_xg, away_xg, minute, home_goals=0, away_goals=0,
+                       match_minutes=MATCH_MINUTES, lines=TOTAL_LINES, rho=RHO):
+    """
+    Updated outcome probabilities at `minute` with the current score.
+
+    Args:
+        home_xg / away_xg: Pre-match expected goals for the whole match (model lambdas)
+        minute: Minutes played (>= match_minutes: the current score is final)
+        home_goals / away_goals: Current score
+        rho: Dixon-Coles dependence of the predictor (Ligue1Predictor.rho)
+
+    Returns:
+        Dict with 1X2, totals (over each line), next goal and most likely final score (percentages)
+    """
+    lam_home, lam_away = remaining_expected_goals(home_xg, away_xg, minute, match_minutes)
+    # Dixon-Coles matrix of the remaining goals (at kick-off: the pre-match matrix)
+    matrix = score_matrices([lam_home], [lam_away], rho, MAX_REMAINING_GOALS)[0]
+    matrix /= matrix.sum()
+
+    # Final result: home wins if the remaining goal difference beats the current deficit
+    deficit = away_goals - home_goals
+    win = matrix[_DIFF > deficit].sum()
+    draw = matrix[_DIFF == deficit].sum()
+    loss = matrix[_DIFF < deficit].sum()
+
+    # Totals: distribution of the remaining goals of both teams
+    current_total = home_goals + away_goals
+    total_cdf = np.cumsum(np.bincount(_SUM, weights=matrix.ravel()))
+    totals = []
+    for line in lines:
+        # Over the line <=> more than (line - current_total) remaining goals
+        needed = math.floor(line - current_total)
+        over = 1.0 if needed < 0 else 1.0 - total_cdf[min(needed, len(total_cdf) - 1)]
+        totals.append({'line': line, 'over': round(float(over) * 100, 1)})
+
+    # Next goal: first event of two Poisson processes
+    lam_total = lam_home + lam_away
+    no_goal = math.exp(-lam_total)
+    home_next = lam_home / lam_total * (1 - no_goal) if lam_total > 0 else 0.0
+    away_next = lam_away / lam_total * (1 - no_goal) if lam_total > 0 else 0.0
+
+    best_home, best_away = divmod(int(np.argmax(matrix)), MAX_REMAINING_GOALS)
+    return {
+        'minute': minute,
+        'score': f"{home_goals}-{away_goals}",
+        'remaining_xg_home': round(lam_home, 2),
+        'remaining_xg_away': round(lam_away, 2),
+        'win_prob': round(float(win) * 100, 1),
+        'draw_prob': round(float(draw) * 100, 1),
+        'loss_prob': round(float(loss) * 100, 1),
+        'totals': totals,
+        'next_goal': {
+            'home': round(home_next * 100, 1),
+            'away': round(away_next * 100, 1),
+            'none': round(no_goal * 100, 1),
+        },
+        'most_likely_final_score': f"{home_goals + best_home}-{away_goals + best_away}",
+    }
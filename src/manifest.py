@@ -0,0 +1,169 @@
+import os
+import json
+import time
+import hashlib
+import pandas as pd
+from src.downloader import write_atomic
+
+DATA_DIR = "data"
+MANIFEST_FILE = os.path.join(DATA_DIR, "manifest.json")
+# Sub-directories of DATA_DIR scanned with it (raw/ and cache/ are not model inputs)
+SUB_DIRS = ("tennis",)
+UPDATE_MAX_AGE = 86400  # Seconds between two automatic updates
+
+# Date column per file family: football-data / AFCON ('Date'), Sackmann ('tourney_date')
+DATE_COLUMNS = ('Date', 'tourney_date')
+
+
+def _sha256(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def parse_match_dates(dates):
+    """
+    Dates of the data files: football-data.co.uk is day-first (dd/mm/yyyy), the
+    international results are ISO (yyyy-mm-dd), which a day-first parse would swap.
+    """
+    dates = dates.astype(str)
+    iso = dates.str.match(r'^\d{4}-\d{2}-\d{2}')
+    parsed = pd.to_datetime(dates.where(~iso), errors='coerce', dayfirst=True, format='mixed')
+    if iso.any():
+        parsed[iso] = pd.to_datetime(dates[iso], errors='coerce', format='ISO8601')
+    return parsed
+
+
+def _rows_and_last_date(path):
+    """Number of rows and last match date (ISO string, None if no date column)."""
+    try:
+        df = pd.read_csv(path, encoding='latin1', usecols=lambda c: c in DATE_COLUMNS, dtype=str)
+    except (ValueError, pd.errors.ParserError, pd.errors.EmptyDataError):
+        return 0, None
+    if 'tourney_date' in df.columns:
+        dates = pd.to_datetime(df['tourney_date'], format='%Y%m%d', errors='coerce')
+    elif 'Date' in df.columns:
+        dates = parse_match_dates(df['Date'].dropna())
+    else:
+        return len(df), None
+    last = dates.max()
+    return len(df), None if pd.isna(last) else last.strftime('%Y-%m-%d')
+
+
+def file_entry(path):
+    """Manifest entry of one data file."""
+    stat = os.stat(path)
+    rows, last_date = _rows_and_last_date(path)
+    return {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': _sha256(path),
+        'rows': rows,
+        'last_date': last_date,
+    }
+
+
+def data_files(data_dir=DATA_DIR):
+    """Model input files, as paths relative to data_dir ('E0_2526.csv', 'tennis/atp_2024.csv')."""
+    names = []
+    for sub_dir in ('',) + SUB_DIRS:
+        directory = os.path.join(data_dir, sub_dir)
+        if not os.path.isdir(directory):
+            continue
+        for filename in os.listdir(directory):
+            if filename.endswith('.csv') and not filename.startswith('.'):
+                names.append(f"{sub_dir}/{filename}" if sub_dir else filename)
+    return sorted(names)
+
+
+def scan(previous=None, data_dir=DATA_DIR):
+    """
+    Builds a manifest {'files': {name: entry}, 'updated_at': ...} of data_dir.
+    Files whose size and mtime match the previous manifest are not re-hashed.
+    """
+    previous = previous or {}
+    old_files = previous.get('files', {})
+    files = {}
+    for name in data_files(data_dir):
+        path = os.path.join(data_dir, name)
+        old = old_files.get(name)
+        try:
+            stat = os.stat(path)
+            if old and old['size'] == stat.st_size and old['mtime_ns'] == stat.st_mtime_ns:
+                files[name] = old
+            else:
+                files[name] = file_entry(path)
+        except OSError:
+            # Removed while scanning
+            continue
+    manifest = {'files': files}
+    if 'updated_at' in previous:
+        manifest['updated_at'] = previous['updated_at']
+    return manifest
+
+
+def load_manifest(path=MANIFEST_FILE):
+    if not os.path.exists(path):
+        return {'files': {}}
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'files': {}}
+
+
+def save_manifest(manifest, path=MANIFEST_FILE):
+    write_atomic(path, json.dumps(manifest, indent=1, sort_keys=True).encode('utf-8'))
+
+
+def diff(old, new):
+    """Names of the files added, modified (content hash) or removed between two manifests."""
+    old_files, new_files = old.get('files', {}), new.get('files', {})
+    changed = {name for name in new_files if name not in old_files
+               or old_files[name]['sha256'] != new_files[name]['sha256']}
+    changed |= set(old_files) - set(new_files)
+    return changed
+
+
+def _is_competition_file(name, comp):
+    """True if data file `name` is an input of competition `comp` (an app.COMPETITIONS entry)."""
+    if '/' in name:
+        return False
+    return (name == comp['code']) if comp['is_file'] else name.startswith(comp['code'])
+
+
+def affected_competitions(changed, competitions):
+    """Competition keys whose input files are in `changed` (see app.COMPETITIONS)."""
+    return {key for key, comp in competitions.items()
+            if any(_is_competition_file(name, comp) for name in changed)}
+
+
+def competition_signature(manifest, comp, extra=None):
+    """
+    Identifies the input files of a competition (name, sha256) plus `extra` (model version,
+    modifiers): any change invalidates its model snapshot. None if the manifest has no file for it.
+    """
+    files = [[name, entry['sha256']] for name, entry in sorted(manifest.get('files', {}).items())
+             if _is_competition_file(name, comp)]
+    if not files:
+        return None
+    return json.dumps({'files': files, 'extra': extra}, sort_keys=True)
+
+
+def tennis_changed(changed):
+    return any(name.startswith('tennis/') for name in changed)
+
+
+def mark_updated(manifest):
+    """Records a successful download run."""
+    manifest['updated_at'] = int(time.time())
+    return manifest
+
+
+def is_stale(manifest, max_age=UPDATE_MAX_AGE):
+    """True if there is no data yet or the last update is older than max_age."""
+    if not manifest.get('files'):
+        return True
+    return time.time() - manifest.get('updated_at', 0) > max_age
@@ -0,0 +1,238 @@
+import os
+import sqlite3
+import threading
+import pandas as pd
+from src import manifest as data_manifest
+
+STORE_FILE = os.path.join("data", "cache", "matches.sqlite")
+
+# Result columns of a match (same names as the football-data.co.uk files)
+MATCH_COLUMNS = ['Date', 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG', 'HTHG', 'HTAG', 'HST', 'AST', 'HS', 'AS',
+                 'Estimated_xG_Home', 'Estimated_xG_Away', 'MatchType']
+# Bump when the schema or the row parsing changes: every file is then re-imported on the next sync
+SCHEMA_VERSION = 4
+SHOT_COLUMNS = ['HST', 'AST', 'HS', 'AS']
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    source TEXT PRIMARY KEY,        -- data file name ('E0_2526.csv')
+    competition TEXT NOT NULL,      -- league code ('E0') or file name ('AFCON.csv')
+    sha256 TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS matches (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    competition TEXT NOT NULL,
+    date TEXT NOT NULL,             -- ISO yyyy-mm-dd
+    home TEXT NOT NULL,
+    away TEXT NOT NULL,
+    fthg REAL NOT NULL,
+    ftag REAL NOT NULL,
+    hthg REAL, htag REAL,           -- half-time score (empty if the file has none)
+    hst REAL, ast REAL, hs REAL, "as" REAL,
+    xg_home REAL, xg_away REAL,
+    match_type TEXT                 -- 'friendly' / 'qualifier' / 'tournament' (international files only)
+);
+CREATE INDEX IF NOT EXISTS idx_matches_competition_date ON matches (competition, date);
+CREATE INDEX IF NOT EXISTS idx_matches_home_away ON matches (home, away);
+CREATE INDEX IF NOT EXISTS idx_matches_away_home ON matches (away, home);
+CREATE INDEX IF NOT EXISTS idx_matches_source ON matches (source);
+"""
+
+_SELECT = """SELECT date AS Date, home AS HomeTeam, away AS AwayTeam, fthg AS FTHG, ftag AS FTAG,
+    hthg AS HTHG, htag AS HTAG, hst AS HST, ast AS AST, hs AS HS, "as" AS "AS",
+    xg_home AS Estimated_xG_Home, xg_away AS Estimated_xG_Away, match_type AS MatchType FROM matches"""
+
+
+def competition_of(filename):
+    """'E0_2526.csv' -> 'E0' ; files without a season suffix ('AFCON.csv') are their own competition."""
+    return filename.split('_')[0] if '_' in filename else filename
+
+
+def read_results_csv(path):
+    """
+    Played matches of one football file, with the per-file rules of Ligue1Predictor._load_data:
+    shot columns missing from the file are 0, xG, half-time and MatchType columns missing from the file stay empty.
+    Returns None if the file has no result columns.
+    """
+    try:
+        df = pd.read_csv(path)
+    except UnicodeDecodeError:
+        df = pd.read_csv(path, encoding='latin1')
+    if not all(col in df.columns for col in ['Date', 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG']):
+        return None
+    missing_shots = [col for col in SHOT_COLUMNS if col not in df.columns]
+    df = df.reindex(columns=MATCH_COLUMNS)
+    df[missing_shots] = 0
+    df = df.dropna(subset=['Date', 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG'])
+    dates = data_manifest.parse_match_dates(df['Date'])
+    df = df.assign(Date=dates.dt.strftime('%Y-%m-%d')).dropna(subset=['Date'])
+    return df
+
+
+def load_results(competitions, store=None, data_dir=data_manifest.DATA_DIR):
+    """
+    Scores of the competitions' files (competition, Date, HomeTeam, AwayTeam, FTHG, FTAG), oldest first:
+    one query on the store when it has every competition with a file in data_dir, else the CSVs
+    read one file at a time (a partly synced store would leave competitions out).
+    """
+    names = sorted(name for name in os.listdir(data_dir)
+                   if name.endswith('.csv') and competition_of(name) in competitions)
+    if store is not None:
+        wanted = sorted({competition_of(name) for name in names})
+        if wanted and all(store.has_competition(code) for code in wanted):
+            return store.results(wanted)
+
+    frames = []
+    for name in names:
+        df = read_results_csv(os.path.join(data_dir, name))
+        if df is not None:
+            frames.append(df[['Date', 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG']].assign(competition=competition_of(name)))
+    if not frames:
+        return pd.DataFrame(columns=['competition', 'Date', 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG'])
+    df = pd.concat(frames, ignore_index=True)
+    df['Date'] = pd.to_datetime(df['Date'], format='%Y-%m-%d')
+    return df.sort_values('Date', kind='stable').reset_index(drop=True)
+
+
+class MatchStore:
+    """
+    Local SQLite copy of every football result in data/ (one normalized `matches` table).
+
+    Indexed on (competition, date), (home, away) and (away, home): a league, a date
+    range, a team's history or a head-to-head are index lookups instead of CSV scans.
+    Each thread gets its own connection (WAL mode: readers never wait for a sync).
+    """
+
+    def __init__(self, path=STORE_FILE):
+        self.path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with self._write_lock:
+            conn = self.connection()
+            if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                # Older layout: rebuilt, then refilled from the data files by the next sync()
+                conn.executescript("DROP TABLE IF EXISTS matches; DROP TABLE IF EXISTS sources;")
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.executescript(_SCHEMA)
+            conn.commit()
+
+    def connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # === INGESTION ===
+
+    def sync(self, manifest=None, data_dir=data_manifest.DATA_DIR):
+        """
+        Brings the store in line with the football files of data_dir: files whose hash
+        changed are re-imported, removed files are dropped, the others are not read.
+        Returns the list of re-imported files.
+        """
+        if manifest is None:
+            manifest = data_manifest.scan(previous=data_manifest.load_manifest(), data_dir=data_dir)
+        files = {name: entry['sha256'] for name, entry in manifest.get('files', {}).items() if '/' not in name}
+
+        with self._write_lock:
+            conn = self.connection()
+            known = dict(conn.execute("SELECT source, sha256 FROM sources"))
+            imported = []
+            with conn:
+                for source in set(known) - set(files):
+                    conn.execute("DELETE FROM matches WHERE source = ?", (source,))
+                    conn.execute("DELETE FROM sources WHERE source = ?", (source,))
+                for source, sha256 in sorted(files.items()):
+                    if known.get(source) == sha256:
+                        continue
+                    self._import_file(conn, os.path.join(data_dir, source), source, sha256)
+                    imported.append(source)
+        return imported
+
+    def _import_file(self, conn, path, source, sha256):
+        competition = competition_of(source)
+        conn.execute("DELETE FROM matches WHERE source = ?", (source,))
+        try:
+            df = read_results_csv(path)
+        except Exception as e:
+            print(f"Error loading {path}: {e}")
+            df = None
+        if df is not None:
+            rows = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+            conn.executemany(
+                """INSERT INTO matches (source, competition, date, home, away, fthg, ftag, hthg, htag,
+                   hst, ast, hs, "as", xg_home, xg_away, match_type)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                ((source, competition) + row for row in rows))
+        conn.execute("INSERT OR REPLACE INTO sources (source, competition, sha256) VALUES (?, ?, ?)",
+                     (source, competition, sha256))
+
+    # === QUERIES ===
+
+    def _frame(self, where, params):
+        df = pd.read_sql_query(f"{_SELECT} WHERE {where} ORDER BY date, id", self.connection(), params=params)
+        df['Date'] = pd.to_datetime(df['Date'], format='%Y-%m-%d')
+        return df
+
+    def has_competition(self, competition):
+        row = self.connection().execute(
+            "SELECT 1 FROM sources WHERE competition = ? LIMIT 1", (competition,)).fetchone()
+        return row is not None
+
+    def matches(self, competition, start=None, end=None):
+        """Matches of a competition (optionally start <= date <= end, ISO strings), oldest first."""
+        where, params = "competition = ?", [competition]
+        if start:
+            where += " AND date >= ?"
+            params.append(start)
+        if end:
+            where += " AND date <= ?"
+            params.append(end)
+        return self._frame(where, params)
+
+    def source_matches(self, source):
+        """Matches imported from one data file ('E0_2526.csv'), oldest first."""
+        return self._frame("source = ?", [source])
+
+    def recent_results(self, team, competition=None, n=15):
+        """Last n results of a team, oldest first, as (goals_for, goals_against) tuples."""
+        where, params = "(home = ? OR away = ?)", [team, team]
+        if competition:
+            where += " AND competition = ?"
+            params.append(competition)
+        rows = self.connection().execute(
+            f"""SELECT home = ?, fthg, ftag FROM matches WHERE {where}
+                ORDER BY date DESC, id DESC LIMIT ?""", [team] + params + [n]).fetchall()
+        return [(h, a) if is_home else (a, h) for is_home, h, a in reversed(rows)]
+
+    def results(self, competitions):
+        """Scores only (competition, date, teams, goals) of several competitions, oldest first."""
+        marks = ', '.join('?' * len(competitions))
+        df = pd.read_sql_query(
+            f"""SELECT competition, date AS Date, home AS HomeTeam, away AS AwayTeam, fthg AS FTHG, ftag AS FTAG
+                FROM matches WHERE competition IN ({marks}) ORDER BY date, id""",
+            self.connection(), params=list(competitions))
+        df['Date'] = pd.to_datetime(df['Date'], format='%Y-%m-%d')
+        return df
+
+    def competition_summary(self):
+        """Per competition: number of matches, first and last match date."""
+        return pd.read_sql_query(
+            """SELECT competition, COUNT(*) AS matches, MIN(date) AS first_date, MAX(date) AS last_date
+               FROM matches GROUP BY competition ORDER BY competition""", self.connection())
+
+    def count_since(self, competition, start):
+        """Number of matches of a competition played on or after `start` (ISO string)."""
+        return self.connection().execute(
+            "SELECT COUNT(*) FROM matches WHERE competition = ? AND date >= ?", (competition, start)).fetchone()[0]
@@ -0,0 +1,218 @@
+import os
+import time
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+
+# Instrumentation is always cheap (a perf_counter call + a bucket bisect),
+# and can be switched off entirely with METRICS_ENABLED=0.
+ENABLED = os.environ.get('METRICS_ENABLED', '1') != '0'
+
+# Latency buckets (seconds) - from sub-millisecond lookups to full model trainings
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_REGISTRY = []
+_REGISTRY_LOCK = threading.Lock()
+
+
+def _escape_label(value):
+    """Label value escaping of the text exposition format: backslash, double quote, line feed."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value):
+    """Exact sample value: integral counts as ints (no 6-digit rounding), else the float repr."""
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def _format_labels(labelnames, values, extra=None):
+    pairs = list(zip(labelnames, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    body = ','.join(f'{k}="{_escape_label(v)}"' for k, v in pairs)
+    return '{' + body + '}'
+
+
+class _Metric(ABC):
+    kind = None
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+        with _REGISTRY_LOCK:
+            _REGISTRY.append(self)
+
+    def labels(self, *values):
+        """Returns the child metric for the given label values (cached)."""
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.get(values)
+                if child is None:
+                    child = self._new_child()
+                    self._children[values] = child
+        return child
+
+    @abstractmethod
+    def _new_child(self):
+        """New per-label-values child (_CounterChild, _HistogramChild)."""
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in sorted(self._children.items()):
+            lines.extend(child.render(self.name, self.labelnames, values))
+        return lines
+
+
+class _CounterChild:
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        if not ENABLED:
+            return
+        with self._lock:
+            self.value += amount
+
+    def render(self, name, labelnames, values):
+        return [f"{name}{_format_labels(labelnames, values)} {_format_value(self.value)}"]
+
+
+class Counter(_Metric):
+    """Monotonic counter (cache hits, evictions, requests...)."""
+    kind = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount=1):
+        self.labels().inc(amount)
+
+
+class _HistogramChild:
+    __slots__ = ('buckets', 'counts', 'sum', 'count', '_lock')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        if not ENABLED:
+            return
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[idx] += 1
+            self.sum += value
+            self.count += 1
+
+    @contextmanager
+    def time(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def render(self, name, labelnames, values):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f"{name}_bucket{_format_labels(labelnames, values, ('le', f'{bound:g}'))} {cumulative}")
+        lines.append(f"{name}_bucket{_format_labels(labelnames, values, ('le', '+Inf'))} {self.count}")
+        lines.append(f"{name}_sum{_format_labels(labelnames, values)} {self.sum:.6f}")
+        lines.append(f"{name}_count{_format_labels(labelnames, values)} {self.count}")
+        return lines
+
+
+class Histogram(_Metric):
+    """Latency histogram with fixed buckets (Prometheus semantics)."""
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, help_text, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value):
+        self.labels().observe(value)
+
+    def time(self, *values):
+        return self.labels(*values).time()
+
+
+def timed(histogram, *values):
+    """Decorator recording the duration of each call in `histogram`."""
+    def decorator(func):
+        child = histogram.labels(*values)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                child.observe(time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def render():
+    """Renders every registered metric in the Prometheus text format (v0.0.4)."""
+    lines = []
+    with _REGISTRY_LOCK:
+        metrics = list(_REGISTRY)
+    for metric in metrics:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+# === SHARED METRICS ===
+# Football model
+MODEL_PHASE_SECONDS = Histogram(
+    'football_model_phase_seconds',
+    'Duration of Ligue1Predictor load/train phases.',
+    ('league', 'phase'))
+PREDICT_STAGE_SECONDS = Histogram(
+    'football_predict_stage_seconds',
+    'Duration of predict_match stages.',
+    ('stage',))
+
+# Tennis model
+TENNIS_PHASE_SECONDS = Histogram(
+    'tennis_model_phase_seconds',
+    'Duration of AdvancedTennisPredictor phases.',
+    ('phase',))
+
+# Web app
+HTTP_REQUEST_SECONDS = Histogram(
+    'http_request_duration_seconds',
+    'Flask request latency per route.',
+    ('route', 'method', 'status'))
+MODEL_CACHE_REQUESTS = Counter(
+    'model_cache_requests_total',
+    'Predictor cache lookups by result (hit/miss).',
+    ('competition', 'result'))
+MODEL_EVICTIONS = Counter(
+    'model_evictions_total',
+    'Predictors evicted from the in-memory cache.',
+    ('reason',))
@@ -2,23 +2,167 @@ import pandas as pd
 import numpy as np
 from scipy.stats import poisson
 import os
+import time
 from src.elo import EloRatingSystem
+from src.metrics import MODEL_PHASE_SECONDS, PREDICT_STAGE_SECONDS
+from src.team_resolver import TeamResolver, canonical_name
+from src.manifest import parse_match_dates
+from src.dixon_coles import fit_dixon_coles, DixonColesFit
+from src.half_time import HALF_TIME_SHARE, split_expected_goals, half_time_markets, format_markets
+
+_STAGE_STRENGTHS = PREDICT_STAGE_SECONDS.labels('strengths')
+_STAGE_H2H = PREDICT_STAGE_SECONDS.labels('h2h')
+_STAGE_SCORE_MATRIX = PREDICT_STAGE_SECONDS.labels('score_matrix')
+_STAGE_SELECTION = PREDICT_STAGE_SECONDS.labels('selection')
+_STAGE_TABLE = PREDICT_STAGE_SECONDS.labels('table_lookup')
+
+PRESTIGE_BOOSTS = {
+    # EUROPE Tier 1 (+4%)
+    "Man City": 1.04, "Liverpool": 1.04, "Arsenal": 1.04,
+    "Real Madrid": 1.04, "Barcelona": 1.04, "Bayern Munich": 1.04, "Leverkusen": 1.04,
+    "Paris SG": 1.04, "Inter": 1.04,
+    # EUROPE Tier 2 (+2%)
+    "Chelsea": 1.02, "Tottenham": 1.02, "Atletico Madrid": 1.02,
+    "Dortmund": 1.02, "Leipzig": 1.02, "Juventus": 1.02, "Milan": 1.02,
+    "Benfica": 1.02, "Porto": 1.02, "Sporting CP": 1.02,
+
+    # AFRICA Tier 1 (Giants - Boosted for disparity vs small nations) (+5%)
+    "Senegal": 1.05, "Morocco": 1.05, "Egypt": 1.05,
+    "Nigeria": 1.05, "Ivory Coast": 1.05,
+
+    # AFRICA Tier 2 (Strong) (+3%)
+    "Cameroon": 1.03, "Algeria": 1.03, "Mali": 1.03,
+    "South Africa": 1.03, "Tunisia": 1.03, "Ghana": 1.03
+}
+# Keys written with common spellings -> data-file spellings ("Atletico Madrid" -> "Ath Madrid")
+PRESTIGE_BOOSTS = {canonical_name(team): boost for team, boost in PRESTIGE_BOOSTS.items()}
+
+# Columns of Ligue1Predictor.team_params (one row per team, see _compile_parameters)
+P_HOME_ATTACK, P_HOME_DEFENSE, P_AWAY_ATTACK, P_AWAY_DEFENSE, P_FORM, P_ELO, P_PRESTIGE = range(7)
+# Goals-only strengths per half (1H / 2H), from the half-time scores (see _train_half_strengths)
+(P_HOME_ATTACK_1H, P_HOME_ATTACK_2H, P_HOME_DEFENSE_1H, P_HOME_DEFENSE_2H,
+ P_AWAY_ATTACK_1H, P_AWAY_ATTACK_2H, P_AWAY_DEFENSE_1H, P_AWAY_DEFENSE_2H) = range(7, 15)
+HALF_STRENGTH_COLUMNS = ['HomeAttack1H', 'HomeAttack2H', 'HomeDefense1H', 'HomeDefense2H',
+                         'AwayAttack1H', 'AwayAttack2H', 'AwayDefense1H', 'AwayDefense2H']
+# A fixture's first-half share of its expected goals stays in this range (small samples)
+HALF_SHARE_BOUNDS = (0.3, 0.6)
+# Per-fixture values of the prediction (arrays of predict_batch, and of the pair table)
+PAIR_TABLE_FIELDS = ('xg_home', 'xg_away', 'win', 'draw', 'loss', 'score', 'score_prob', 'second', 'second_prob')
+# Bump when training or prediction changes: older model snapshots are then retrained
+SNAPSHOT_VERSION = 5
+# Strength engines: 'ratio' = weighted goal/xG ratios + form, prestige, Elo and H2H boosts,
+# 'dixon_coles' = maximum-likelihood Dixon-Coles fit (src/dixon_coles.py), used as is
+ENGINE_RATIO = 'ratio'
+ENGINE_DIXON_COLES = 'dixon_coles'
+ENGINES = (ENGINE_RATIO, ENGINE_DIXON_COLES)
+RHO = -0.13  # Dixon-Coles dependence of the ratio engine (the fitted engine estimates its own)
+# Training weight per MatchType (international results): friendlies are played with rotated squads
+MATCH_TYPE_WEIGHTS = {'friendly': 0.5}
+
+
+def _poisson_pmfs(lam, size):
+    """P(X = 0..size-1) for each X ~ Poisson(lam[i]): recurrence on the factors (no scipy call)."""
+    factors = np.empty((len(lam), size))
+    factors[:, 0] = np.exp(-lam)
+    factors[:, 1:] = lam[:, None] / np.arange(1, size)
+    return np.cumprod(factors, axis=1)
+
+
+def score_matrices(home_xg, away_xg, rho=RHO, max_goals=10):
+    """
+    Score matrices (n x max_goals x max_goals, not normalized) of fixtures given their expected
+    goals (arrays): independent Poisson goals with the Dixon-Coles correction on the low scores.
+    """
+    home_xg, away_xg = np.asarray(home_xg, dtype=float), np.asarray(away_xg, dtype=float)
+    matrix = _poisson_pmfs(home_xg, max_goals)[:, :, None] * _poisson_pmfs(away_xg, max_goals)[:, None, :]
+    both = (home_xg > 0) & (away_xg > 0)
+    matrix[:, 0, 0] *= np.where(both, 1 - home_xg * away_xg * rho, 1.0)
+    matrix[:, 0, 1] *= np.where(home_xg > 0, 1 + home_xg * rho, 1.0)
+    matrix[:, 1, 0] *= np.where(away_xg > 0, 1 + away_xg * rho, 1.0)
+    matrix[:, 1, 1] *= np.where(both, 1 - rho, 1.0)
+    return matrix
+
+
+def outcome_arrays(home_xg, away_xg, rho=RHO):
+    """
+    Outcome fields (see PAIR_TABLE_FIELDS) of fixtures given their expected goals (arrays):
+    Dixon-Coles score matrices, 1X2 and the two selected scores (flat indices home * 10 + away).
+    """
+    n = len(home_xg)
+    goals = np.arange(10)
+    matrix = score_matrices(home_xg, away_xg, rho)
+
+    home_mask = goals[:, None] > goals[None, :]
+    draw_mask = goals[:, None] == goals[None, :]
+    away_mask = goals[:, None] < goals[None, :]
+    outcome_probs = np.stack([matrix[:, m].sum(axis=1) for m in (home_mask, draw_mask, away_mask)], axis=1)
+    total = outcome_probs.sum(axis=1)
+    total = np.where(total > 0, total, 1.0)
+    outcome_probs /= total[:, None]
+    matrix /= total[:, None, None]
+
+    # Hybrid selection: best score of the most likely outcome, then the best other score
+    best_outcome = np.argmax(outcome_probs, axis=1)  # First max on ties, like the stable sort
+    masks = np.stack([home_mask, draw_mask, away_mask])[best_outcome]
+    flat = matrix.reshape(n, -1)
+    first = np.argmax(np.where(masks.reshape(n, -1), flat, -1.0), axis=1)
+    others = flat.copy()
+    others[np.arange(n), first] = -1.0
+    second = np.argmax(others, axis=1)
+
+    rows = np.arange(n)
+    return {
+        'xg_home': home_xg, 'xg_away': away_xg,
+        'win': outcome_probs[:, 0], 'draw': outcome_probs[:, 1], 'loss': outcome_probs[:, 2],
+        'score': first, 'score_prob': flat[rows, first],
+        'second': second, 'second_prob': flat[rows, second],
+    }
+
 
 class Ligue1Predictor:
-    def __init__(self, data_dir="data", data_file=None, league_code="F1"):
+    def __init__(self, data_dir="data", data_file=None, league_code="F1", store=None, table_modifiers=None,
+                 engine=ENGINE_RATIO, warm_start=None):
+        """
+        engine: ENGINE_RATIO or ENGINE_DIXON_COLES
+        warm_start: Previous DixonColesFit of the same competition (starting point of the fit)
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine '{engine}' (expected one of {', '.join(ENGINES)})")
+        self.engine = engine
+        self.warm_start = warm_start
         self.data_dir = data_dir
         self.data_file = data_file
         self.league_code = league_code
-        self.df = self._load_data()
+        self.metrics_label = os.path.basename(data_file) if data_file else league_code
+        # Optional MatchStore: results and form are read from SQLite instead of the CSVs
+        self.store = store
+        self.competition = self.metrics_label
+        with MODEL_PHASE_SECONDS.time(self.metrics_label, 'load_data'):
+            self.df = self._load_data()
         self.teams = sorted(self.df['HomeTeam'].unique())
         self.avg_home_goals = 0
         self.avg_away_goals = 0
         self.team_stats = {}
         self.elo_system = None  # Will be built during training
-        self._train_model()
+        self._resolver = None  # Fuzzy team-name resolver (built on first use)
+        with MODEL_PHASE_SECONDS.time(self.metrics_label, 'train_model'):
+            self._train_model()
+        # Every pairing precomputed: predict_match with these modifiers (or none) is a lookup
+        with MODEL_PHASE_SECONDS.time(self.metrics_label, 'pair_table'):
+            self.build_prediction_table(table_modifiers)
 
     def _load_data(self):
-        """Loads data from a specific file or all CSVs matching the league code."""
+        """Loads data from the match store, a specific file or all CSVs matching the league code."""
+        if self.store is not None and self.store.has_competition(self.competition):
+            full_df = self.store.matches(self.competition)
+            # xG columns only exist in some files: entirely empty means "not provided"
+            for col in ['Estimated_xG_Home', 'Estimated_xG_Away', 'MatchType']:
+                if full_df[col].isna().all():
+                    full_df = full_df.drop(columns=col)
+            return self._add_estimated_xg(full_df)
+
+        # Rows read from the files: the store (not synced yet) must not answer the form queries either
+        self.store = None
         df_list = []
         
         # Determine files to load
@@ -55,6 +199,16 @@ class Ligue1Predictor:
                             df[col] = 0
                         cols_to_keep.append(col)
 
+                    # Half-time score (empty when the file has none)
+                    for col in ['HTHG', 'HTAG']:
+                        if col not in df.columns:
+                            df[col] = np.nan
+                        cols_to_keep.append(col)
+
+                    # Match type of the international results (friendly / qualifier / tournament)
+                    if 'MatchType' in df.columns:
+                        cols_to_keep.append('MatchType')
+
                     # Manage Estimated xG columns if they exist in file
                     if 'Estimated_xG_Home' in df.columns:
                         cols_to_keep.append('Estimated_xG_Home')
@@ -73,7 +227,11 @@ class Ligue1Predictor:
         full_df = pd.concat(df_list, ignore_index=True)
         # Filter out matches that haven't been played (no score)
         full_df = full_df.dropna(subset=['FTHG', 'FTAG'])
-        
+        return self._add_estimated_xg(full_df)
+
+    @staticmethod
+    def _add_estimated_xg(full_df):
+        """Adds shot-based Estimated_xG_Home/Away columns when the data does not provide them."""
         # Calculate Estimated xG if not present (Simple Shot-Based Model)
         # Weight: 0.30 per Shot on Target, 0.07 per Shot off Target
         if 'Estimated_xG_Home' not in full_df.columns:
@@ -95,8 +253,9 @@ class Ligue1Predictor:
 
     def _train_model(self):
         """Calculates Attack and Defense strengths using Hybrid Model (Goals + xG) and Exponential Decay."""
-        # Parse dates
-        self.df['Date'] = pd.to_datetime(self.df['Date'], errors='coerce', dayfirst=True)
+        # Parse dates (already parsed when read from the match store)
+        if not pd.api.types.is_datetime64_any_dtype(self.df['Date']):
+            self.df['Date'] = parse_match_dates(self.df['Date'])
         self.df = self.df.dropna(subset=['Date'])
         
         # Sort by date
@@ -104,7 +263,8 @@ class Ligue1Predictor:
         
         # Build Elo ratings
         self.elo_system = EloRatingSystem()
-        self.elo_system.process_historical_data(self.df)
+        with MODEL_PHASE_SECONDS.time(self.metrics_label, 'elo_replay'):
+            self.elo_system.process_historical_data(self.df)
         
         # Current date reference
         latest_date = self.df['Date'].max()
@@ -116,6 +276,8 @@ class Ligue1Predictor:
         # Replaces rigid steps. E.g., decay_rate 0.005 means weight halves every ~140 days
         decay_rate = 0.006 
         self.df['Weight'] = np.exp(-decay_rate * self.df['DaysAgo'])
+        if 'MatchType' in self.df.columns:
+            self.df['Weight'] *= self.df['MatchType'].map(MATCH_TYPE_WEIGHTS).fillna(1.0)
         
         # REMOVED: Rigid "last 5 matches" boost, replaced by separate Form Index calculation
         
@@ -216,9 +378,126 @@ class Ligue1Predictor:
         
         # Fill NaN with 1.0 (neutral strength)
         self.team_stats = self.team_stats.fillna(1.0)
+
+        self.rho = RHO
+        self.dc_fit = None
+        if self.engine == ENGINE_DIXON_COLES:
+            with MODEL_PHASE_SECONDS.time(self.metrics_label, 'dixon_coles_fit'):
+                self._fit_dixon_coles()
+
+        # First / second half scoring rates (half-time / full-time markets)
+        self._train_half_strengths()
         
         # Calculate Form Index for each team
-        self._calculate_form_index()
+        with MODEL_PHASE_SECONDS.time(self.metrics_label, 'form_index'):
+            self._calculate_form_index()
+
+        with MODEL_PHASE_SECONDS.time(self.metrics_label, 'compile_params'):
+            self._compile_parameters()
+
+    def _fit_dixon_coles(self):
+        """
+        Replaces the ratio strengths by a Dixon-Coles maximum-likelihood fit on the goals
+        (same time-decay weights), written in the same multiplicative layout:
+        home xG = HomeAttack x AwayDefense x avg_home_strength = exp(intercept + home + attack + defense),
+        away xG = AwayAttack x HomeDefense x avg_home_strength = exp(intercept + attack + defense).
+        """
+        teams = list(self.team_stats.index)
+        index = {team: i for i, team in enumerate(teams)}
+        fit = fit_dixon_coles(teams, self.df['HomeTeam'].map(index).to_numpy(), self.df['AwayTeam'].map(index).to_numpy(),
+                              self.df['FTHG'].to_numpy(float), self.df['FTAG'].to_numpy(float),
+                              self.df['Weight'].to_numpy(float), warm_start=self.warm_start)
+        self.dc_fit = fit
+        self.rho = fit.rho
+        self.avg_home_strength = float(np.exp(fit.intercept + fit.home))
+        self.avg_away_strength = float(np.exp(fit.intercept))
+        self.team_stats['HomeAttackStrength'] = np.exp(fit.attack)
+        self.team_stats['HomeDefenseStrength'] = np.exp(fit.defense)
+        self.team_stats['AwayAttackStrength'] = np.exp(fit.attack - fit.home)
+        self.team_stats['AwayDefenseStrength'] = np.exp(fit.defense)
+        print(f"[INFO] Dixon-Coles {self.metrics_label}: {fit.iterations} itérations, "
+              f"avantage domicile x{np.exp(fit.home):.2f}, rho {fit.rho:.3f}")
+
+    def _train_half_strengths(self):
+        """
+        Goals-only attack / defense strengths for each half, with the same weighted aggregation
+        (time decay, strict home / away split) as the full-match strengths. Matches without a
+        half-time score are left out; without any, every team splits its goals HALF_TIME_SHARE / rest.
+        Sets team_stats[HALF_STRENGTH_COLUMNS] and half_averages (home 1H, home 2H, away 1H, away 2H).
+        """
+        ht = self.df.dropna(subset=['HTHG', 'HTAG']) if 'HTHG' in self.df.columns else self.df.iloc[:0]
+        weights = ht['Weight']
+        total_weight = weights.sum()
+        if total_weight == 0:
+            self.half_averages = np.array([self.avg_home_strength * HALF_TIME_SHARE,
+                                           self.avg_home_strength * (1 - HALF_TIME_SHARE),
+                                           self.avg_away_strength * HALF_TIME_SHARE,
+                                           self.avg_away_strength * (1 - HALF_TIME_SHARE)])
+            for col in HALF_STRENGTH_COLUMNS:
+                self.team_stats[col] = 1.0
+            return
+
+        # Weighted goals per half (second half = full time - half time)
+        frame = pd.DataFrame({
+            'HomeTeam': ht['HomeTeam'], 'AwayTeam': ht['AwayTeam'], 'w': weights,
+            'h1': ht['HTHG'] * weights, 'h2': (ht['FTHG'] - ht['HTHG']).clip(lower=0) * weights,
+            'a1': ht['HTAG'] * weights, 'a2': (ht['FTAG'] - ht['HTAG']).clip(lower=0) * weights,
+        })
+        avg_h1, avg_h2, avg_a1, avg_a2 = (frame[col].sum() / total_weight for col in ('h1', 'h2', 'a1', 'a2'))
+        self.half_averages = np.array([avg_h1, avg_h2, avg_a1, avg_a2])
+
+        home = frame.groupby('HomeTeam')[['w', 'h1', 'h2', 'a1', 'a2']].sum()
+        away = frame.groupby('AwayTeam')[['w', 'h1', 'h2', 'a1', 'a2']].sum()
+        home = home[['h1', 'h2', 'a1', 'a2']].div(home['w'], axis=0)
+        away = away[['h1', 'h2', 'a1', 'a2']].div(away['w'], axis=0)
+        if self.weight_xg == 0.0:
+            # Tournament pooling, as for the full-match strengths: one rate per team
+            pooled = pd.concat([home, away.rename(columns={'h1': 'a1', 'h2': 'a2', 'a1': 'h1', 'a2': 'h2'})])
+            home = pooled.groupby(level=0).mean()
+            away = home.rename(columns={'h1': 'a1', 'h2': 'a2', 'a1': 'h1', 'a2': 'h2'})
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            strengths = pd.DataFrame({
+                'HomeAttack1H': home['h1'] / avg_h1, 'HomeAttack2H': home['h2'] / avg_h2,
+                'HomeDefense1H': home['a1'] / avg_a1, 'HomeDefense2H': home['a2'] / avg_a2,
+                'AwayAttack1H': away['a1'] / avg_a1, 'AwayAttack2H': away['a2'] / avg_a2,
+                'AwayDefense1H': away['h1'] / avg_h1, 'AwayDefense2H': away['h2'] / avg_h2,
+            })
+        strengths = strengths.replace([np.inf, -np.inf], np.nan).reindex(self.team_stats.index).fillna(1.0)
+        for col in HALF_STRENGTH_COLUMNS:
+            self.team_stats[col] = strengths[col]
+
+    def _compile_parameters(self):
+        """
+        Freezes everything predict_match reads into arrays indexed by team number:
+        team_params (n_teams x 15, columns P_*) and the head-to-head matrices
+        (h2h_count[i, j] = matches i hosted j, h2h_home_goals / h2h_away_goals = their mean score).
+        """
+        teams = list(self.team_stats.index)
+        self.team_index = {team: i for i, team in enumerate(teams)}
+        n = len(teams)
+
+        params = np.empty((n, 15))
+        params[:, P_HOME_ATTACK] = self.team_stats['HomeAttackStrength'].to_numpy(float)
+        params[:, P_HOME_DEFENSE] = self.team_stats['HomeDefenseStrength'].to_numpy(float)
+        params[:, P_AWAY_ATTACK] = self.team_stats['AwayAttackStrength'].to_numpy(float)
+        params[:, P_AWAY_DEFENSE] = self.team_stats['AwayDefenseStrength'].to_numpy(float)
+        params[:, P_FORM] = [self.form_ratings.get(team, 1.0) for team in teams]
+        params[:, P_ELO] = [self.elo_system.ratings.get(team, self.elo_system.base_rating) for team in teams]
+        params[:, P_PRESTIGE] = [PRESTIGE_BOOSTS.get(team, 1.0) for team in teams]
+        params[:, P_HOME_ATTACK_1H:] = self.team_stats[HALF_STRENGTH_COLUMNS].to_numpy(float)
+        self.team_params = params
+
+        home = self.df['HomeTeam'].map(self.team_index).to_numpy()
+        away = self.df['AwayTeam'].map(self.team_index).to_numpy()
+        self.h2h_count = np.zeros((n, n), dtype=int)
+        home_goals, away_goals = np.zeros((n, n)), np.zeros((n, n))
+        np.add.at(self.h2h_count, (home, away), 1)
+        np.add.at(home_goals, (home, away), self.df['FTHG'].to_numpy(float))
+        np.add.at(away_goals, (home, away), self.df['FTAG'].to_numpy(float))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.h2h_home_goals = home_goals / self.h2h_count
+            self.h2h_away_goals = away_goals / self.h2h_count
 
     def predict_match(self, home_team, away_team, neutral_venue=False, modifiers=None):
         """
@@ -227,14 +506,22 @@ class Ligue1Predictor:
         modifiers: Dict like {'TeamName': {'attack': 1.1, 'defense': 0.9}}. 
                    (Attack > 1 is boost, Defense < 1 is boost).
         """
-        if home_team not in self.team_stats.index or away_team not in self.team_stats.index:
+        h_idx, a_idx = self.team_index.get(home_team), self.team_index.get(away_team)
+        if h_idx is None or a_idx is None:
             return {"error": f"Team not found."}
 
+        t_start = time.perf_counter()
+        cached = self._table_lookup(home_team, away_team, h_idx, a_idx, neutral_venue, modifiers)
+        if cached is not None:
+            _STAGE_TABLE.observe(time.perf_counter() - t_start)
+            return cached
+        home, away = self.team_params[h_idx], self.team_params[a_idx]
+
         # Get Team Stats with strict Home/Away logic
-        h_attack = self.team_stats.loc[home_team, 'HomeAttackStrength']
-        h_defense = self.team_stats.loc[home_team, 'HomeDefenseStrength']
-        a_attack = self.team_stats.loc[away_team, 'AwayAttackStrength']
-        a_defense = self.team_stats.loc[away_team, 'AwayDefenseStrength']
+        h_attack = home[P_HOME_ATTACK]
+        h_defense = home[P_HOME_DEFENSE]
+        a_attack = away[P_AWAY_ATTACK]
+        a_defense = away[P_AWAY_DEFENSE]
         
         # === MODIFIER CALCULATION (ADDITIVE LOGIC) ===
         # v5.2: Switch from Multiplicative (A*B*C) to Additive (1 + A + B + C) to prevent exponential blowouts
@@ -246,15 +533,22 @@ class Ligue1Predictor:
         # We detect AFCON via the "Goals Only" mode trigger (weight_xg == 0) or specific code.
         is_legacy_mode = (self.weight_xg == 0.0) 
         
-        if is_legacy_mode:
+        if self.engine != ENGINE_RATIO:
+            # Fitted engine: strengths are used as estimated, without boosts
+            h_form = 1.0
+            a_form = 1.0
+            prestige_enabled = False
+            elo_enabled = False
+        elif is_legacy_mode:
             # Force Form/Elo to Neutral, BUT Keep Prestige (Class Difference)
+            # (the MatchType K-factors of the international results only change elo_system.ratings here)
             h_form = 1.0
             a_form = 1.0
             prestige_enabled = True # ENABLED: Senegal needs to be stronger than Sudan
             elo_enabled = False
         else:
-            h_form = self.form_ratings.get(home_team, 1.0)
-            a_form = self.form_ratings.get(away_team, 1.0)
+            h_form = home[P_FORM]
+            a_form = away[P_FORM]
             prestige_enabled = True
             elo_enabled = True
 
@@ -270,31 +564,13 @@ class Ligue1Predictor:
         a_prestige_mod = 0.0
         
         if prestige_enabled:
-            PRESTIGE_BOOSTS = {
-                # EUROPE Tier 1 (+4%)
-                "Man City": 1.04, "Liverpool": 1.04, "Arsenal": 1.04,
-                "Real Madrid": 1.04, "Barcelona": 1.04, "Bayern Munich": 1.04, "Leverkusen": 1.04,
-                "Paris SG": 1.04, "Inter": 1.04,
-                # EUROPE Tier 2 (+2%)
-                "Chelsea": 1.02, "Tottenham": 1.02, "Atletico Madrid": 1.02,
-                "Dortmund": 1.02, "Leipzig": 1.02, "Juventus": 1.02, "Milan": 1.02,
-                "Benfica": 1.02, "Porto": 1.02, "Sporting CP": 1.02,
-                
-                # AFRICA Tier 1 (Giants - Boosted for disparity vs small nations) (+5%)
-                "Senegal": 1.05, "Morocco": 1.05, "Egypt": 1.05, 
-                "Nigeria": 1.05, "Ivory Coast": 1.05,
-                
-                # AFRICA Tier 2 (Strong) (+3%)
-                "Cameroon": 1.03, "Algeria": 1.03, "Mali": 1.03, 
-                "South Africa": 1.03, "Tunisia": 1.03, "Ghana": 1.03
-            }
-            h_prestige_mod = PRESTIGE_BOOSTS.get(home_team, 1.0) - 1.0
-            a_prestige_mod = PRESTIGE_BOOSTS.get(away_team, 1.0) - 1.0
+            h_prestige_mod = home[P_PRESTIGE] - 1.0
+            a_prestige_mod = away[P_PRESTIGE] - 1.0
         
         # 3. Elo Modifier (Relative to 1.0)
         elo_val = 0.0
         if elo_enabled:
-            elo_diff = self.elo_system.get_rating_difference(home_team, away_team)
+            elo_diff = home[P_ELO] - away[P_ELO]
             elo_val = elo_diff / 1400
             elo_val = max(-0.25, min(elo_val, 0.25))
         
@@ -317,10 +593,10 @@ class Ligue1Predictor:
 
         # Get Neutral Venue Adjustments
         if neutral_venue:
-            h_attack = (h_attack + self.team_stats.loc[home_team, 'AwayAttackStrength']) / 2
-            h_defense = (h_defense + self.team_stats.loc[home_team, 'AwayDefenseStrength']) / 2
-            a_attack = (a_attack + self.team_stats.loc[away_team, 'HomeAttackStrength']) / 2
-            a_defense = (a_defense + self.team_stats.loc[away_team, 'HomeDefenseStrength']) / 2
+            h_attack = (h_attack + home[P_AWAY_ATTACK]) / 2
+            h_defense = (h_defense + home[P_AWAY_DEFENSE]) / 2
+            a_attack = (a_attack + away[P_HOME_ATTACK]) / 2
+            a_defense = (a_defense + away[P_HOME_DEFENSE]) / 2
 
         # Apply Manual Modifiers
         if modifiers:
@@ -331,21 +607,22 @@ class Ligue1Predictor:
                 a_attack *= modifiers[away_team].get('attack', 1.0)
                 a_defense *= modifiers[away_team].get('defense', 1.0)
 
+        t_h2h = time.perf_counter()
+        _STAGE_STRENGTHS.observe(t_h2h - t_start)
+
         # === HEAD-TO-HEAD ADJUSTMENT ===
-        h2h_matches = self.df[
-            ((self.df['HomeTeam'] == home_team) & (self.df['AwayTeam'] == away_team)) |
-            ((self.df['HomeTeam'] == away_team) & (self.df['AwayTeam'] == home_team))
-        ]
+        n_h2h = self.h2h_count[h_idx, a_idx] + self.h2h_count[a_idx, h_idx]
+        h2h_home_goals, h2h_away_goals = self.h2h_home_goals[h_idx, a_idx], self.h2h_away_goals[h_idx, a_idx]
         
-        if len(h2h_matches) >= 3:
-            h2h_home_goals = h2h_matches[h2h_matches['HomeTeam'] == home_team]['FTHG'].mean()
-            h2h_away_goals = h2h_matches[h2h_matches['AwayTeam'] == away_team]['FTAG'].mean()
-            
-            if pd.notna(h2h_home_goals) and pd.notna(h2h_away_goals):
+        if n_h2h >= 3 and self.engine == ENGINE_RATIO:
+            if not np.isnan(h2h_home_goals) and not np.isnan(h2h_away_goals):
                 h2h_weight = 0.25
                 h_attack = h_attack * (1 - h2h_weight) + (h2h_home_goals / self.avg_home_strength) * h2h_weight
                 a_attack = a_attack * (1 - h2h_weight) + (h2h_away_goals / self.avg_away_strength) * h2h_weight
 
+        t_matrix = time.perf_counter()
+        _STAGE_H2H.observe(t_matrix - t_h2h)
+
         # Expected Goals (Lambda)
         avg_goals = (self.avg_home_strength + self.avg_away_strength) / 2 if neutral_venue else self.avg_home_strength
         
@@ -373,8 +650,9 @@ class Ligue1Predictor:
         max_goals = 10
         
         # 1. Base Poisson Probabilities
-        home_probs = [poisson.pmf(i, home_xg) for i in range(max_goals)]
-        away_probs = [poisson.pmf(i, away_xg) for i in range(max_goals)]
+        goals = np.arange(max_goals)
+        home_probs = poisson.pmf(goals, home_xg)
+        away_probs = poisson.pmf(goals, away_xg)
         
         # 2. Build Joint Probability Matrix
         prob_matrix = np.outer(home_probs, away_probs)
@@ -382,6 +660,9 @@ class Ligue1Predictor:
         # 3. Apply Dixon-Coles Adjustment
         prob_matrix = self._dixon_coles_adjustment(prob_matrix, home_xg, away_xg)
 
+        t_selection = time.perf_counter()
+        _STAGE_SCORE_MATRIX.observe(t_selection - t_matrix)
+
         # Calculate Outcome Probabilities and categorize scores
         prob_home_win = 0
         prob_draw = 0
@@ -442,6 +723,7 @@ class Ligue1Predictor:
                 break
         
         top_2_scores = [score_1, score_2]
+        _STAGE_SELECTION.observe(time.perf_counter() - t_selection)
 
         return {
             "home_team": home_team,
@@ -457,28 +739,339 @@ class Ligue1Predictor:
             "second_score_prob": round(top_2_scores[1][1] * 100, 1)
         }
 
+    def _modifier_vectors(self, modifiers):
+        """Attack / defense multipliers per team number (1.0 for teams without modifiers)."""
+        attack_mult, defense_mult = np.ones(len(self.team_index)), np.ones(len(self.team_index))
+        for team, mods in (modifiers or {}).items():
+            if team in self.team_index:
+                attack_mult[self.team_index[team]] = mods.get('attack', 1.0)
+                defense_mult[self.team_index[team]] = mods.get('defense', 1.0)
+        return attack_mult, defense_mult
+
+    def _score_arrays(self, h_idx, a_idx, neutral, attack_mult, defense_mult):
+        """
+        predict_match for arrays of team numbers: {field: array} (see PAIR_TABLE_FIELDS),
+        scores as flat indices home * 10 + away.
+        """
+        n = len(h_idx)
+        home, away = self.team_params[h_idx], self.team_params[a_idx]
+
+        # Same additive modifiers as predict_match (form and Elo neutral in legacy mode, none for a fitted engine)
+        is_legacy_mode = (self.weight_xg == 0.0)
+        if self.engine != ENGINE_RATIO:
+            h_boost = a_boost = np.zeros(n)
+        else:
+            if is_legacy_mode:
+                h_form_mod = a_form_mod = elo_val = np.zeros(n)
+            else:
+                h_form_mod, a_form_mod = home[:, P_FORM] - 1.0, away[:, P_FORM] - 1.0
+                elo_val = np.clip((home[:, P_ELO] - away[:, P_ELO]) / 1400, -0.25, 0.25)
+            h_boost = h_form_mod + (home[:, P_PRESTIGE] - 1.0) + np.maximum(elo_val, 0)
+            a_boost = a_form_mod + (away[:, P_PRESTIGE] - 1.0) + np.maximum(-elo_val, 0)
+        h_attack = home[:, P_HOME_ATTACK] * (1.0 + h_boost)
+        h_defense = home[:, P_HOME_DEFENSE] * (1.0 - h_boost * 0.5)
+        a_attack = away[:, P_AWAY_ATTACK] * (1.0 + a_boost)
+        a_defense = away[:, P_AWAY_DEFENSE] * (1.0 - a_boost * 0.5)
+
+        h_attack = np.where(neutral, (h_attack + home[:, P_AWAY_ATTACK]) / 2, h_attack)
+        h_defense = np.where(neutral, (h_defense + home[:, P_AWAY_DEFENSE]) / 2, h_defense)
+        a_attack = np.where(neutral, (a_attack + away[:, P_HOME_ATTACK]) / 2, a_attack)
+        a_defense = np.where(neutral, (a_defense + away[:, P_HOME_DEFENSE]) / 2, a_defense)
+
+        h_attack, h_defense = h_attack * attack_mult[h_idx], h_defense * defense_mult[h_idx]
+        a_attack, a_defense = a_attack * attack_mult[a_idx], a_defense * defense_mult[a_idx]
+
+        # Head-to-head adjustment
+        n_h2h = self.h2h_count[h_idx, a_idx] + self.h2h_count[a_idx, h_idx]
+        h2h_home, h2h_away = self.h2h_home_goals[h_idx, a_idx], self.h2h_away_goals[h_idx, a_idx]
+        use_h2h = (n_h2h >= 3) & ~np.isnan(h2h_home) & ~np.isnan(h2h_away) & (self.engine == ENGINE_RATIO)
+        h2h_weight = 0.25
+        h_attack = np.where(use_h2h, h_attack * (1 - h2h_weight) + (h2h_home / self.avg_home_strength) * h2h_weight, h_attack)
+        a_attack = np.where(use_h2h, a_attack * (1 - h2h_weight) + (h2h_away / self.avg_away_strength) * h2h_weight, a_attack)
+
+        # Expected goals, soft saturation above 2.5
+        avg_goals = np.where(neutral, (self.avg_home_strength + self.avg_away_strength) / 2, self.avg_home_strength)
+        home_xg, away_xg = h_attack * a_defense * avg_goals, a_attack * h_defense * avg_goals
+        home_xg = np.where(home_xg > 2.5, 2.5 + np.maximum(home_xg - 2.5, 0) ** 0.65, home_xg)
+        away_xg = np.where(away_xg > 2.5, 2.5 + np.maximum(away_xg - 2.5, 0) ** 0.65, away_xg)
+
+        return outcome_arrays(home_xg, away_xg, self.rho)
+
+    @staticmethod
+    def _format_prediction(home_team, away_team, values):
+        """predict_match result dict from one fixture's PAIR_TABLE_FIELDS values."""
+        s1, s2 = divmod(int(values['score']), 10), divmod(int(values['second']), 10)
+        return {
+            "home_team": home_team,
+            "away_team": away_team,
+            "expected_goals_home": round(float(values['xg_home']), 2),
+            "expected_goals_away": round(float(values['xg_away']), 2),
+            "win_prob": round(float(values['win']) * 100, 1),
+            "draw_prob": round(float(values['draw']) * 100, 1),
+            "loss_prob": round(float(values['loss']) * 100, 1),
+            "most_likely_score": f"{s1[0]}-{s1[1]}",
+            "score_prob": round(float(values['score_prob']) * 100, 1),
+            "second_likely_score": f"{s2[0]}-{s2[1]}",
+            "second_score_prob": round(float(values['second_prob']) * 100, 1)
+        }
+
+    def predict_batch(self, home_teams, away_teams, neutral_venue=False, modifiers=None):
+        """
+        Vectorized predict_match over many fixtures (same model, same results).
+
+        Args:
+            home_teams / away_teams: Sequences of team names (dataset spelling)
+            neutral_venue: bool, or one bool per fixture
+            modifiers: Same format as predict_match
+
+        Returns:
+            List of predict_match dicts, in fixture order ({"error": ...} for unknown teams)
+        """
+        home_teams, away_teams = list(home_teams), list(away_teams)
+        n = len(home_teams)
+        neutral = np.broadcast_to(np.asarray(neutral_venue, dtype=bool), (n,))
+        h_idx = np.array([self.team_index.get(t, -1) for t in home_teams], dtype=int)
+        a_idx = np.array([self.team_index.get(t, -1) for t in away_teams], dtype=int)
+        valid = (h_idx >= 0) & (a_idx >= 0)
+        h_idx, a_idx = np.where(valid, h_idx, 0), np.where(valid, a_idx, 0)
+
+        arrays = self._score_arrays(h_idx, a_idx, neutral, *self._modifier_vectors(modifiers))
+        results = []
+        for i in range(n):
+            if not valid[i]:
+                results.append({"home_team": home_teams[i], "away_team": away_teams[i], "error": "Team not found."})
+                continue
+            results.append(self._format_prediction(home_teams[i], away_teams[i],
+                                                   {key: values[i] for key, values in arrays.items()}))
+        return results
+
+    # === PAIR TABLE ===
+
+    def build_prediction_table(self, modifiers=None, chunk_size=4096):
+        """
+        Precomputes every (home, away) pairing, at home and on neutral ground:
+        pair_table[field][venue, home_idx, away_idx] with venue 0 = normal, 1 = neutral.
+        modifiers (predict_match format, e.g. AFCON squad/host boosts) are baked in.
+        """
+        n = len(self.team_index)
+        attack_mult, defense_mult = self._modifier_vectors(modifiers)
+        h_idx, a_idx = np.divmod(np.arange(n * n), n)
+        table = {}
+        for venue in (0, 1):
+            for start in range(0, n * n, chunk_size):
+                chunk = slice(start, start + chunk_size)
+                arrays = self._score_arrays(h_idx[chunk], a_idx[chunk], np.full(len(h_idx[chunk]), bool(venue)),
+                                            attack_mult, defense_mult)
+                for key, values in arrays.items():
+                    if key not in table:
+                        table[key] = np.empty((2, n * n), dtype=values.dtype)
+                    table[key][venue, chunk] = values
+        self.pair_table = {key: values.reshape(2, n, n) for key, values in table.items()}
+        self.pair_table.update(attack_mult=attack_mult, defense_mult=defense_mult, weight_xg=self.weight_xg)
+
+    def _table_covers(self, home_team, away_team, h_idx, a_idx, modifiers):
+        """True if the pair table was built with these teams' modifiers and the current weights."""
+        table = getattr(self, 'pair_table', None)
+        if table is None or table['weight_xg'] != self.weight_xg:
+            return False
+        for team, idx in ((home_team, h_idx), (away_team, a_idx)):
+            mods = (modifiers or {}).get(team) or {}
+            if mods.get('attack', 1.0) != table['attack_mult'][idx] or mods.get('defense', 1.0) != table['defense_mult'][idx]:
+                return False
+        return True
+
+    def _table_lookup(self, home_team, away_team, h_idx, a_idx, neutral_venue, modifiers):
+        """Precomputed prediction, or None if the table was built for other modifiers / weights."""
+        if not self._table_covers(home_team, away_team, h_idx, a_idx, modifiers):
+            return None
+        venue = 1 if neutral_venue else 0
+        return self._format_prediction(home_team, away_team,
+                                       {key: self.pair_table[key][venue, h_idx, a_idx] for key in PAIR_TABLE_FIELDS})
+
+    def expected_goals(self, home_team, away_team, neutral_venue=False, modifiers=None):
+        """Unrounded pre-match expected goals (home, away) of predict_match, None for an unknown team."""
+        h_idx, a_idx = self.team_index.get(home_team), self.team_index.get(away_team)
+        if h_idx is None or a_idx is None:
+            return None
+        if self._table_covers(home_team, away_team, h_idx, a_idx, modifiers):
+            venue = 1 if neutral_venue else 0
+            return (float(self.pair_table['xg_home'][venue, h_idx, a_idx]),
+                    float(self.pair_table['xg_away'][venue, h_idx, a_idx]))
+        arrays = self._score_arrays(np.array([h_idx]), np.array([a_idx]), np.array([bool(neutral_venue)]),
+                                    *self._modifier_vectors(modifiers))
+        return float(arrays['xg_home'][0]), float(arrays['xg_away'][0])
+
+    # === HALF-TIME MARKETS ===
+
+    def _half_shares(self, h_idx, a_idx, neutral):
+        """
+        First-half share of each team's expected goals (arrays of fixtures), from the per-half
+        strengths: home 1H goals = home 1H attack x away 1H defense x league 1H average, etc.
+        """
+        home, away = self.team_params[h_idx], self.team_params[a_idx]
+        avg_h1, avg_h2, avg_a1, avg_a2 = self.half_averages
+
+        def venue_shares(home_side, away_side, h1, h2, a1, a2):
+            home_1h = home_side[:, P_HOME_ATTACK_1H] * away_side[:, P_AWAY_DEFENSE_1H] * h1
+            home_2h = home_side[:, P_HOME_ATTACK_2H] * away_side[:, P_AWAY_DEFENSE_2H] * h2
+            away_1h = away_side[:, P_AWAY_ATTACK_1H] * home_side[:, P_HOME_DEFENSE_1H] * a1
+            away_2h = away_side[:, P_AWAY_ATTACK_2H] * home_side[:, P_HOME_DEFENSE_2H] * a2
+            with np.errstate(invalid='ignore', divide='ignore'):
+                return home_1h / (home_1h + home_2h), away_1h / (away_1h + away_2h)
+
+        home_share, away_share = venue_shares(home, away, avg_h1, avg_h2, avg_a1, avg_a2)
+        if np.any(neutral):
+            # Neutral ground: mean of both venue layouts (each team once "at home")
+            away_as_home, home_as_away = venue_shares(away, home, avg_h1, avg_h2, avg_a1, avg_a2)
+            home_share = np.where(neutral, (home_share + home_as_away) / 2, home_share)
+            away_share = np.where(neutral, (away_share + away_as_home) / 2, away_share)
+        low, high = HALF_SHARE_BOUNDS
+        home_share = np.clip(np.nan_to_num(home_share, nan=HALF_TIME_SHARE), low, high)
+        away_share = np.clip(np.nan_to_num(away_share, nan=HALF_TIME_SHARE), low, high)
+        return home_share, away_share
+
+    def predict_half_time(self, home_teams, away_teams, neutral_venue=False, modifiers=None):
+        """
+        Half-time / full-time markets for many fixtures in one vectorized pass: the full-match
+        expected goals of predict_match split into halves with the teams' first-half shares.
+
+        Args:
+            home_teams / away_teams: Sequences of team names (dataset spelling)
+            neutral_venue: bool, or one bool per fixture
+            modifiers: Same format as predict_match
+
+        Returns:
+            List of dicts (HT/FT, half-time and second-half 1X2, highest scoring half, percentages),
+            in fixture order ({"error": ...} for unknown teams)
+        """
+        home_teams, away_teams = list(home_teams), list(away_teams)
+        n = len(home_teams)
+        neutral = np.broadcast_to(np.asarray(neutral_venue, dtype=bool), (n,))
+        h_idx = np.array([self.team_index.get(t, -1) for t in home_teams], dtype=int)
+        a_idx = np.array([self.team_index.get(t, -1) for t in away_teams], dtype=int)
+        valid = (h_idx >= 0) & (a_idx >= 0)
+        h_idx, a_idx = np.where(valid, h_idx, 0), np.where(valid, a_idx, 0)
+
+        arrays = self._score_arrays(h_idx, a_idx, neutral, *self._modifier_vectors(modifiers))
+        home_share, away_share = self._half_shares(h_idx, a_idx, neutral)
+        home_1h, home_2h = split_expected_goals(arrays['xg_home'], home_share)
+        away_1h, away_2h = split_expected_goals(arrays['xg_away'], away_share)
+        markets = half_time_markets(home_1h, away_1h, home_2h, away_2h)
+
+        results = []
+        for i in range(n):
+            if not valid[i]:
+                results.append({"home_team": home_teams[i], "away_team": away_teams[i], "error": "Team not found."})
+                continue
+            result = {
+                "home_team": home_teams[i],
+                "away_team": away_teams[i],
+                "first_half_xg_home": round(float(home_1h[i]), 2),
+                "first_half_xg_away": round(float(away_1h[i]), 2),
+                "second_half_xg_home": round(float(home_2h[i]), 2),
+                "second_half_xg_away": round(float(away_2h[i]), 2),
+            }
+            result.update(format_markets(markets, i))
+            results.append(result)
+        return results
+
+    # === SNAPSHOT ===
+
+    def save_snapshot(self, path, signature=''):
+        """Writes the compiled model (team tables, H2H matrices, pair table) to a .npz file (atomic replace)."""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = path + '.tmp.npz'
+        np.savez(tmp_path,
+                 signature=np.array(signature),
+                 teams=np.array(self.teams, dtype=str),
+                 stats_index=np.array(list(self.team_stats.index), dtype=str),
+                 stats_columns=np.array(list(self.team_stats.columns), dtype=str),
+                 stats=self.team_stats.to_numpy(float),
+                 team_params=self.team_params,
+                 h2h_count=self.h2h_count,
+                 h2h_home_goals=self.h2h_home_goals,
+                 h2h_away_goals=self.h2h_away_goals,
+                 weights=np.array([self.avg_home_strength, self.avg_away_strength, self.weight_goals, self.weight_xg]),
+                 half_averages=self.half_averages,
+                 engine=np.array(self.engine),
+                 rho=np.array(self.rho),
+                 dc_params=self.dc_fit.to_array() if self.dc_fit is not None else np.empty(0),
+                 **{f"table_{key}": np.asarray(values) for key, values in self.pair_table.items()})
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load_snapshot(cls, path, signature='', data_dir="data", data_file=None, league_code="F1", store=None):
+        """
+        Predictor restored from save_snapshot(), or None if the file is missing, unreadable
+        or was written for another signature (other data files or modifiers).
+        A restored model predicts like the trained one but has no training frame (df is None).
+        """
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as data:
+                if str(data['signature']) != signature:
+                    return None
+                model = cls.__new__(cls)
+                model.data_dir = data_dir
+                model.data_file = data_file
+                model.league_code = league_code
+                model.metrics_label = os.path.basename(data_file) if data_file else league_code
+                model.store = store
+                model.competition = model.metrics_label
+                model.df = None
+                model.teams = data['teams'].tolist()
+                index = data['stats_index'].tolist()
+                model.team_stats = pd.DataFrame(data['stats'], index=index, columns=data['stats_columns'].tolist())
+                model.team_index = {team: i for i, team in enumerate(index)}
+                model.team_params = data['team_params']
+                model.h2h_count = data['h2h_count']
+                model.h2h_home_goals = data['h2h_home_goals']
+                model.h2h_away_goals = data['h2h_away_goals']
+                model.avg_home_strength, model.avg_away_strength, model.weight_goals, model.weight_xg = \
+                    data['weights'].tolist()
+                model.half_averages = data['half_averages']
+                model.engine = str(data['engine'])
+                model.rho = float(data['rho'])
+                dc_params = data['dc_params']
+                model.dc_fit = DixonColesFit.from_array(index, dc_params) if dc_params.size else None
+                model.warm_start = None
+                model.pair_table = {key[len('table_'):]: data[key] for key in data.files if key.startswith('table_')}
+                model.pair_table['weight_xg'] = float(model.pair_table['weight_xg'])
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Snapshot {path} ignored: {e}")
+            return None
+
+        model.avg_home_goals = 0
+        model.avg_away_goals = 0
+        model.form_ratings = dict(zip(index, model.team_params[:, P_FORM].tolist()))
+        model.elo_system = EloRatingSystem()
+        model.elo_system.ratings = dict(zip(index, model.team_params[:, P_ELO].tolist()))
+        model._resolver = None
+        return model
+
+    def _recent_results(self, team, n=15):
+        """Last n (goals_for, goals_against) of a team, oldest first."""
+        if self.store is not None:
+            return self.store.recent_results(team, self.competition, n)
+        matches = self.df[(self.df['HomeTeam'] == team) | (self.df['AwayTeam'] == team)].sort_values('Date').tail(n)
+        is_home = (matches['HomeTeam'] == team).to_numpy()
+        goals_for = np.where(is_home, matches['FTHG'], matches['FTAG'])
+        goals_against = np.where(is_home, matches['FTAG'], matches['FTHG'])
+        return list(zip(goals_for, goals_against))
+
     def _calculate_form_index(self):
         """Calculates a Form Index based on last 5, 10, and 15 matches."""
         self.form_ratings = {}
         
         for team in self.teams:
-            matches = self.df[(self.df['HomeTeam'] == team) | (self.df['AwayTeam'] == team)].sort_values('Date')
+            results = self._recent_results(team, 15)
             
-            if len(matches) < 5:
+            if len(results) < 5:
                 self.form_ratings[team] = 1.0
                 continue
                 
-            def get_performance(row):
-                is_home = row['HomeTeam'] == team
-                goals_for = row['FTHG'] if is_home else row['FTAG']
-                goals_against = row['FTAG'] if is_home else row['FTHG']
-                
-                if goals_for > goals_against: result = 1.0
-                elif goals_for == goals_against: result = 0.5
-                else: result = 0.0
-                return result
-
-            perfs = matches.apply(get_performance, axis=1).values
+            perfs = np.array([1.0 if gf > ga else 0.5 if gf == ga else 0.0 for gf, ga in results])
             
             f5 = np.mean(perfs[-5:]) if len(perfs) >= 5 else 0.5
             f10 = np.mean(perfs[-10:]) if len(perfs) >= 10 else f5
@@ -494,9 +1087,9 @@ class Ligue1Predictor:
         """
         Applies Dixon-Coles adjustment to handle low-scoring draw dependencies.
         Rho is the dependence parameter (typically -0.1 to 0.1).
-        We use a dynamic Rho based on league averages, but fixed -0.13 is standard for football.
+        Fixed -0.13 (standard for football) with the ratio engine, fitted with the Dixon-Coles engine.
         """
-        rho = -0.13  # Standard interdependence parameter
+        rho = self.rho
         
         # Correction factors
         # 0-0
@@ -519,3 +1112,19 @@ class Ligue1Predictor:
 
     def get_teams(self):
         return self.teams
+
+    def has_team(self, name):
+        """True if the model has strengths for this exact team name."""
+        return name in self.team_stats.index
+
+    def resolve_team(self, name):
+        """Maps an approximate/alias team name to the dataset spelling (None if unknown)."""
+        if self._resolver is None:
+            self._resolver = TeamResolver(self.team_stats.index)
+        return self._resolver.resolve(name)
+
+    def suggest_teams(self, name, n=3):
+        """Closest known team names (for error messages)."""
+        if self._resolver is None:
+            self._resolver = TeamResolver(self.team_stats.index)
+        return self._resolver.suggestions(name, n)
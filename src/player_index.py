@@ -0,0 +1,81 @@
+import unicodedata
+
+
+def normalize_name(name):
+    """Lowercase, accent-folded, punctuation-free version of a player name."""
+    folded = unicodedata.normalize('NFKD', str(name))
+    folded = ''.join(c for c in folded if not unicodedata.combining(c)).lower()
+    for char in "-'.,":
+        folded = folded.replace(char, ' ')
+    return ' '.join(folded.split())
+
+
+def name_variants(name):
+    """
+    All the spellings a user may start typing for a player.
+    'Juan Martin del Potro' -> 'juan martin del potro', 'martin del potro juan',
+    'del potro juan martin', 'potro juan martin del' (surname-first matching).
+    """
+    tokens = normalize_name(name).split()
+    return {' '.join(tokens[i:] + tokens[:i]) for i in range(len(tokens))}
+
+
+class PlayerPrefixIndex:
+    """
+    Prebuilt prefix index over normalized player names for autocomplete.
+
+    Every prefix (up to `max_prefix` characters) of every name variant maps to the
+    list of matching player ids, already sorted by ranking key. Short queries are a
+    single dict lookup + slice; longer queries filter the (small) bucket of their
+    first `max_prefix` characters and stop as soon as k matches are found.
+    """
+
+    RANK_KEYS = ('rating', 'recent')
+
+    def __init__(self, names, ratings, last_played, max_prefix=4):
+        """
+        Args:
+            names: List of display names (player id = position in the list)
+            ratings: Per-player score used for rank='rating' (higher first)
+            last_played: Per-player last match date (YYYYMMDD int) for rank='recent'
+            max_prefix: Longest prefix stored in the index
+        """
+        self.names = list(names)
+        self.max_prefix = max_prefix
+        self.variants = [tuple(name_variants(n)) for n in self.names]
+
+        buckets = {}
+        for pid, variants in enumerate(self.variants):
+            for variant in variants:
+                for length in range(1, min(len(variant), max_prefix) + 1):
+                    buckets.setdefault(variant[:length], set()).add(pid)
+
+        # One ordering per ranking key (ties broken alphabetically)
+        rank_values = {'rating': list(ratings), 'recent': list(last_played)}
+        self.buckets = {}
+        for key, values in rank_values.items():
+            order = sorted(range(len(self.names)), key=lambda pid: (-values[pid], self.names[pid]))
+            position = {pid: pos for pos, pid in enumerate(order)}
+            self.buckets[key] = {
+                prefix: sorted(ids, key=position.__getitem__) for prefix, ids in buckets.items()
+            }
+
+    def search(self, query, k=8, rank='rating'):
+        """Returns up to k player names matching `query`, best ranked first."""
+        if rank not in self.RANK_KEYS:
+            rank = 'rating'
+        q = normalize_name(query)
+        if not q:
+            return []
+
+        candidates = self.buckets[rank].get(q[:self.max_prefix], [])
+        if len(q) <= self.max_prefix:
+            return [self.names[pid] for pid in candidates[:k]]
+
+        results = []
+        for pid in candidates:
+            if any(v.startswith(q) for v in self.variants[pid]):
+                results.append(self.names[pid])
+                if len(results) >= k:
+                    break
+        return results
@@ -0,0 +1,116 @@
+import os
+import json
+import socket
+import tempfile
+
+# Client side of src/predict_daemon.py: no pandas / scipy import unless a model is
+# trained in-process, so a script talking to the daemon starts in a fraction of a second.
+
+SOCKET_PATH = os.environ.get('PREDICT_DAEMON_SOCKET',
+                             os.path.join(tempfile.gettempdir(), 'football_predictor.sock'))
+CLIENT_TIMEOUT = 120  # Seconds: the first request on a competition trains its model
+
+
+def to_json(value):
+    """json.dumps fallback for numpy scalars / arrays."""
+    if hasattr(value, 'item'):
+        return value.item() if getattr(value, 'ndim', 0) == 0 else value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class RemotePredictor:
+    """
+    Client for the daemon, with the Ligue1Predictor methods used by the scripts
+    (predict_match, predict_batch, predict_half_time, expected_goals, get_teams, has_team, resolve_team,
+    suggest_teams, team_stats).
+    """
+
+    def __init__(self, data_file=None, league_code="F1", socket_path=SOCKET_PATH, timeout=CLIENT_TIMEOUT):
+        self.model_spec = {'data_file': data_file, 'league_code': league_code}
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        try:
+            self._sock.connect(socket_path)
+        except OSError:
+            self._sock.close()
+            raise
+        self._file = self._sock.makefile('rwb')
+
+    def _call(self, method, *args, **kwargs):
+        request = {'method': method, 'model': self.model_spec, 'args': list(args), 'kwargs': kwargs}
+        self._file.write(json.dumps(request, default=to_json).encode('utf-8') + b'\n')
+        self._file.flush()
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("Prediction daemon closed the connection")
+        response = json.loads(line)
+        if not response.get('ok'):
+            raise RuntimeError(response.get('error', 'Unknown daemon error'))
+        return response['result']
+
+    def load(self):
+        """Makes sure the daemon has the model (trains it on first use). Returns the number of teams."""
+        return self._call('load')
+
+    def predict_match(self, home_team, away_team, neutral_venue=False, modifiers=None):
+        return self._call('predict_match', home_team, away_team, neutral_venue=neutral_venue, modifiers=modifiers)
+
+    def predict_batch(self, home_teams, away_teams, neutral_venue=False, modifiers=None):
+        return self._call('predict_batch', list(home_teams), list(away_teams),
+                          neutral_venue=neutral_venue, modifiers=modifiers)
+
+    def predict_half_time(self, home_teams, away_teams, neutral_venue=False, modifiers=None):
+        return self._call('predict_half_time', list(home_teams), list(away_teams),
+                          neutral_venue=neutral_venue, modifiers=modifiers)
+
+    def expected_goals(self, home_team, away_team, neutral_venue=False, modifiers=None):
+        result = self._call('expected_goals', home_team, away_team, neutral_venue=neutral_venue, modifiers=modifiers)
+        return tuple(result) if result is not None else None
+
+    def get_teams(self):
+        return self._call('get_teams')
+
+    def has_team(self, name):
+        return self._call('has_team', name)
+
+    def resolve_team(self, name):
+        return self._call('resolve_team', name)
+
+    def suggest_teams(self, name, n=3):
+        return self._call('suggest_teams', name, n)
+
+    @property
+    def team_stats(self):
+        import pandas as pd
+        split = self._call('team_stats')
+        return pd.DataFrame(split['data'], index=split['index'], columns=split['columns'])
+
+    def close(self):
+        self._file.close()
+        self._sock.close()
+
+
+def load_predictor(data_file=None, league_code="F1", use_daemon=True):
+    """
+    Client mode for the scripts: a RemotePredictor when the daemon is running,
+    otherwise (or if the daemon fails to load the model) a Ligue1Predictor trained in-process
+    (same methods either way).
+    PREDICT_DAEMON=0 forces in-process training.
+    """
+    if use_daemon and os.environ.get('PREDICT_DAEMON', '1') != '0' and hasattr(socket, 'AF_UNIX') \
+            and os.path.exists(SOCKET_PATH):
+        try:
+            client = RemotePredictor(data_file=data_file, league_code=league_code)
+        except OSError:
+            client = None  # Stale socket file: daemon not running
+        if client is not None:
+            try:
+                client.load()
+                return client
+            except (OSError, ValueError, RuntimeError) as e:
+                # Timeout, daemon error or broken connection: train in-process instead
+                client.close()
+                print(f"[WARNING] Démon de prédiction indisponible ({e}) : modèle entraîné localement.")
+
+    from src.model import Ligue1Predictor
+    return Ligue1Predictor(data_file=data_file, league_code=league_code)
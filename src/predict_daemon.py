@@ -0,0 +1,147 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import socket
+import socketserver
+import signal
+import threading
+from src import manifest as data_manifest
+from src.data_watcher import DataWatcher
+from src.match_store import MatchStore, competition_of
+from src.model import Ligue1Predictor
+from src.predict_client import SOCKET_PATH, to_json
+from src.tournament_sim import afcon_modifiers
+
+# Predictor methods callable over the socket
+METHODS = ('predict_match', 'predict_batch', 'predict_half_time', 'expected_goals', 'get_teams', 'has_team', 'resolve_team', 'suggest_teams')
+# Modifiers baked into a competition's pair table (same as app.MATCH_MODIFIERS)
+TABLE_MODIFIERS = {'AFCON.csv': afcon_modifiers()}
+
+
+class PredictionService:
+    """Trained Ligue1Predictor models kept resident, keyed by (data_file, league_code)."""
+
+    def __init__(self, store=None):
+        self.store = store
+        self.models = {}
+        self._lock = threading.Lock()
+        self.manifest = data_manifest.scan()
+
+    def get_model(self, data_file=None, league_code="F1"):
+        key = (data_file, league_code if not data_file else None)
+        model = self.models.get(key)
+        if model is None:
+            with self._lock:
+                model = self.models.get(key)
+                if model is None:
+                    print(f"[INFO] Entraînement du modèle {data_file or league_code}...")
+                    competition = competition_of(os.path.basename(data_file)) if data_file else league_code
+                    model = Ligue1Predictor(data_file=data_file, league_code=league_code, store=self.store,
+                                            table_modifiers=TABLE_MODIFIERS.get(competition))
+                    self.models[key] = model
+        return model
+
+    def refresh(self):
+        """Data files changed: sync the store and drop the models whose competition changed."""
+        new_manifest = data_manifest.scan(previous=self.manifest)
+        changed = data_manifest.diff(self.manifest, new_manifest)
+        self.manifest = new_manifest
+        if self.store is not None:
+            self.store.sync(new_manifest)
+        competitions = {competition_of(name) for name in changed if '/' not in name}
+        with self._lock:
+            stale = [key for key, model in self.models.items() if model.competition in competitions]
+            for key in stale:
+                del self.models[key]
+        if stale:
+            print(f"[INFO] Données modifiées, modèles rechargés au prochain appel : {sorted(competitions)}")
+
+    def handle(self, request):
+        """One NDJSON request -> response dict ({'ok': True, 'result': ...} or {'ok': False, 'error': ...})."""
+        method = request.get('method')
+        if method == 'ping':
+            return {'ok': True, 'result': 'pong'}
+
+        spec = request.get('model') or {}
+        model = self.get_model(spec.get('data_file'), spec.get('league_code', "F1"))
+        if method == 'load':
+            result = len(model.team_stats)
+        elif method == 'team_stats':
+            result = model.team_stats.to_dict(orient='split')
+        elif method in METHODS:
+            result = getattr(model, method)(*request.get('args', []), **request.get('kwargs', {}))
+        else:
+            return {'ok': False, 'error': f"Unknown method: {method}"}
+        return {'ok': True, 'result': result}
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        # One connection = any number of requests, one JSON object per line
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                response = self.server.service.handle(json.loads(line))
+            except Exception as e:
+                response = {'ok': False, 'error': str(e)}
+            self.wfile.write(json.dumps(response, default=to_json).encode('utf-8') + b'\n')
+            self.wfile.flush()
+
+
+def _daemon_running(socket_path):
+    """True if something accepts connections on socket_path (a live daemon, not a stale file)."""
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    probe.settimeout(1.0)
+    try:
+        probe.connect(socket_path)
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+def serve(socket_path=SOCKET_PATH, watch=True):
+    """Runs the daemon until interrupted."""
+    if not hasattr(socket, 'AF_UNIX'):
+        print("Sockets Unix non disponibles sur ce système : le démon ne peut pas démarrer.")
+        return
+    if os.path.exists(socket_path):
+        if _daemon_running(socket_path):
+            print(f"Un démon répond déjà sur {socket_path} : arrêtez-le avant d'en démarrer un autre.")
+            return
+        os.remove(socket_path)  # Left by a previous run that did not stop cleanly
+
+    store = MatchStore()
+    store.sync()
+    service = PredictionService(store)
+    if watch:
+        DataWatcher([data_manifest.DATA_DIR], service.refresh).start()
+
+    server = socketserver.ThreadingUnixStreamServer(socket_path, _RequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    print(f"=== Prediction daemon: {socket_path} ===")
+    # `kill` (SIGTERM) stops the daemon like Ctrl+C: the socket file is removed
+    signal.signal(signal.SIGTERM, lambda signum, frame: threading.Thread(target=server.shutdown).start())
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Démon de prédiction (modèles gardés en mémoire).")
+    parser.add_argument('--socket', default=SOCKET_PATH, help="Chemin du socket Unix")
+    parser.add_argument('--no-watch', action='store_true', help="Ne pas surveiller data/")
+    options = parser.parse_args()
+    serve(options.socket, watch=not options.no_watch)
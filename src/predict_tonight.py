@@ -1,14 +1,18 @@
-from src.model import Ligue1Predictor
+from src.predict_client import load_predictor
 from src.tournament_sim import SQUAD_BOOSTS
 
 def analyze_match(predictor, home, away):
     print(f"\n--- {home.upper()} vs {away.upper()} ---")
     
+    # Resolve approximate names/aliases ("Nottingham Forest" -> "Nott'm Forest")
+    home = predictor.resolve_team(home) or home
+    away = predictor.resolve_team(away) or away
+
     # Check teams
-    if home not in predictor.team_stats.index:
+    if not predictor.has_team(home):
         print(f"Erreur : {home} introuvable.")
         return
-    if away not in predictor.team_stats.index:
+    if not predictor.has_team(away):
         print(f"Erreur : {away} introuvable.")
         return
 
@@ -42,7 +46,7 @@ def predict_tonight():
     print("\n>>> PREMIER LEAGUE <<<")
     try:
         # Load Premier League Data (E0)
-        pred_pl = Ligue1Predictor(league_code="E0")
+        pred_pl = load_predictor(league_code="E0")
         analyze_match(pred_pl, "Fulham", "Nott'm Forest") # Check naming convention
     except Exception as e:
         print(f"Error PL: {e}")
@@ -51,7 +55,7 @@ def predict_tonight():
     print("\n>>> LA LIGA <<<")
     try:
         # Load La Liga Data (SP1)
-        pred_liga = Ligue1Predictor(league_code="SP1")
+        pred_liga = load_predictor(league_code="SP1")
         analyze_match(pred_liga, "Ath Bilbao", "Espanol") # Check naming convention
     except Exception as e:
         print(f"Error Liga: {e}")
@@ -1,10 +1,10 @@
-from src.model import Ligue1Predictor
+from src.predict_client import load_predictor
 import pandas as pd
 
 def predict_competition_winner():
     print("Chargement du modèle AFCON...")
     try:
-        predictor = Ligue1Predictor(data_file="data/AFCON.csv")
+        predictor = load_predictor(data_file="data/AFCON.csv")
     except Exception as e:
         print(f"Erreur: {e}")
         return
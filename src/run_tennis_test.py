@@ -1,8 +1,11 @@
-from tennis_model import TennisElo
+import sys
 import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.tennis_model import AdvancedTennisPredictor
 
 def test_model():
-    model = TennisElo()
+    model = AdvancedTennisPredictor()
     
     # Train on available data
     files = [
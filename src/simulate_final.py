@@ -1,11 +1,11 @@
-from src.model import Ligue1Predictor
+from src.predict_client import load_predictor
 from src.tournament_sim import SQUAD_BOOSTS, HOST_COUNTRY
 
 def simulate_final():
     print("--- SIMULATION DE LA FINALE : MAROC vs SÉNÉGAL ---")
     
     try:
-        predictor = Ligue1Predictor(data_file="data/AFCON.csv")
+        predictor = load_predictor(data_file="data/AFCON.csv")
     except Exception as e:
         print(f"Erreur: {e}")
         return
@@ -0,0 +1,152 @@
+from src.player_index import normalize_name
+
+# Common spellings -> name used in the data files (football-data.co.uk / martj42 results.csv)
+# Keys are free-form: they are normalized (accents, case, punctuation) at import.
+ALIASES = {
+    # England
+    "Manchester City": "Man City", "Man. City": "Man City",
+    "Manchester United": "Man United", "Man Utd": "Man United", "Manchester Utd": "Man United",
+    "Nottingham Forest": "Nott'm Forest", "Nottingham": "Nott'm Forest", "Forest": "Nott'm Forest",
+    "Tottenham Hotspur": "Tottenham", "Spurs": "Tottenham",
+    "Wolverhampton": "Wolves", "Wolverhampton Wanderers": "Wolves",
+    "Newcastle United": "Newcastle", "West Ham United": "West Ham",
+    "Brighton & Hove Albion": "Brighton", "Brighton and Hove Albion": "Brighton",
+    "Leeds United": "Leeds", "Leicester City": "Leicester", "Sheffield Utd": "Sheffield United",
+    "AFC Bournemouth": "Bournemouth", "Ipswich Town": "Ipswich", "Luton Town": "Luton",
+    "Norwich City": "Norwich",
+    # France
+    "Paris Saint-Germain": "Paris SG", "Paris Saint Germain": "Paris SG", "PSG": "Paris SG",
+    "Olympique de Marseille": "Marseille", "OM": "Marseille",
+    "Olympique Lyonnais": "Lyon", "OL": "Lyon",
+    "Saint-Etienne": "St Etienne", "AS Saint-Etienne": "St Etienne",
+    "AS Monaco": "Monaco", "Stade Rennais": "Rennes", "LOSC": "Lille", "LOSC Lille": "Lille",
+    "OGC Nice": "Nice", "RC Lens": "Lens", "Stade Brestois": "Brest", "RC Strasbourg": "Strasbourg",
+    # Spain
+    "Athletic Bilbao": "Ath Bilbao", "Athletic Club": "Ath Bilbao",
+    "Atletico Madrid": "Ath Madrid", "Atletico de Madrid": "Ath Madrid", "Atleti": "Ath Madrid",
+    "Espanyol": "Espanol", "Real Betis": "Betis", "Real Sociedad": "Sociedad",
+    "Rayo Vallecano": "Vallecano", "Celta Vigo": "Celta", "Deportivo Alaves": "Alaves",
+    "FC Barcelona": "Barcelona", "Barca": "Barcelona",
+    # Germany
+    "Bayern Munchen": "Bayern Munich", "Bayern": "Bayern Munich", "FC Bayern": "Bayern Munich",
+    "Borussia Dortmund": "Dortmund", "BVB": "Dortmund",
+    "Bayer Leverkusen": "Leverkusen", "Leipzig": "RB Leipzig",
+    "Eintracht Frankfurt": "Ein Frankfurt", "Frankfurt": "Ein Frankfurt",
+    "Borussia Monchengladbach": "M'gladbach", "Monchengladbach": "M'gladbach", "Gladbach": "M'gladbach",
+    "Koln": "FC Koln", "Cologne": "FC Koln", "Schalke": "Schalke 04", "Mainz 05": "Mainz",
+    "Werder": "Werder Bremen", "Hertha Berlin": "Hertha", "VfB Stuttgart": "Stuttgart",
+    # Italy
+    "Inter Milan": "Inter", "Internazionale": "Inter", "AC Milan": "Milan", "Juve": "Juventus",
+    "AS Roma": "Roma", "SSC Napoli": "Napoli", "Hellas Verona": "Verona",
+    # Portugal
+    "Sporting CP": "Sp Lisbon", "Sporting Lisbon": "Sp Lisbon", "Sporting": "Sp Lisbon",
+    "FC Porto": "Porto", "SL Benfica": "Benfica", "Braga": "Sp Braga",
+    # Africa (French spellings + official names)
+    "Cote d'Ivoire": "Ivory Coast", "Cote d Ivoire": "Ivory Coast",
+    "RD Congo": "DR Congo", "Congo DR": "DR Congo", "RDC": "DR Congo",
+    "Cabo Verde": "Cape Verde", "Sao Tome and Principe": "São Tomé and Príncipe",
+    "Swaziland": "Eswatini", "Maroc": "Morocco", "Egypte": "Egypt", "Algerie": "Algeria",
+    "Cameroun": "Cameroon", "Tunisie": "Tunisia", "Afrique du Sud": "South Africa",
+    "Guinee": "Guinea", "Guinee-Bissau": "Guinea-Bissau", "Guinee Equatoriale": "Equatorial Guinea",
+    "Soudan": "Sudan", "Tanzanie": "Tanzania", "Zambie": "Zambia",
+    "Ouganda": "Uganda", "Gambie": "Gambia", "Mauritanie": "Mauritania", "Namibie": "Namibia",
+}
+
+_NORMALIZED_ALIASES = {normalize_name(k): v for k, v in ALIASES.items()}
+
+
+def canonical_name(name):
+    """Maps a known alias to the data-file spelling (no fuzzy matching)."""
+    return _NORMALIZED_ALIASES.get(normalize_name(name), name)
+
+
+def _trigrams(normalized):
+    padded = f"  {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TeamResolver:
+    """
+    Resolves user-typed team names against a set of known teams.
+
+    1. Exact match on the normalized name or a known alias (dict lookup)
+    2. Otherwise: trigram inverted index, scored with the Dice coefficient. The best team must
+       reach `cutoff` and beat the runner-up by `margin` ("Manchester" is Man City or Man United:
+       no answer, the caller shows suggestions instead of pricing the wrong club)
+    Results are memoized, so repeated inputs cost a single dict lookup.
+    """
+
+    def __init__(self, teams, cutoff=0.6, margin=0.15):
+        self.teams = list(teams)
+        self.cutoff = cutoff
+        self.margin = margin
+        self._cache = {}
+
+        known = set(self.teams)
+        # Every searchable spelling -> canonical team
+        self.entries = []
+        self.exact = {}
+        for team in self.teams:
+            self._add_entry(normalize_name(team), team)
+        for alias, target in _NORMALIZED_ALIASES.items():
+            if target in known:
+                self._add_entry(alias, target)
+
+        self.postings = {}
+        self.entry_sizes = []
+        for entry_id, (normalized, _) in enumerate(self.entries):
+            grams = _trigrams(normalized)
+            self.entry_sizes.append(len(grams))
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(entry_id)
+
+    def _add_entry(self, normalized, team):
+        if normalized and normalized not in self.exact:
+            self.exact[normalized] = team
+            self.entries.append((normalized, team))
+
+    def _scores(self, normalized):
+        """Best Dice score per canonical team."""
+        grams = _trigrams(normalized)
+        shared = {}
+        for gram in grams:
+            for entry_id in self.postings.get(gram, ()):
+                shared[entry_id] = shared.get(entry_id, 0) + 1
+
+        best = {}
+        for entry_id, count in shared.items():
+            score = 2.0 * count / (len(grams) + self.entry_sizes[entry_id])
+            team = self.entries[entry_id][1]
+            if score > best.get(team, 0.0):
+                best[team] = score
+        return best
+
+    def resolve(self, name):
+        """Returns the matching team name, or None if nothing is close enough."""
+        if name in self._cache:
+            return self._cache[name]
+
+        normalized = normalize_name(name)
+        team = self.exact.get(normalized)
+        if team is None and normalized:
+            scores = self._scores(normalized)
+            if scores:
+                ranked = sorted(scores.items(), key=lambda x: x[1], reverse=True)
+                candidate, score = ranked[0]
+                runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+                if score >= self.cutoff and score - runner_up >= self.margin:
+                    team = candidate
+                else:
+                    # Prefix typing ("Bourn", "Wolver"): accept a unique prefix match
+                    prefixed = {t for n, t in self.entries if n.startswith(normalized)}
+                    if len(prefixed) == 1 and len(normalized) >= 3:
+                        team = prefixed.pop()
+
+        if len(self._cache) < 10000:
+            self._cache[name] = team
+        return team
+
+    def suggestions(self, name, n=3):
+        """Closest teams for an error message, best first."""
+        scores = self._scores(normalize_name(name))
+        return [t for t, _ in sorted(scores.items(), key=lambda x: x[1], reverse=True)[:n]]
@@ -0,0 +1,108 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from src.tennis_model import AdvancedTennisPredictor
+from src.tennis_scoring import match_win_prob
+
+ROUND_NAMES = {128: 'R128', 64: 'R64', 32: 'R32', 16: 'R16', 8: 'QF', 4: 'SF', 2: 'F', 1: 'W'}
+MAX_DRAW = 128
+
+
+def draw_from_csv(path, tourney_name):
+    """
+    Rebuilds a draw (bracket order, None = bye) from a Sackmann results file.
+    First-round matches are placed in the order of the second-round matches they feed.
+    """
+    df = pd.read_csv(path, encoding='latin1',
+                     usecols=['tourney_name', 'round', 'match_num', 'winner_name', 'loser_name'])
+    df = df[df['tourney_name'] == tourney_name].sort_values('match_num')
+    if df.empty:
+        return []
+
+    rounds = [ROUND_NAMES[size] for size in sorted(ROUND_NAMES, reverse=True)
+              if ROUND_NAMES[size] in set(df['round'])]
+    if len(rounds) < 2:
+        return []
+    first, second = df[df['round'] == rounds[0]], df[df['round'] == rounds[1]]
+    first_by_winner = {w: (w, l) for w, l in zip(first['winner_name'], first['loser_name'])}
+
+    draw = []
+    for w, l in zip(second['winner_name'], second['loser_name']):
+        for player in (w, l):
+            # No first-round match: the player had a bye
+            draw.extend(first_by_winner.get(player, (player, None)))
+    return draw
+
+
+def win_probability_matrix(predictor, players, surface='Hard', best_of=3):
+    """P[i, j] = probability that players[i] beats players[j] (surface Elo, format-adjusted)."""
+    ratings = np.array([predictor.get_rating(p, surface) for p in players])
+    elo_prob = 1 / (1 + 10 ** ((ratings[None, :] - ratings[:, None]) / 400))
+    return match_win_prob(elo_prob, surface, best_of)
+
+
+def simulate_draw(predictor, draw, surface='Hard', best_of=3, n_simulations=100000,
+                  seed=None, batch_size=25000):
+    """
+    Vectorized Monte Carlo of a single-elimination draw.
+
+    Args:
+        predictor: Trained AdvancedTennisPredictor
+        draw: Player names in bracket order (power of 2, up to 128 slots), None for a bye
+        surface: 'Hard', 'Clay' or 'Grass'
+        best_of: 3 or 5
+        n_simulations: Number of simulated tournaments
+        seed: Optional random seed (reproducible runs)
+
+    Returns:
+        DataFrame (one row per player) with the probability of reaching each round
+        ('R64', ..., 'F') and of winning the title ('W'), sorted by title odds.
+    """
+    n_slots = len(draw)
+    if n_slots < 2 or n_slots > MAX_DRAW or n_slots & (n_slots - 1):
+        raise ValueError(f"Draw size must be a power of 2 between 2 and {MAX_DRAW} (got {n_slots}).")
+
+    players = list(dict.fromkeys(p for p in draw if p is not None))
+    bye = len(players)
+    slots = np.array([players.index(p) if p is not None else bye for p in draw], dtype=np.int16)
+
+    # Pairwise matrix, plus a "bye" row/column that always loses
+    probs = np.zeros((bye + 1, bye + 1))
+    probs[:bye, :bye] = win_probability_matrix(predictor, players, surface, best_of)
+    probs[:bye, bye] = 1.0
+
+    n_rounds = n_slots.bit_length() - 1
+    reached = np.zeros((n_rounds, bye + 1))
+    rng = np.random.default_rng(seed)
+
+    for start in range(0, n_simulations, batch_size):
+        size = min(batch_size, n_simulations - start)
+        alive = np.broadcast_to(slots, (size, n_slots))
+        for rnd in range(n_rounds):
+            a, b = alive[:, 0::2], alive[:, 1::2]
+            a_wins = rng.random(a.shape) < probs[a, b]
+            alive = np.where(a_wins, a, b)
+            reached[rnd] += np.bincount(alive.ravel(), minlength=bye + 1)
+
+    columns = [ROUND_NAMES[n_slots >> (rnd + 1)] for rnd in range(n_rounds)]
+    result = pd.DataFrame(reached[:, :bye].T / n_simulations, index=players, columns=columns)
+    return result.sort_values(columns[::-1], ascending=False)
+
+
+if __name__ == "__main__":
+    import time
+
+    predictor = AdvancedTennisPredictor()
+    predictor.train_from_csv(["data/tennis/atp_2024.csv"])
+
+    draw = draw_from_csv("data/tennis/atp_2024.csv", "Wimbledon")
+    print(f"\n=== SIMULATION WIMBLEDON 2024 ({len(draw)} joueurs, Best of 5, Grass) ===")
+
+    start = time.perf_counter()
+    results = simulate_draw(predictor, draw, surface='Grass', best_of=5, n_simulations=100000, seed=42)
+    print(f"100 000 tournois simulés en {time.perf_counter() - start:.2f}s\n")
+
+    print((results.head(10) * 100).round(1).to_string())
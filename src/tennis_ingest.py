@@ -0,0 +1,119 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import re
+import json
+from src.metrics import TENNIS_PHASE_SECONDS, timed
+from src.tennis_model import AdvancedTennisPredictor, read_matches_csv
+
+DATA_DIR = "data/tennis"
+SNAPSHOT_PATH = "data/cache/tennis_snapshot.npz"
+CHUNK_SIZE = 10000
+# Bump when the rating engine changes: older snapshots are then rebuilt
+SNAPSHOT_VERSION = 1
+
+_FILE_PATTERN = re.compile(r'^(atp|wta)_(\d{4})\.csv$')
+
+
+def list_match_files(data_dir=DATA_DIR, tours=('atp', 'wta'), first_year=None):
+    """Yearly files (atp_YYYY.csv / wta_YYYY.csv) of data_dir, in chronological order."""
+    if not os.path.isdir(data_dir):
+        return []
+    found = []
+    for filename in os.listdir(data_dir):
+        match = _FILE_PATTERN.match(filename)
+        if not match or match.group(1) not in tours:
+            continue
+        year = int(match.group(2))
+        if first_year is None or year >= first_year:
+            found.append((year, match.group(1), os.path.join(data_dir, filename)))
+    return [path for _, _, path in sorted(found)]
+
+
+def files_signature(paths):
+    """Identifies a set of source files (name, size, mtime): any change invalidates the snapshot."""
+    entries = []
+    for path in paths:
+        stat = os.stat(path)
+        entries.append([os.path.basename(path), stat.st_size, stat.st_mtime_ns])
+    return json.dumps({'version': SNAPSHOT_VERSION, 'files': entries})
+
+
+@timed(TENNIS_PHASE_SECONDS, 'ingest')
+def stream_train(predictor, paths, chunksize=CHUNK_SIZE):
+    """
+    Feeds the yearly files to the rating engine one at a time, oldest first.
+    Each file is parsed in pruned chunks and released once replayed, so peak memory
+    is bounded by the largest single year, whatever the number of seasons.
+    Returns the number of files used.
+    """
+    n_files = 0
+    for path in paths:
+        try:
+            df = read_matches_csv(path, chunksize=chunksize)
+        except Exception as e:
+            print(f"Error processing {path}: {e}")
+            continue
+        if df is None:
+            continue
+        predictor.train_from_frame(df)
+        n_files += 1
+        del df
+    return n_files
+
+
+def load_tennis_predictor(data_dir=DATA_DIR, snapshot_path=SNAPSHOT_PATH, use_snapshot=True):
+    """
+    Predictor trained on every yearly file of data_dir.
+    Restored from the snapshot when the source files did not change, otherwise
+    retrained by streaming and snapshotted for the next start.
+
+    Returns:
+        (predictor, paths of the source files)
+    """
+    paths = list_match_files(data_dir)
+    signature = files_signature(paths)
+
+    if use_snapshot:
+        predictor = AdvancedTennisPredictor.load_snapshot(snapshot_path, signature)
+        if predictor is not None:
+            print(f"[INFO] Modèle tennis restauré depuis {snapshot_path} ({len(predictor.history)} matchs).")
+            return predictor, paths
+
+    predictor = AdvancedTennisPredictor()
+    n_files = stream_train(predictor, paths)
+    predictor.build_player_index()
+    print(f"[INFO] Modèle tennis entraîné sur {n_files} fichiers ({len(predictor.history)} matchs).")
+
+    if use_snapshot and n_files:
+        try:
+            predictor.save_snapshot(snapshot_path, signature)
+        except OSError as e:
+            print(f"[WARNING] Snapshot tennis non écrit : {e}")
+    return predictor, paths
+
+
+if __name__ == "__main__":
+    import time
+    import tracemalloc
+
+    # Peak memory of the streaming pass as seasons are added
+    paths = list_match_files()
+    print(f"=== INGESTION TENNIS ({len(paths)} fichiers) ===")
+    tracemalloc.start()
+    predictor = AdvancedTennisPredictor()
+    start = time.perf_counter()
+    for path in paths:
+        tracemalloc.reset_peak()
+        stream_train(predictor, [path])
+        _, peak = tracemalloc.get_traced_memory()
+        print(f"{os.path.basename(path):14s} {len(predictor.history):8d} matchs  pic {peak / 1e6:6.1f} Mo")
+    print(f"Total : {time.perf_counter() - start:.2f}s")
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    predictor.save_snapshot(SNAPSHOT_PATH, files_signature(paths))
+    restored = AdvancedTennisPredictor.load_snapshot(SNAPSHOT_PATH, files_signature(paths))
+    print(f"Snapshot écrit et relu en {time.perf_counter() - start:.2f}s "
+          f"({len(restored.player_names)} joueurs)")
@@ -1,105 +1,393 @@
 import pandas as pd
 import numpy as np
 import os
+from array import array
+from src.metrics import TENNIS_PHASE_SECONDS, timed
+from src.player_index import PlayerPrefixIndex
+from src.tennis_scoring import score_probabilities
+
+# Rating columns: one per surface + Overall
+SURFACES = ['Hard', 'Clay', 'Grass']
+OVERALL = 3
+BASE_RATING = 1500.0
+
+
+class MatchHistory:
+    """Columnar match history: parallel typed arrays, one slot per match."""
+
+    def __init__(self):
+        self.winner = array('i')   # Player ids
+        self.loser = array('i')
+        self.surface = array('b')  # Index in surface_names
+        self.date = array('i')     # tourney_date as YYYYMMDD (0 if unknown)
+        self.score = array('i')    # Index in score_strings
+        self.surface_names = list(SURFACES)
+        self.score_strings = []
+        self._surface_codes = {name: i for i, name in enumerate(self.surface_names)}
+        self._score_codes = {}
+
+    def __len__(self):
+        return len(self.winner)
+
+    def surface_code(self, surface):
+        code = self._surface_codes.get(surface)
+        if code is None:
+            code = len(self.surface_names)
+            self.surface_names.append(surface)
+            self._surface_codes[surface] = code
+        return code
+
+    def score_code(self, score):
+        code = self._score_codes.get(score)
+        if code is None:
+            code = len(self.score_strings)
+            self.score_strings.append(score)
+            self._score_codes[score] = code
+        return code
+
+    def append(self, winner_id, loser_id, surface_code, date, score_code):
+        self.winner.append(winner_id)
+        self.loser.append(loser_id)
+        self.surface.append(surface_code)
+        self.date.append(date)
+        self.score.append(score_code)
+
+    def record(self, i, names):
+        """Match i as a dict (API format)."""
+        return {
+            'winner': names[self.winner[i]], 'loser': names[self.loser[i]],
+            'surface': self.surface_names[self.surface[i]],
+            'score': self.score_strings[self.score[i]], 'date': self.date[i]
+        }
+
+
+# Only these columns are read from the Sackmann files
+MATCH_COLUMNS = ['winner_name', 'loser_name', 'surface', 'tourney_date', 'score']
+MATCH_DTYPES = {'winner_name': 'object', 'loser_name': 'object', 'surface': 'object',
+                'tourney_date': 'float64', 'score': 'object'}
+
+
+def _prune_chunk(df):
+    """Lowercased columns, required ones present, rows without player names dropped."""
+    df.columns = [c.lower() for c in df.columns]
+    if not all(col in df.columns for col in ['winner_name', 'loser_name', 'surface']):
+        return None
+    for col in ['tourney_date', 'score']:
+        if col not in df.columns:
+            df[col] = np.nan
+    return df.dropna(subset=['winner_name', 'loser_name'])[MATCH_COLUMNS]
+
+
+def read_matches_csv(path, chunksize=None):
+    """
+    Column-pruned, typed read of a Sackmann match file, sorted by date (None if unusable).
+    With `chunksize`, the file is parsed in chunks of that many rows: only the pruned
+    columns of each chunk are kept, so the parser never holds the full-width file.
+    """
+    reader = pd.read_csv(path, encoding='latin1', usecols=lambda c: c.lower() in MATCH_COLUMNS,
+                         dtype=MATCH_DTYPES, chunksize=chunksize)
+    if chunksize is None:
+        df = _prune_chunk(reader)
+    else:
+        with reader:
+            chunks = [_prune_chunk(chunk) for chunk in reader]
+        if not chunks or any(chunk is None for chunk in chunks):
+            return None
+        df = pd.concat(chunks, ignore_index=True)
+    if df is None:
+        return None
+    # Stable sort: keeps the file order of matches within a tournament
+    return df.sort_values('tourney_date', kind='stable').reset_index(drop=True)
+
+
+class PairRecord:
+    """H2H summary of one unordered pair (lo_id < hi_id), updated as matches are replayed."""
+    __slots__ = ('offsets', 'wins', 'surface_wins')
+
+    def __init__(self):
+        self.offsets = array('i')   # Positions in MatchHistory, chronological
+        self.wins = [0, 0]          # [lo_id wins, hi_id wins]
+        self.surface_wins = {}      # surface code -> [lo_id wins, hi_id wins]
+
+    def add(self, offset, lo_won, surface_code):
+        side = 0 if lo_won else 1
+        self.offsets.append(offset)
+        self.wins[side] += 1
+        self.surface_wins.setdefault(surface_code, [0, 0])[side] += 1
+
 
 class AdvancedTennisPredictor:
     def __init__(self):
-        self.ratings = {}
-        self.history = [] # List of dicts: {winner, loser, surface, score, date}
+        # Players are interned to integer ids (row in the ratings array)
+        self.player_ids = {}
+        self.player_names = []
+        self._ratings = np.full((256, 4), BASE_RATING)  # players x {Hard, Clay, Grass, Overall}
+        self.last_played = array('i')  # Player id -> last tourney_date (YYYYMMDD)
+        self.history = MatchHistory()
+        # Unordered player pair -> PairRecord (offsets in history + running win counts)
+        self.pair_index = {}
+        self.player_index = None # Autocomplete index, rebuilt after training
         self.k_factor_surface = 32
         self.k_factor_overall = 16
-        
+
+    @property
+    def ratings(self):
+        """Ratings array (n_players x 4), rows indexed by player id."""
+        return self._ratings[:len(self.player_names)]
+
+    def _player_id(self, player):
+        """Interns a player name (new players start at BASE_RATING everywhere)."""
+        pid = self.player_ids.get(player)
+        if pid is None:
+            pid = len(self.player_names)
+            if pid == len(self._ratings):
+                grown = np.full((len(self._ratings) * 2, 4), BASE_RATING)
+                grown[:pid] = self._ratings
+                self._ratings = grown
+            self.player_ids[player] = pid
+            self.player_names.append(player)
+            self.last_played.append(0)
+        return pid
+
     def get_rating(self, player, surface):
-        if player not in self.ratings:
-            return 1500.0
-        if surface not in ['Hard', 'Clay', 'Grass']:
-            surface = 'Hard'
-        
-        surf = self.ratings[player].get(surface, 1500.0)
-        overall = self.ratings[player].get('Overall', 1500.0)
-        return (surf * 0.8) + (overall * 0.2)
+        pid = self.player_ids.get(player)
+        if pid is None:
+            return BASE_RATING
+        col = SURFACES.index(surface) if surface in SURFACES else 0
+        row = self._ratings[pid]
+        return float((row[col] * 0.8) + (row[OVERALL] * 0.2))
 
     def update_ratings(self, winner, loser, surface):
         # Initialize if new
-        for p in [winner, loser]:
-            if p not in self.ratings:
-                self.ratings[p] = {'Hard': 1500.0, 'Clay': 1500.0, 'Grass': 1500.0, 'Overall': 1500.0}
-        
-        if surface not in ['Hard', 'Clay', 'Grass']:
+        w, l = self._player_id(winner), self._player_id(loser)
+
+        if surface not in SURFACES:
             return
+        col = SURFACES.index(surface)
+        r = self._ratings
 
         # Surface Update
-        w_elo, l_elo = self.ratings[winner][surface], self.ratings[loser][surface]
+        w_elo, l_elo = r[w, col], r[l, col]
         w_prob = 1 / (1 + 10 ** ((l_elo - w_elo) / 400))
         delta = self.k_factor_surface * (1 - w_prob)
-        self.ratings[winner][surface] += delta
-        self.ratings[loser][surface] -= delta
-        
+        r[w, col] += delta
+        r[l, col] -= delta
+
         # Overall Update
-        w_ov, l_ov = self.ratings[winner]['Overall'], self.ratings[loser]['Overall']
+        w_ov, l_ov = r[w, OVERALL], r[l, OVERALL]
         w_prob_ov = 1 / (1 + 10 ** ((l_ov - w_ov) / 400))
         delta_ov = self.k_factor_overall * (1 - w_prob_ov)
-        self.ratings[winner]['Overall'] += delta_ov
-        self.ratings[loser]['Overall'] -= delta_ov
+        r[w, OVERALL] += delta_ov
+        r[l, OVERALL] -= delta_ov
 
+    @timed(TENNIS_PHASE_SECONDS, 'train_from_csv')
     def train_from_csv(self, file_paths):
         print("=== Training Advanced Tennis Model ===")
         for path in file_paths:
             if not os.path.exists(path):
                 continue
             try:
-                df = pd.read_csv(path, encoding='latin1')
-                # Standardize columns
-                df.columns = [c.lower() for c in df.columns]
-                
-                # Check required columns
-                required = ['winner_name', 'loser_name', 'surface']
-                if not all(col in df.columns for col in required):
+                df = read_matches_csv(path)
+                if df is None:
                     continue
-                
-                # Sort by date if possible
-                if 'tourney_date' in df.columns:
-                    df = df.sort_values('tourney_date')
-                
-                for _, row in df.iterrows():
-                    w, l, s = row['winner_name'], row['loser_name'], row['surface']
-                    score = row.get('score', 'N/A')
-                    date = row.get('tourney_date', 'N/A')
-                    
-                    self.update_ratings(w, l, s)
-                    self.history.append({
-                        'winner': w, 'loser': l, 'surface': s, 'score': score, 'date': date
-                    })
+                self.train_from_frame(df)
             except Exception as e:
                 print(f"Error processing {path}: {e}")
         print(f"Training complete. Processed {len(self.history)} matches.")
+        self.build_player_index()
+
+    def train_from_frame(self, df):
+        """
+        Replays a (chronologically sorted) frame of matches.
+        Names/surfaces/scores are mapped to integer codes with vectorized ops, then the
+        sequential Elo recurrence runs over plain arrays.
+        """
+        # 1. Intern players (only unique names go through Python)
+        for name in pd.unique(pd.concat([df['winner_name'], df['loser_name']], ignore_index=True)):
+            self._player_id(name)
+        winners = df['winner_name'].map(self.player_ids).to_numpy(np.int32)
+        losers = df['loser_name'].map(self.player_ids).to_numpy(np.int32)
+
+        # 2. Surface / score / date codes
+        surface_names = df['surface'].where(df['surface'].notna(), 'Unknown')
+        surface_codes = surface_names.map({s: self.history.surface_code(s) for s in pd.unique(surface_names)})
+        surfaces = surface_codes.to_numpy(np.int8)
+        scores = df['score'].where(df['score'].notna(), 'N/A')
+        scores = scores.map({s: self.history.score_code(s) for s in pd.unique(scores)}).to_numpy(np.int32)
+        dates = df['tourney_date'].fillna(0).to_numpy(np.int32)
+
+        # 3. Sequential Elo recurrence
+        self._replay_elo(winners, losers, surfaces)
+
+        # 4. Append to the columnar history / recency / H2H index
+        h = self.history
+        self._index_pairs(len(h), winners, losers, surfaces)
+        h.winner.frombytes(winners.tobytes())
+        h.loser.frombytes(losers.tobytes())
+        h.surface.frombytes(surfaces.tobytes())
+        h.date.frombytes(dates.tobytes())
+        h.score.frombytes(scores.tobytes())
+
+        last = np.frombuffer(self.last_played, dtype=np.int32).copy()
+        np.maximum.at(last, winners, dates)
+        np.maximum.at(last, losers, dates)
+        self.last_played = array('i', last.tobytes())
+
+    def _index_pairs(self, first_offset, winners, losers, surfaces):
+        """Registers matches (history offsets first_offset...) in the pair index."""
+        pair_index = self.pair_index
+        for offset, w, l, s in zip(range(first_offset, first_offset + len(winners)),
+                                   winners.tolist(), losers.tolist(), surfaces.tolist()):
+            key = (w, l) if w < l else (l, w)
+            record = pair_index.get(key)
+            if record is None:
+                record = pair_index[key] = PairRecord()
+            record.add(offset, w < l, s)
+
+    def _replay_elo(self, winners, losers, surfaces):
+        """Elo updates for a sequence of matches (surface code >= 3 -> players created only)."""
+        n = len(self.player_names)
+        cols = [self._ratings[:n, c].tolist() for c in range(4)]
+        overall = cols[OVERALL]
+        k_surf, k_ov = self.k_factor_surface, self.k_factor_overall
+
+        for w, l, s in zip(winners.tolist(), losers.tolist(), surfaces.tolist()):
+            if s >= OVERALL:
+                continue
+            surf = cols[s]
+            delta = k_surf * (1 - 1 / (1 + 10 ** ((surf[l] - surf[w]) / 400)))
+            surf[w] += delta
+            surf[l] -= delta
+            delta_ov = k_ov * (1 - 1 / (1 + 10 ** ((overall[l] - overall[w]) / 400)))
+            overall[w] += delta_ov
+            overall[l] -= delta_ov
+
+        self._ratings[:n] = np.array(cols).T
+
+    def save_snapshot(self, path, signature=''):
+        """Writes players, ratings and match history to a .npz file (atomic replace)."""
+        h = self.history
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = path + '.tmp.npz'
+        np.savez(tmp_path,
+                 signature=np.array(signature),
+                 names=np.array(self.player_names, dtype=str),
+                 ratings=self.ratings,
+                 last_played=np.frombuffer(self.last_played, dtype=np.int32),
+                 winner=np.frombuffer(h.winner, dtype=np.int32),
+                 loser=np.frombuffer(h.loser, dtype=np.int32),
+                 surface=np.frombuffer(h.surface, dtype=np.int8),
+                 date=np.frombuffer(h.date, dtype=np.int32),
+                 score=np.frombuffer(h.score, dtype=np.int32),
+                 surface_names=np.array(h.surface_names, dtype=str),
+                 score_strings=np.array(h.score_strings, dtype=str))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load_snapshot(cls, path, signature=''):
+        """
+        Predictor restored from save_snapshot(), or None if the file is missing,
+        unreadable or was written for another signature (other source files).
+        The pair index and autocomplete index are rebuilt from the history.
+        """
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as data:
+                if str(data['signature']) != signature:
+                    return None
+                model = cls()
+                model.player_names = data['names'].tolist()
+                model.player_ids = {name: pid for pid, name in enumerate(model.player_names)}
+                n = len(model.player_names)
+                model._ratings = np.full((max(256, n), 4), BASE_RATING)
+                model._ratings[:n] = data['ratings']
+                model.last_played = array('i', data['last_played'].astype(np.int32).tobytes())
+
+                h = model.history
+                winners, losers, surfaces = data['winner'], data['loser'], data['surface']
+                h.winner.frombytes(winners.tobytes())
+                h.loser.frombytes(losers.tobytes())
+                h.surface.frombytes(surfaces.tobytes())
+                h.date.frombytes(data['date'].tobytes())
+                h.score.frombytes(data['score'].tobytes())
+                for name in data['surface_names'].tolist()[len(SURFACES):]:
+                    h.surface_code(name)
+                for score in data['score_strings'].tolist():
+                    h.score_code(score)
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Snapshot {path} ignored: {e}")
+            return None
+
+        model._index_pairs(0, winners, losers, surfaces)
+        model.build_player_index()
+        return model
+
+    @timed(TENNIS_PHASE_SECONDS, 'build_player_index')
+    def build_player_index(self):
+        """Prebuilds the prefix index used by autocomplete()."""
+        self.player_index = PlayerPrefixIndex(
+            self.player_names, self.ratings[:, OVERALL].tolist(), self.last_played.tolist())
+
+    def autocomplete(self, query, k=8, rank='rating'):
+        """Top-k players matching a (partial, accent-insensitive) name. rank: 'rating' or 'recent'."""
+        if self.player_index is None:
+            return []
+        return self.player_index.search(query, k=k, rank=rank)
+
+    def get_top_players(self, surface='Overall', n=10):
+        """Top n (player, rating) for a surface (same blend as get_rating) or 'Overall'."""
+        if surface in SURFACES:
+            scores = self.ratings[:, SURFACES.index(surface)] * 0.8 + self.ratings[:, OVERALL] * 0.2
+        else:
+            scores = self.ratings[:, OVERALL]
+        order = np.argsort(-scores, kind='stable')[:n]
+        return [(self.player_names[i], float(scores[i])) for i in order]
 
     def get_all_players(self):
         """Returns sorted list of all known players for Autocomplete."""
-        return sorted(list(self.ratings.keys()))
-
-    def get_head_to_head(self, p1, p2):
-        """Returns H2H stats between p1 and p2."""
-        h2h = {'p1_wins': 0, 'p2_wins': 0, 'matches': []}
-        for m in self.history:
-            if (m['winner'] == p1 and m['loser'] == p2):
-                h2h['p1_wins'] += 1
-                h2h['matches'].append(m)
-            elif (m['winner'] == p2 and m['loser'] == p1):
-                h2h['p2_wins'] += 1
-                h2h['matches'].append(m)
+        return sorted(self.player_names)
+
+    @timed(TENNIS_PHASE_SECONDS, 'head_to_head')
+    def get_head_to_head(self, p1, p2, last_n=10):
+        """
+        Returns H2H stats between p1 and p2 from the pair index (no history scan).
+        'matches' holds the last `last_n` meetings, oldest first.
+        """
+        h2h = {'p1_wins': 0, 'p2_wins': 0, 'total': 0, 'surfaces': {}, 'matches': []}
+        id1, id2 = self.player_ids.get(p1), self.player_ids.get(p2)
+        if id1 is None or id2 is None or id1 == id2:
+            return h2h
+        record = self.pair_index.get((id1, id2) if id1 < id2 else (id2, id1))
+        if record is None:
+            return h2h
+
+        # Counts are stored for (lo_id, hi_id): swap if p1 is the higher id
+        p1_side, p2_side = (0, 1) if id1 < id2 else (1, 0)
+        h2h['p1_wins'] = record.wins[p1_side]
+        h2h['p2_wins'] = record.wins[p2_side]
+        h2h['total'] = len(record.offsets)
+        for code, wins in record.surface_wins.items():
+            h2h['surfaces'][self.history.surface_names[code]] = {
+                'p1_wins': wins[p1_side], 'p2_wins': wins[p2_side]
+            }
+        h2h['matches'] = [self.history.record(i, self.player_names) for i in record.offsets[-last_n:]]
         return h2h
 
+    @timed(TENNIS_PHASE_SECONDS, 'predict_match')
     def predict_match(self, p1, p2, surface, best_of=3):
         elo1 = self.get_rating(p1, surface)
         elo2 = self.get_rating(p2, surface)
         
         # Win Probability (Log5)
-        prob1 = 1 / (1 + 10 ** ((elo2 - elo1) / 400))
-        prob2 = 1 - prob1
+        elo_prob1 = 1 / (1 + 10 ** ((elo2 - elo1) / 400))
         
-        # Score Simulation
-        scores = self.simulate_set_scores(prob1, best_of)
+        # Exact score engine (point -> game -> set -> match), consistent with the Elo probability.
+        # For best-of-5 the favourite's edge grows, so the match probability comes from the engine.
+        outcome = score_probabilities(elo_prob1, surface, best_of)
+        prob1 = outcome['win_prob']
+        prob2 = 1 - prob1
+        scores = self._format_set_scores(outcome)
         
         # H2H
         h2h = self.get_head_to_head(p1, p2)
@@ -114,55 +402,25 @@ class AdvancedTennisPredictor:
             'win_prob2': round(prob2 * 100, 1),
             'history': h2h,
             'set_scores': scores,
+            'games': {
+                'expected': round(outcome['expected_games'], 1),
+                'over': [{'line': line, 'prob': round(p * 100, 1)} for line, p in outcome['games_over'].items()]
+            },
+            'tiebreak_prob': round(outcome['tiebreak_prob'] * 100, 1),
             'format': f"Best of {best_of}",
             'tip': tip
         }
 
-    def simulate_set_scores(self, p1_win_prob, best_of=3):
+    def simulate_set_scores(self, p1_win_prob, best_of=3, surface='Hard'):
         """
-        Estimates probabilities of specific set scores (2-0, 2-1 vs 0-2, 1-2).
-        Heuristic approach: Stronger favorites are more likely to win in straight sets.
+        Probabilities of each set score (2-0, 2-1 vs 1-2, 0-2...) from the Markov score engine.
+        p1_win_prob is read as the best-of-3 (Elo) win probability.
         """
-        p = p1_win_prob
-        q = 1 - p
-        
-        scores = []
-        
-        if best_of == 3:
-            # P(2-0) approx p^2 (simplified)
-            # P(2-1) approx 2 * p^2 * q
-            # Normalize to match match_win_prob sum
-            
-            # Raw weights based on win prob
-            if p > 0.5:
-                prob_2_0 = p * 0.70 # Heavy bias to straight sets if strong fav
-                prob_2_1 = p * 0.30
-                prob_0_2 = q * 0.60
-                prob_1_2 = q * 0.40
-            else:
-                prob_0_2 = q * 0.70
-                prob_1_2 = q * 0.30
-                prob_2_0 = p * 0.60
-                prob_2_1 = p * 0.40
-                
-            scores = [
-                {'score': '2-0', 'prob': round(prob_2_0 * 100, 1)},
-                {'score': '2-1', 'prob': round(prob_2_1 * 100, 1)},
-                {'score': '0-2', 'prob': round(prob_0_2 * 100, 1)},
-                {'score': '1-2', 'prob': round(prob_1_2 * 100, 1)}
-            ]
-            
-        elif best_of == 5:
-            # Best of 5 logic
-            scores = [
-                {'score': '3-0', 'prob': round(p * 0.50 * 100, 1)},
-                {'score': '3-1', 'prob': round(p * 0.35 * 100, 1)},
-                {'score': '3-2', 'prob': round(p * 0.15 * 100, 1)},
-                {'score': '0-3', 'prob': round(q * 0.50 * 100, 1)},
-                {'score': '1-3', 'prob': round(q * 0.35 * 100, 1)},
-                {'score': '2-3', 'prob': round(q * 0.15 * 100, 1)}
-            ]
-            
+        return self._format_set_scores(score_probabilities(p1_win_prob, surface, best_of))
+
+    @staticmethod
+    def _format_set_scores(outcome):
+        scores = [{'score': label, 'prob': round(p * 100, 1)} for label, p in outcome['set_scores']]
         # Sort by probability high to low
         scores.sort(key=lambda x: x['prob'], reverse=True)
         return scores
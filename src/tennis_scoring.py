@@ -0,0 +1,206 @@
+import numpy as np
+from functools import lru_cache
+
+# All functions below are pure arithmetic: pa/pb may be floats or numpy arrays
+# (the score tables evaluate the whole probability grid in one pass).
+
+# Average probability of winning a point on serve, per surface (tour-level orders of magnitude)
+SERVE_BASELINE = {'Hard': 0.64, 'Clay': 0.60, 'Grass': 0.67}
+
+# Grid of serve-point differentials d: player A wins (base + d/2) of points on serve, B (base - d/2)
+D_GRID = np.linspace(-0.36, 0.36, 289)
+MAX_GAMES = 66  # 5 sets x 13 games + 1
+
+SET_SCORE_LABELS = {
+    3: [(2, 0), (2, 1), (1, 2), (0, 2)],
+    5: [(3, 0), (3, 1), (3, 2), (2, 3), (1, 3), (0, 3)],
+}
+
+
+def game_win_prob(p):
+    """Probability that the server holds, winning each point with probability p."""
+    q = 1 - p
+    deuce = p * p / (p * p + q * q)
+    return p ** 4 * (1 + 4 * q + 10 * q * q) + 20 * p ** 3 * q ** 3 * deuce
+
+
+def tiebreak_win_prob(pa, pb):
+    """
+    Probability that A wins a 7-point tiebreak, A serving the first point.
+    pa / pb: probability that A / B wins a point on their own serve.
+    """
+    reach = [[0.0] * 8 for _ in range(8)]
+    reach[0][0] = 1.0
+    for i in range(7):
+        for j in range(7):
+            if i == 6 and j == 6:
+                continue
+            # Serve order: A, B, B, A, A, B, B, ...
+            a_serves = ((i + j + 1) // 2) % 2 == 0
+            p = pa if a_serves else 1 - pb
+            reach[i + 1][j] = reach[i + 1][j] + reach[i][j] * p
+            reach[i][j + 1] = reach[i][j + 1] + reach[i][j] * (1 - p)
+
+    win = sum(reach[7][j] for j in range(6))
+    # From 6-6: one point on each serve until someone leads by two
+    win_pair = pa * (1 - pb)
+    lose_pair = (1 - pa) * pb
+    win += reach[6][6] * win_pair / (win_pair + lose_pair)
+    return win
+
+
+def set_score_distribution(pa, pb, a_serves_first=True):
+    """
+    Exact distribution of the final set score {(games_a, games_b): prob}.
+    Standard set: first to 6 games by two, tiebreak at 6-6 (recorded as 7-6 / 6-7).
+    """
+    hold_a = game_win_prob(pa)
+    hold_b = game_win_prob(pb)
+    # None = unreachable state (the score passed through a finished set)
+    reach = [[None] * 8 for _ in range(8)]
+    reach[0][0] = 1.0
+    final = {}
+
+    for i in range(8):
+        for j in range(8):
+            prob = reach[i][j]
+            if prob is None:
+                continue
+            if (i >= 6 or j >= 6) and abs(i - j) >= 2:
+                final[(i, j)] = prob
+                continue
+            if i == 6 and j == 6:
+                # Game 13 (tiebreak) is served by whoever served game 1
+                if a_serves_first:
+                    tb = tiebreak_win_prob(pa, pb)
+                else:
+                    tb = 1 - tiebreak_win_prob(pb, pa)
+                final[(7, 6)] = prob * tb
+                final[(6, 7)] = prob * (1 - tb)
+                continue
+            a_serves = ((i + j) % 2 == 0) == a_serves_first
+            p_a = hold_a if a_serves else 1 - hold_b
+            for (ni, nj), p in (((i + 1, j), p_a), ((i, j + 1), 1 - p_a)):
+                reach[ni][nj] = prob * p if reach[ni][nj] is None else reach[ni][nj] + prob * p
+    return final
+
+
+def match_distribution(pa, pb, best_of=3, a_serves_first=True):
+    """
+    Exact match outcome distribution by dynamic programming over sets.
+
+    Returns:
+        (set_scores, total_games, tiebreak_prob)
+        set_scores: {(sets_a, sets_b): prob}
+        total_games: array [..., n], P(total games == n)
+        tiebreak_prob: P(at least one tiebreak in the match)
+    """
+    to_win = best_of // 2 + 1
+    set_dists = {first: set_score_distribution(pa, pb, first) for first in (True, False)}
+
+    start = np.zeros(np.shape(pa) + (MAX_GAMES,))
+    start[..., 0] = 1.0
+    # State: (sets_a, sets_b, a_serves_first, had_tiebreak) -> distribution of games played so far
+    states = {(0, 0, a_serves_first, False): start}
+    set_scores = {}
+    total_games = np.zeros_like(start)
+    tiebreak_prob = 0.0
+
+    for _ in range(best_of):
+        next_states = {}
+        for (sa, sb, first, had_tb), games in states.items():
+            for (ga, gb), prob in set_dists[first].items():
+                n_games = ga + gb
+                shifted = np.zeros_like(games)
+                shifted[..., n_games:] = games[..., :MAX_GAMES - n_games] * np.expand_dims(prob, -1)
+                key = (sa + (ga > gb), sb + (gb > ga),
+                       first != (n_games % 2 == 1),  # Odd number of games: the other player serves first
+                       had_tb or n_games == 13)
+                if key[0] == to_win or key[1] == to_win:
+                    mass = shifted.sum(axis=-1)
+                    set_scores[key[:2]] = set_scores.get(key[:2], 0.0) + mass
+                    total_games += shifted
+                    if key[3]:
+                        tiebreak_prob = tiebreak_prob + mass
+                elif key in next_states:
+                    next_states[key] += shifted
+                else:
+                    next_states[key] = shifted
+        states = next_states
+    return set_scores, total_games, tiebreak_prob
+
+
+class ScoreTable:
+    """
+    Precomputed outcomes on a grid of serve-point differentials for one surface.
+
+    Each row holds the exact (coin-toss-averaged) Markov results for best-of-3 and
+    best-of-5. A prediction inverts the Elo win probability (read as a best-of-3
+    probability) to the grid and interpolates between the two neighbouring rows.
+    """
+
+    def __init__(self, surface):
+        base = SERVE_BASELINE.get(surface, SERVE_BASELINE['Hard'])
+        pa, pb = base + D_GRID / 2, base - D_GRID / 2
+        self.set_probs, self.games, self.tiebreak = {}, {}, {}
+        for best_of in (3, 5):
+            # Unknown first server: average both coin-toss outcomes
+            results = [match_distribution(pa, pb, best_of, first) for first in (True, False)]
+            self.set_probs[best_of] = np.column_stack([
+                sum(r[0].get(label, 0.0) for r in results) / 2 for label in SET_SCORE_LABELS[best_of]
+            ])
+            self.games[best_of] = sum(r[1] for r in results) / 2
+            self.tiebreak[best_of] = sum(r[2] for r in results) / 2
+        self.bo3_win = self.set_probs[3][:, :2].sum(axis=1)
+        self.bo5_win = self.set_probs[5][:, :3].sum(axis=1)
+
+    def lookup(self, win_prob, best_of=3):
+        """Interpolated (set_probs, games_distribution, tiebreak_prob) for an Elo win probability."""
+        best_of = 5 if best_of == 5 else 3
+        win_prob = min(max(win_prob, self.bo3_win[0]), self.bo3_win[-1])
+        idx = int(np.searchsorted(self.bo3_win, win_prob))
+        idx = min(max(idx, 1), len(D_GRID) - 1)
+        lo, hi = self.bo3_win[idx - 1], self.bo3_win[idx]
+        w = (win_prob - lo) / (hi - lo) if hi > lo else 0.0
+
+        def interp(table):
+            return table[idx - 1] * (1 - w) + table[idx] * w
+
+        return interp(self.set_probs[best_of]), interp(self.games[best_of]), float(interp(self.tiebreak[best_of]))
+
+
+@lru_cache(maxsize=None)
+def get_score_table(surface):
+    """Lazily built, process-wide table per surface."""
+    return ScoreTable(surface if surface in SERVE_BASELINE else 'Hard')
+
+
+def match_win_prob(elo_prob, surface='Hard', best_of=3):
+    """Vectorized format adjustment: best-of-3 (Elo) win probabilities -> probabilities for `best_of`."""
+    elo_prob = np.asarray(elo_prob, dtype=float)
+    if best_of != 5:
+        return elo_prob
+    table = get_score_table(surface)
+    return np.interp(elo_prob, table.bo3_win, table.bo5_win)
+
+
+def score_probabilities(win_prob, surface='Hard', best_of=3, game_lines=None):
+    """
+    Set-score, total-games and tiebreak probabilities consistent with an Elo win probability.
+
+    Returns a dict: win_prob (for this format), set_scores [(label, prob)], expected_games,
+    games_over {line: P(total games > line)}, tiebreak_prob.
+    """
+    best_of = 5 if best_of == 5 else 3
+    set_probs, games, tiebreak = get_score_table(surface).lookup(win_prob, best_of)
+    labels = SET_SCORE_LABELS[best_of]
+    if game_lines is None:
+        game_lines = [20.5, 22.5, 24.5] if best_of == 3 else [34.5, 37.5, 40.5]
+    cumulative = np.cumsum(games)
+    return {
+        'win_prob': float(set_probs[:len(labels) // 2].sum()),
+        'set_scores': [(f"{a}-{b}", float(p)) for (a, b), p in zip(labels, set_probs)],
+        'expected_games': float(np.dot(np.arange(MAX_GAMES), games)),
+        'games_over': {line: float(1 - cumulative[int(line)]) for line in game_lines},
+        'tiebreak_prob': tiebreak,
+    }
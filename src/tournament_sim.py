@@ -1,5 +1,4 @@
 import random
-from src.model import Ligue1Predictor
 import collections
 
 # --- CONFIGURATION DU TOURNOI ---
@@ -30,6 +29,29 @@ QUALIFIED_TEAMS = [
     "Morocco", "DR Congo", "Zambia", "Tanzania" # Group F
 ]
 
+def afcon_modifiers(host=HOST_COUNTRY):
+    """
+    Match modifiers used by the web app for AFCON predictions: squad-quality boost of
+    every SQUAD_BOOSTS team, plus home-crowd advantage for the host. Teams not listed
+    are neutral (attack 1.0, defense 1.0).
+    """
+    modifiers = {}
+    for team in sorted(set(SQUAD_BOOSTS) | {host}):
+        mods = {'attack': 1.0, 'defense': 1.0}
+
+        # Squad quality boost
+        boost = SQUAD_BOOSTS.get(team, 1.0)
+        mods['attack'] *= boost
+        mods['defense'] *= (1.0 - (boost - 1.0))
+
+        # Host country advantage
+        if team == host:
+            mods['attack'] *= 1.20  # +20% attack boost for host (Home Crowd)
+            mods['defense'] *= 0.90 # -10% goals conceded (Defensive Boost)
+
+        modifiers[team] = mods
+    return modifiers
+
 def simulate_tournament(predictor, n_simulations=100):
     winners = []
     
@@ -107,6 +129,9 @@ def play_knockout_phase(predictor, teams, modifiers):
     return current_round[0]
 
 if __name__ == "__main__":
+    # Imported here: the scripts that only need SQUAD_BOOSTS / HOST_COUNTRY
+    # (daemon clients) then do not load pandas/scipy
+    from src.model import Ligue1Predictor
     try:
         predictor = Ligue1Predictor(data_file="data/AFCON.csv")
         results = simulate_tournament(predictor, n_simulations=500)
@@ -144,12 +144,27 @@ function switchMode(mode) {
         document.getElementById('result').style.display = 'none';
         document.getElementById('tennis-result').style.display = 'none';
 
-        if (!playersLoaded) loadTennisPlayers();
+        if (!playersLoaded) setupTennisAutocomplete();
     }
 }
 
-function loadTennisPlayers() {
-    fetch('/tennis_players')
+let autocompleteTimer = null;
+
+function setupTennisAutocomplete() {
+    // Suggestions are computed server-side (prefix index) while the user types
+    ['p1-input', 'p2-input'].forEach(id => {
+        document.getElementById(id).addEventListener('input', e => {
+            clearTimeout(autocompleteTimer);
+            const query = e.target.value.trim();
+            autocompleteTimer = setTimeout(() => loadTennisPlayers(query), 120);
+        });
+    });
+    playersLoaded = true;
+}
+
+function loadTennisPlayers(query) {
+    if (!query) return;
+    fetch(`/tennis_autocomplete?q=${encodeURIComponent(query)}&k=10`)
         .then(r => r.json())
         .then(data => {
             const datalist = document.getElementById('tennis-players-list');
@@ -159,7 +174,6 @@ function loadTennisPlayers() {
                 opt.value = p;
                 datalist.appendChild(opt);
             });
-            playersLoaded = true;
         })
         .catch(err => console.error("Error loading players", err));
 }
@@ -247,6 +261,16 @@ function displayResultTennis(data) {
             </div>`;
         });
     }
+    if (data.games) {
+        scoresHtml += `<div style="margin-top: 8px; opacity: 0.85;">Jeux (moyenne) : <strong>${data.games.expected}</strong></div>`;
+        data.games.over.forEach(o => {
+            scoresHtml += `<div style="display: flex; justify-content: space-between;">
+                <span>Over ${o.line} jeux</span>
+                <span>${o.prob}%</span>
+            </div>`;
+        });
+        scoresHtml += `<div style="opacity: 0.85;">Tie-break dans le match : <strong>${data.tiebreak_prob}%</strong></div>`;
+    }
     const scoresElem = document.getElementById('set-scores-list');
     if (scoresElem) scoresElem.innerHTML = scoresHtml;
 
@@ -263,7 +287,7 @@ function displayResultTennis(data) {
         } else {
             lastMatches.forEach(m => {
                 const winner = m.winner === data.player1 ? data.player1 : data.player2;
-                h2hHtml += `• ${m.date.substring(0, 4)} (${m.surface}): <strong>${m.winner}</strong> (${m.score})<br>`;
+                h2hHtml += `• ${String(m.date).substring(0, 4)} (${m.surface}): <strong>${m.winner}</strong> (${m.score})<br>`;
             });
         }
         const h2hElem = document.getElementById('h2h-stats');